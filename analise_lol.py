@@ -1,17 +1,70 @@
-import pandas as pd
-import requests 
+from nucleo_lol import aplicar_esquema, carregar_dados_com_cache
+from nucleo_lol.builds import fatia_indice_builds, minerar_builds
+from nucleo_lol.catalogo import construir_tabela_nomes
+from nucleo_lol.confrontos import DUPLA, fatia_confrontos
+from nucleo_lol.cubo import CHAVES_CUBO, fatia_cubo, fatia_histograma_kda
+from nucleo_lol.estatistica import bootstrap_kda
+from nucleo_lol.filtros import construir_indice_filtros
+from nucleo_lol.instrumentacao import ativar_logs_json, medido, medir, perfil, resumo_json
+from nucleo_lol.itens import agregar_por_item, fatia_indice_itens, top_itens
+from nucleo_lol.metricas import metricas_da_tabela
+from nucleo_lol.motores import (
+    MOTOR_POR_OMISSAO,
+    Consulta,
+    abrir_consulta,
+    calcular_metricas,
+    confrontos,
+    contar_linhas,
+    filtrar,
+    histograma_kda,
+    indice_builds,
+    indice_itens,
+    patches,
+    valores_distintos,
+)
+from nucleo_lol.particoes import carregar_particoes, e_particionado
+from nucleo_lol.streaming import agregar_em_blocos
 
 # -------------------------------------------------------------------
 # FUNÇÃO 1: CARREGAR DADOS 
 # -------------------------------------------------------------------
-def carregar_dados(caminho_do_ficheiro):
+@medido
+def carregar_dados(caminho_do_ficheiro, filtros_particao=None, motor='pandas', filtros=None):
     """
-    Função "mutável" atualizada para tentar ler .xlsx e .csv
+    Função "mutável" atualizada para tentar ler .xlsx, .csv e .parquet
+    Usa a cache Parquet (nucleo_lol.cache) para não ter de voltar a
+    ler o Excel em cada execução.
+    Também aceita uma pasta ou um padrão glob (ex: 'dados/*.csv'): os
+    ficheiros são lidos em paralelo, saltando os excluídos por 'filtros_particao',
+    e cada processo só devolve as linhas que passam 'filtros' (ex: o modo).
+    Com motor 'polars' ou 'duckdb' nada é lido: devolve uma Consulta sobre
+    a cache Parquet (nucleo_lol.motores) que as análises executam.
     """
-    if caminho_do_ficheiro.endswith('.xlsx'):
+    if motor != 'pandas':
+        try:
+            consulta = abrir_consulta(caminho_do_ficheiro, motor, filtros_particao)
+        except Exception as e:
+            print(f"Ocorreu um erro ao preparar a consulta ({motor}): {e}")
+            return None
+        if consulta is not None:
+            print(f"Sucesso! Motor '{motor}': {len(consulta.caminhos)} ficheiro(s) Parquet prontos a consultar.")
+            return consulta
+    if e_particionado(caminho_do_ficheiro):
+        print(f"A tentar ler os ficheiros de '{caminho_do_ficheiro}' em paralelo...")
+        try:
+            df = carregar_particoes(caminho_do_ficheiro, filtros_particao, filtros=filtros)
+            if df is None:
+                print("Erro: Nenhum ficheiro de dados encontrado (ou todos excluídos pelos filtros).")
+                return None
+            print(f"Sucesso! {len(df)} linhas carregadas.")
+            return df
+        except Exception as e:
+            print(f"Ocorreu um erro ao ler os ficheiros: {e}")
+            return None
+    elif caminho_do_ficheiro.endswith('.xlsx'):
         print("A tentar ler como ficheiro Excel (.xlsx)...")
         try:
-            df = pd.read_excel(caminho_do_ficheiro)
+            df = aplicar_esquema(carregar_dados_com_cache(caminho_do_ficheiro))
             print(f"Sucesso! Ficheiro '{caminho_do_ficheiro}' carregado.")
             return df
         except Exception as e:
@@ -20,104 +73,93 @@ def carregar_dados(caminho_do_ficheiro):
     elif caminho_do_ficheiro.endswith('.csv'):
         print("A tentar ler como ficheiro CSV (.csv)...")
         try:
-            df = pd.read_csv(caminho_do_ficheiro)
+            df = aplicar_esquema(carregar_dados_com_cache(caminho_do_ficheiro))
             print(f"Sucesso! Ficheiro '{caminho_do_ficheiro}' carregado.")
             return df
         except Exception as e:
             print(f"Ocorreu um erro inesperado ao ler o ficheiro CSV: {e}")
             return None
+    elif caminho_do_ficheiro.endswith('.parquet'):
+        print("A tentar ler como ficheiro Parquet (.parquet)...")
+        try:
+            df = aplicar_esquema(carregar_dados_com_cache(caminho_do_ficheiro))
+            print(f"Sucesso! Ficheiro '{caminho_do_ficheiro}' carregado.")
+            return df
+        except Exception as e:
+            print(f"Ocorreu um erro inesperado ao ler o ficheiro Parquet: {e}")
+            return None
     else:
-        print("Erro: Extensão de ficheiro não reconhecida (esperava .csv ou .xlsx).")
+        print("Erro: Extensão de ficheiro não reconhecida (esperava .csv, .xlsx ou .parquet).")
         return None
 
 # -------------------------------------------------------------------
 # FUNÇÃO 2: TRADUTOR DE ITENS 
 # -------------------------------------------------------------------
-def carregar_mapeamento_itens():
+@medido
+def carregar_mapeamento_itens(patches):
     """
-    Conecta-se ao Data Dragon (API da Riot) para descarregar
-    o ficheiro JSON dos itens e criar um dicionário de tradução.
+    Obtém a tabela de tradução dos itens (patch, ID -> nome) do Data
+    Dragon (API da Riot), com um catálogo para cada um dos 'patches'
+    presentes nos dados. Os catálogos ficam guardados em disco, por isso só são
+    descarregados na primeira vez (nucleo_lol.catalogo).
     """
-    print("\n--- 🌍 A descarregar dicionário de itens da Riot (Data Dragon) ---")
-    URL_API = "https://ddragon.leagueoflegends.com/cdn/15.1.1/data/en_US/item.json"
+    print("\n--- 🌍 A carregar dicionário de itens da Riot (Data Dragon) ---")
     
     try:
-        resposta = requests.get(URL_API)
-        resposta.raise_for_status() 
-        dados_json = resposta.json()
-        itens_data_dragon = dados_json['data']
-        
-        mapeamento_itens = {}
-        for id_item_str, info_item in itens_data_dragon.items():
-            id_item_int = int(id_item_str)
-            mapeamento_itens[id_item_int] = info_item['name']
-            
-        print("Sucesso! Dicionário de itens carregado.")
-        return mapeamento_itens
+        tabela_nomes = construir_tabela_nomes(sorted(patches))
+        print(f"Sucesso! Dicionário de itens carregado ({len(set(tabela_nomes.versoes.values()))} versões).")
+        return tabela_nomes
         
     except Exception as e:
-        print(f"Erro ao tentar descarregar o ficheiro de itens: {e}")
+        print(f"Erro ao tentar obter o ficheiro de itens: {e}")
         print("A análise de itens irá mostrar apenas os IDs.")
         return None
 
 # -------------------------------------------------------------------
 # FUNÇÃO 3: TAXA DE VITÓRIA 
 # -------------------------------------------------------------------
+@medido
 def analisar_taxa_vitoria(df, min_jogos):
     """
     Calcula a taxa de vitória para cada campeão.
     IGNORA campeões com menos de 'min_jogos'.
     
-    :param df: O DataFrame com os dados JÁ FILTRADOS.
+    :param df: O DataFrame (ou a Consulta) com os dados JÁ FILTRADOS.
     :param min_jogos: O número mínimo de partidas para um campeão ser incluído.
     """
     print(f"\n--- 🏆 Análise: Taxa de Vitória (Mínimo de {min_jogos} jogos) ---")
     
-    contagem_jogos = df.groupby('champion_name').size()
-    campeoes_relevantes = contagem_jogos[contagem_jogos >= min_jogos].index
-    df_relevante = df[df['champion_name'].isin(campeoes_relevantes)]
-    
-    if df_relevante.empty:
+    taxas_vitoria = calcular_metricas(df, min_jogos, ['taxa_vitoria'])['taxa_vitoria']
+    if taxas_vitoria is None:
         print(f"Nenhum campeão foi jogado {min_jogos} ou mais vezes.")
-        return None
-    
-    agrupado_por_campeao = df_relevante.groupby('champion_name')
-    taxas_vitoria = agrupado_por_campeao['win'].mean()
-    taxas_vitoria_perc = (taxas_vitoria * 100).sort_values(ascending=False)
-    
-    return taxas_vitoria_perc.round(2)
+    return taxas_vitoria
 
 # -------------------------------------------------------------------
 # FUNÇÃO 4: ITENS 
 # -------------------------------------------------------------------
-def analisar_itens_campeao(df, nome_do_campeao, mapeamento_itens):
+@medido
+def analisar_itens_campeao(df, nome_do_campeao, tabela_nomes):
     """
     Encontra os itens mais comprados para um campeão específico.
+    Cada item é traduzido com o catálogo do patch da sua partida.
     """
     print(f"\n--- 🗡️  Análise: Itens mais usados para '{nome_do_campeao}' ---")
     
-    df_campeao = df[df['champion_name'] == nome_do_campeao]
+    df_campeao = filtrar(df, {'champion_name': nome_do_campeao})
     
-    if df_campeao.empty:
+    if not contar_linhas(df_campeao):
         print(f"Atenção: Campeão '{nome_do_campeao}' não encontrado nos dados filtrados (para esta posição).")
         return None
         
-    colunas_itens = ['item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'item6']
-    todos_os_itens = df_campeao[colunas_itens].stack()
-    contagem_itens = todos_os_itens.value_counts()
-    
-    if 0 in contagem_itens:
-        contagem_itens = contagem_itens.drop(0)
-        
-    if mapeamento_itens:
-        contagem_com_nomes = contagem_itens.rename(index=mapeamento_itens)
-        return contagem_com_nomes
-    else:
-        return contagem_itens
+    # Contagem por (patch, item) numa só passagem (o item 0, slot vazio, é ignorado)
+    contagem_por_patch = indice_itens(df_campeao).droplevel(CHAVES_CUBO)
+    contagem_itens = top_itens(agregar_por_item(contagem_por_patch, tabela_nomes))
+    return contagem_itens
 
 # -------------------------------------------------------------------
 # FUNÇÃO 5: ANÁLISE DE OURO 
 # -------------------------------------------------------------------
+@medido
 def analisar_impacto_ouro(df):
     """
     Analisa a média de ouro ganho (gold_earned) em vitórias vs. derrotas.
@@ -125,10 +167,7 @@ def analisar_impacto_ouro(df):
     print("\n--- 💰 Análise: Impacto do Ouro na Vitória ---")
     
     try:
-        media_ouro = df.groupby('win')['gold_earned'].mean()
-        media_ouro = media_ouro.round(2)
-        media_ouro = media_ouro.rename(index={False: 'Derrota', True: 'Vitória'})
-        return media_ouro
+        return calcular_metricas(df, nomes=['impacto_ouro'])['impacto_ouro']
     except KeyError:
         print("Erro: A coluna 'gold_earned' não foi encontrada.")
         return None
@@ -139,34 +178,22 @@ def analisar_impacto_ouro(df):
 # -------------------------------------------------------------------
 # FUNÇÃO 6: KDA 
 # -------------------------------------------------------------------
+@medido
 def analisar_kda_campeoes(df, min_jogos):
     """
     Calcula as médias de Kills, Deaths, Assists e o KDA para cada campeão.
     IGNORA campeões com menos de 'min_jogos'.
     
-    :param df: O DataFrame com os dados JÁ FILTRADOS.
+    :param df: O DataFrame (ou a Consulta) com os dados JÁ FILTRADOS.
     :param min_jogos: O número mínimo de partidas para um campeão ser incluído.
     """
     print(f"\n--- ⚔️  Análise: KDA Médio (Mínimo de {min_jogos} jogos) ---")
     
-    contagem_jogos = df.groupby('champion_name').size()
-    campeoes_relevantes = contagem_jogos[contagem_jogos >= min_jogos].index
-    df_relevante = df[df['champion_name'].isin(campeoes_relevantes)]
-
-    if df_relevante.empty:
-        print(f"Nenhum campeão foi jogado {min_jogos} ou mais vezes.")
-        return None
-    
     try:
-        media_stats = df_relevante.groupby('champion_name')[['kills', 'deaths', 'assists']].mean()
-        
-        media_stats['deaths_para_kda'] = media_stats['deaths'].replace(0, 1)
-        media_stats['kda'] = (media_stats['kills'] + media_stats['assists']) / media_stats['deaths_para_kda']
-        
-        media_stats = media_stats.round(2)
-        media_stats = media_stats.sort_values(by='kda', ascending=False)
-        
-        return media_stats[['kills', 'deaths', 'assists', 'kda']]
+        kda_campeoes = calcular_metricas(df, min_jogos, ['kda'])['kda']
+        if kda_campeoes is None:
+            print(f"Nenhum campeão foi jogado {min_jogos} ou mais vezes.")
+        return kda_campeoes
         
     except KeyError:
         print("Erro: Colunas 'kills', 'deaths', or 'assists' não encontradas.")
@@ -176,111 +203,399 @@ def analisar_kda_campeoes(df, min_jogos):
         return None
 
 
+# -------------------------------------------------------------------
+# FUNÇÃO 7: TODAS AS MÉTRICAS NUMA SÓ PASSAGEM
+# -------------------------------------------------------------------
+@medido
+def analisar_campeoes(df, min_jogos):
+    """
+    Calcula de uma vez a taxa de vitória, o KDA, o ouro médio e o impacto
+    do ouro de cada campeão (nucleo_lol.metricas): um único groupby pelos
+    dados e o mínimo de jogos aplicado uma só vez, em vez de uma passagem
+    por cada análise.
+
+    :return: {'taxa_vitoria': ..., 'kda': ..., 'impacto_ouro': ..., ...}
+    """
+    try:
+        return calcular_metricas(df, min_jogos)
+    except KeyError as e:
+        print(f"Erro: A coluna {e} não foi encontrada.")
+        return None
+
+
+# -------------------------------------------------------------------
+# FUNÇÃO 8: SIGNIFICÂNCIA (INTERVALOS DE CONFIANÇA)
+# -------------------------------------------------------------------
+@medido
+def analisar_significancia(metricas, histograma_kda):
+    """
+    Junta, por campeão, a taxa de vitória com o intervalo de Wilson e a
+    taxa ajustada (Bayes empírico) ao KDA com o intervalo por bootstrap.
+    Vem ordenada pelo limite inferior da taxa de vitória, que só é alto
+    com muitos jogos (1 jogo e 1 vitória não chega ao topo).
+
+    :param metricas: Resultado de analisar_campeoes / metricas_da_tabela.
+    :param histograma_kda: Histograma de KDA por campeão (motores.histograma_kda).
+    """
+    if metricas.get('significancia') is None or metricas.get('kda') is None:
+        return None
+    return (metricas['significancia']
+            .join(metricas['kda']['kda'])
+            .join(bootstrap_kda(histograma_kda)))
+
+# -------------------------------------------------------------------
+# FUNÇÃO 9: CONFRONTOS (COUNTERS) E SINERGIAS DE DUPLA
+# -------------------------------------------------------------------
+@medido
+def analisar_confrontos(df, nome_do_campeao, posicao):
+    """
+    Contra que campeões da mesma posição 'nome_do_campeao' perde mais
+    (counters) e com que parceiros de dupla (bot lane) ganha mais.
+
+    :param df: DataFrame (ou Consulta) de UM modo de jogo, com TODAS as posições
+               (os parceiros de dupla estão noutra posição) e a coluna match_id.
+    :return: (counters, sinergias); cada um pode ser None
+    """
+    print(f"\n--- 🤝 Análise: Confrontos e Sinergias para '{nome_do_campeao}' ({posicao}) ---")
+    pares = confrontos(df)
+    if pares.empty:
+        print("Não há confrontos nos dados (é preciso a coluna 'match_id' e posições de rota).")
+        return None, None
+    counters = fatia_confrontos(pares, 'contra', nome_do_campeao, posicao=posicao)
+    sinergias = None
+    if posicao in DUPLA:
+        sinergias = fatia_confrontos(pares, 'com', nome_do_campeao, posicao=posicao)
+    return counters, sinergias
+
+# -------------------------------------------------------------------
+# FUNÇÃO 10: BUILDS (PARES, TRIOS E BUILDS COMPLETAS DE ITENS)
+# -------------------------------------------------------------------
+@medido
+def analisar_builds(df, nome_do_campeao, tabela_nomes, suporte_minimo=0.01):
+    """
+    Combinações de itens frequentes de um campeão (pares, trios e builds
+    completas) com a taxa de vitória e o intervalo de confiança de cada uma.
+
+    :param suporte_minimo: Fração mínima das partidas do campeão em que a
+                           combinação aparece (0.01 = 1%).
+    """
+    print(f"\n--- 🛠️  Análise: Builds de '{nome_do_campeao}' ---")
+    df_campeao = filtrar(df, {'champion_name': nome_do_campeao})
+    if not contar_linhas(df_campeao):
+        print(f"Atenção: Campeão '{nome_do_campeao}' não encontrado nos dados filtrados (para esta posição).")
+        return None
+    builds = minerar_builds(fatia_indice_builds(indice_builds(df_campeao), nome_do_campeao),
+                            tabela_nomes, suporte_minimo)
+    if builds is None:
+        print(f"{nome_do_campeao} não tem partidas com itens.")
+    return builds
+
+
+def mostrar_builds(builds, nome_do_campeao, top=10):
+    for tipo, tabela in builds.groupby('tipo', observed=True):
+        print(f"\nTop {top} {tipo} de {nome_do_campeao} (limite inferior da Taxa de Vitória):")
+        print(tabela.drop(columns='tipo').head(top).to_string(index=False))
+
+# -------------------------------------------------------------------
+# FUNÇÃO 11: ANÁLISE EM STREAMING (ficheiros maiores do que a memória)
+# -------------------------------------------------------------------
+@medido
+def analisar_em_streaming(caminho_do_ficheiro, modo, posicao, min_jogos, nome_do_campeao,
+                          ordenar_por_limite_inferior=False):
+    """
+    Faz as mesmas análises que o fluxo normal, mas sem nunca carregar o
+    ficheiro inteiro: os blocos já chegam filtrados por modo e posição e
+    só os acumuladores (cubo e índice de itens) ficam em memória. As
+    builds só são acumuladas para 'nome_do_campeao'.
+    """
+    print(f"\n--- 🌊 Modo streaming: a ler '{caminho_do_ficheiro}' em blocos ({modo} / {posicao}) ---")
+    try:
+        cubo, indice_itens, histograma_kda, indice_builds, linhas = agregar_em_blocos(
+            caminho_do_ficheiro, {'game_mode': modo, 'individual_position': posicao},
+            campeoes_builds=[nome_do_campeao])
+    except Exception as e:
+        print(f"Ocorreu um erro ao ler o ficheiro em blocos: {e}")
+        return
+
+    if cubo is None:
+        print("Nenhuma partida encontrada para estes filtros.")
+        return
+    print(f"Análise (filtrada por modo e posição) tem {linhas} partidas.")
+    metricas = metricas_da_tabela(fatia_cubo(cubo), min_jogos)
+    significancia = analisar_significancia(metricas, fatia_histograma_kda(histograma_kda))
+
+    print(f"\n--- RESULTADOS APENAS PARA: {modo} / {posicao} ---")
+
+    print("\n--- 💰 Análise: Impacto do Ouro na Vitória ---")
+    print("Média de Ouro Ganho:")
+    print(metricas['impacto_ouro'])
+
+    print(f"\n--- 🏆 Análise: Taxa de Vitória (Mínimo de {min_jogos} jogos) ---")
+    taxas_de_vitoria = metricas['taxa_vitoria']
+    if taxas_de_vitoria is None:
+        print(f"Nenhum campeão foi jogado {min_jogos} ou mais vezes.")
+    else:
+        if ordenar_por_limite_inferior:
+            taxas_de_vitoria = taxas_de_vitoria.reindex(significancia.index)
+        print("\nTop 10 Campeões (Taxa de Vitória):")
+        print(taxas_de_vitoria.head(10))
+        print("\nPiores 10 Campeões (Taxa de Vitória):")
+        print(taxas_de_vitoria.tail(10))
+
+    print(f"\n--- ⚔️  Análise: KDA Médio (Mínimo de {min_jogos} jogos) ---")
+    kda_campeoes = metricas['kda']
+    if kda_campeoes is None:
+        print(f"Nenhum campeão foi jogado {min_jogos} ou mais vezes.")
+    else:
+        print("\nTop 10 Campeões (KDA):")
+        print(kda_campeoes.head(10))
+        print("\nPiores 10 Campeões (KDA):")
+        print(kda_campeoes.tail(10))
+
+    print(f"\n--- 📊 Análise: Significância (IC 95%, mínimo de {min_jogos} jogos) ---")
+    if significancia is not None:
+        print("Top 10 Campeões (limite inferior da Taxa de Vitória):")
+        print(significancia.head(10).to_string())
+
+    print(f"\n--- 📈 Análise Única para: {nome_do_campeao} ({posicao}) ---")
+    if (taxas_de_vitoria is not None) and (nome_do_campeao in taxas_de_vitoria):
+        print(f"Taxa de Vitória: {taxas_de_vitoria.loc[nome_do_campeao]}%")
+    else:
+        print(f"Taxa de Vitória: {nome_do_campeao} não tem jogos suficientes (min {min_jogos}) para esta análise.")
+    if (kda_campeoes is not None) and (nome_do_campeao in kda_campeoes.index):
+        kda_unico = kda_campeoes.loc[nome_do_campeao]
+        print("Estatísticas Médias (K/D/A):")
+        print(f"  Kills:   {kda_unico['kills']}")
+        print(f"  Deaths:  {kda_unico['deaths']}")
+        print(f"  Assists: {kda_unico['assists']}")
+        print(f"  KDA:     {kda_unico['kda']}")
+    else:
+        print(f"KDA: {nome_do_campeao} não tem jogos suficientes (min {min_jogos}) para esta análise.")
+    if (significancia is not None) and (nome_do_campeao in significancia.index):
+        intervalos = significancia.loc[nome_do_campeao]
+        print(f"Taxa de Vitória IC 95%: [{intervalos['win_inferior']}%, {intervalos['win_superior']}%]"
+              f" (ajustada: {intervalos['win_ajustada']}%)")
+        print(f"KDA IC 95%: [{intervalos['kda_inferior']}, {intervalos['kda_superior']}]")
+
+    print(f"\n--- 🗡️  Análise: Itens mais usados para '{nome_do_campeao}' ---")
+    contagem_por_patch = fatia_indice_itens(indice_itens, nome_do_campeao)
+    if contagem_por_patch.empty:
+        print(f"Atenção: Campeão '{nome_do_campeao}' não encontrado nos dados filtrados (para esta posição).")
+        return
+    tabela_nomes = carregar_mapeamento_itens(contagem_por_patch.index.get_level_values('patch').unique())
+    print(f"\nTop 10 Itens para {nome_do_campeao}:")
+    print(top_itens(agregar_por_item(contagem_por_patch, tabela_nomes), top=10))
+
+    print(f"\n--- 🛠️  Análise: Builds de '{nome_do_campeao}' ---")
+    builds = minerar_builds(fatia_indice_builds(indice_builds, nome_do_campeao), tabela_nomes)
+    if builds is not None:
+        mostrar_builds(builds, nome_do_campeao)
+
+
 # --- O TEU PROJETO COMEÇA AQUI ---
 
 # 1. Define o caminho completo para o teu ficheiro
 NOME_DO_FICHEIRO = r"C:\Users\Pedro Priori\Desktop\analise_lol\AnalyticsChampionsLeagueOfLegends\lol_match_data_2024.xlsx"
 
-# 2. Carrega os dados
-dados_brutos = carregar_dados(NOME_DO_FICHEIRO)
+# --- FILTROS E CONSTANTES DE ANÁLISE ---
+MODO_ESCOLHIDO = 'CLASSIC'
+POSICAO_ESCOLHIDA = 'BOTTOM' # (Mantido 'BOTTOM' como escolheste)
 
-# 3. Carrega o Dicionário de Itens
-mapeamento_de_itens = carregar_mapeamento_itens()
+# Define o limite mínimo de jogos para uma análise ser "relevante"
+MIN_JOGOS_PARA_ANALISE = 20 # (Podes aumentar para 50, ou baixar para 10)
 
-# 4. Executa as análises 
-if dados_brutos is not None:
-    
-    # --- FILTRAGEM DE MODO ---
-    MODO_ESCOLHIDO = 'CLASSIC'
-    print(f"\n--- 🔍 A filtrar dados apenas para o modo: '{MODO_ESCOLHIDO}' ---")
-    df_filtrado = dados_brutos[dados_brutos['game_mode'] == MODO_ESCOLHIDO]
-    
-    # --- EXPLORAÇÃO DE POSIÇÕES ---
-    posicoes_existentes = df_filtrado['individual_position'].unique()
-    print(f"\n--- 🗺️ Exploração: Posições Encontradas (no modo {MODO_ESCOLHIDO}) ---")
-    print(f"Posições neste dataset: {posicoes_existentes}")
+# Ordena o Top/Piores 10 da Taxa de Vitória pelo limite inferior do intervalo
+# de confiança (95%) em vez da taxa bruta: campeões com poucos jogos e taxa
+# alta deixam de aparecer no topo sem ser preciso subir o mínimo de jogos
+ORDENAR_POR_LIMITE_INFERIOR = False
 
-    # --- FILTRAGEM DE POSIÇÃO ---
-    POSICAO_ESCOLHIDA = 'BOTTOM' # (Mantido 'BOTTOM' como escolheste)
-    
-    print(f"\n--- 🔍 A filtrar dados também para a posição: '{POSICAO_ESCOLHIDA}' ---")
+# Define o campeão que queremos "inspecionar"
+CAMPEAO_PARA_ANALISAR = 'Sivir' # (Mantido 'Sivir' como escolheste)
+
+# Modo streaming: o ficheiro é lido em blocos já filtrados por modo/posição,
+# para ficheiros maiores do que a memória (os resultados são os mesmos)
+USAR_STREAMING = False
+
+# Com uma pasta ou padrão glob em NOME_DO_FICHEIRO, só são lidos os ficheiros
+# cujo nome passa estes filtros (ex: {'region': ['BR1', 'EUW1']} para
+# 'dados/region=BR1/...'). Vazio = todos.
+FILTROS_PARTICAO = {}
+
+# Logs estruturados: uma linha JSON por etapa (tempo, memória, linhas de
+# entrada/saída) e, no fim, os contadores de cache. None = variável de
+# ambiente LOL_LOGS_JSON (sem ela, desligados); '1' = stderr; ou um ficheiro.
+# Com LOL_PERFIL=perfil.prof a execução corre também com o cProfile.
+FICHEIRO_LOGS_JSON = None
+
+# Motor das análises: 'pandas' (carrega os dados para memória), 'polars' ou
+# 'duckdb' (consultas preguiçosas e multi-thread sobre a cache Parquet, com os
+# filtros passados ao leitor). Os resultados são os mesmos; sem o polars /
+# duckdb instalado, usa o pandas. A variável LOL_MOTOR muda o valor por omissão.
+MOTOR_ANALISE = MOTOR_POR_OMISSAO
+
+def main():
+    if USAR_STREAMING:
+        analisar_em_streaming(NOME_DO_FICHEIRO, MODO_ESCOLHIDO, POSICAO_ESCOLHIDA,
+                              MIN_JOGOS_PARA_ANALISE, CAMPEAO_PARA_ANALISAR,
+                              ORDENAR_POR_LIMITE_INFERIOR)
+    else:
+        # 2. Carrega os dados
+        # Numa pasta de partições só as linhas do modo escolhido são juntadas
+        dados_brutos = carregar_dados(NOME_DO_FICHEIRO, FILTROS_PARTICAO, MOTOR_ANALISE,
+                                      {'game_mode': MODO_ESCOLHIDO})
+
+        # 3. Carrega o Dicionário de Itens
+        mapeamento_de_itens = None
+        if dados_brutos is not None:
+            mapeamento_de_itens = carregar_mapeamento_itens(patches(dados_brutos))
+
+        # 4. Executa as análises 
+        if dados_brutos is not None:
     
-    df_filtrado_final = df_filtrado[df_filtrado['individual_position'] == POSICAO_ESCOLHIDA]
+            # Posições das linhas de cada modo / posição / campeão: os filtros
+            # passam a ser interseções destes índices em vez de máscaras.
+            # Numa Consulta (polars / duckdb) os filtros só são aplicados na leitura
+            indice_filtros = None
+            linhas_totais = contar_linhas(dados_brutos)
+            if not isinstance(dados_brutos, Consulta):
+                with medir('construir_indice_filtros', linhas_entrada=linhas_totais):
+                    indice_filtros = construir_indice_filtros(dados_brutos)
+
+            # --- FILTRAGEM DE MODO ---
+            print(f"\n--- 🔍 A filtrar dados apenas para o modo: '{MODO_ESCOLHIDO}' ---")
+            with medir('filtrar_modo', linhas_entrada=linhas_totais) as registo:
+                df_filtrado = filtrar(dados_brutos, {'game_mode': MODO_ESCOLHIDO}, indice_filtros)
+                registo['linhas_saida'] = contar_linhas(df_filtrado)
     
-    # *** ESTA É A LINHA CORRIGIDA ***
-    print(f"Análise original (CLASSIC) tinha {len(df_filtrado)} partidas.")
-    print(f"Nova análise (filtrada por posição) tem {len(df_filtrado_final)} partidas.") # <- CORRIGIDO
+            # --- EXPLORAÇÃO DE POSIÇÕES ---
+            posicoes_existentes = valores_distintos(df_filtrado, 'individual_position')
+            print(f"\n--- 🗺️ Exploração: Posições Encontradas (no modo {MODO_ESCOLHIDO}) ---")
+            print(f"Posições neste dataset: {posicoes_existentes}")
 
-    # --- CONSTANTES DE ANÁLISE ---
+            # --- FILTRAGEM DE POSIÇÃO ---
+            print(f"\n--- 🔍 A filtrar dados também para a posição: '{POSICAO_ESCOLHIDA}' ---")
     
-    # Define o limite mínimo de jogos para uma análise ser "relevante"
-    MIN_JOGOS_PARA_ANALISE = 20 # (Podes aumentar para 50, ou baixar para 10)
+            with medir('filtrar_modo_posicao', linhas_entrada=linhas_totais) as registo:
+                df_filtrado_final = filtrar(dados_brutos, {
+                    'game_mode': MODO_ESCOLHIDO, 'individual_position': POSICAO_ESCOLHIDA}, indice_filtros)
+                registo['linhas_saida'] = contar_linhas(df_filtrado_final)
     
-    # Define o campeão que queremos "inspecionar"
-    CAMPEAO_PARA_ANALISAR = 'Sivir' # (Mantido 'Sivir' como escolheste)
+            # *** ESTA É A LINHA CORRIGIDA ***
+            print(f"Análise original (CLASSIC) tinha {contar_linhas(df_filtrado)} partidas.")
+            print(f"Nova análise (filtrada por posição) tem {contar_linhas(df_filtrado_final)} partidas.") # <- CORRIGIDO
 
-    # --- TODAS AS ANÁLISE AGORA USAM O 'df_filtrado_final' ---
+            # --- TODAS AS ANÁLISE AGORA USAM O 'df_filtrado_final' ---
     
-    print(f"\n--- RESULTADOS APENAS PARA: {MODO_ESCOLHIDO} / {POSICAO_ESCOLHIDA} ---")
+            print(f"\n--- RESULTADOS APENAS PARA: {MODO_ESCOLHIDO} / {POSICAO_ESCOLHIDA} ---")
 
-    # --- Análise de Ouro (Específica da Posição) ---
-    media_de_ouro = analisar_impacto_ouro(df_filtrado_final)
-    if media_de_ouro is not None:
-        print("Média de Ouro Ganho:")
-        print(media_de_ouro)
+            # --- Ouro, Taxa de Vitória e KDA numa só passagem pelos dados ---
+            metricas = analisar_campeoes(df_filtrado_final, MIN_JOGOS_PARA_ANALISE) or {}
+            significancia = analisar_significancia(
+                metricas, histograma_kda(df_filtrado_final, ['champion_name']))
+
+            # --- Análise de Ouro (Específica da Posição) ---
+            print("\n--- 💰 Análise: Impacto do Ouro na Vitória ---")
+            media_de_ouro = metricas.get('impacto_ouro')
+            if media_de_ouro is not None:
+                print("Média de Ouro Ganho:")
+                print(media_de_ouro)
     
-    # --- Análise de Taxa de Vitória (Específica da Posição e COM FILTRO) ---
-    taxas_de_vitoria_filtradas = analisar_taxa_vitoria(df_filtrado_final, MIN_JOGOS_PARA_ANALISE)
+            # --- Análise de Taxa de Vitória (Específica da Posição e COM FILTRO) ---
+            print(f"\n--- 🏆 Análise: Taxa de Vitória (Mínimo de {MIN_JOGOS_PARA_ANALISE} jogos) ---")
+            taxas_de_vitoria_filtradas = metricas.get('taxa_vitoria')
+            if taxas_de_vitoria_filtradas is None:
+                print(f"Nenhum campeão foi jogado {MIN_JOGOS_PARA_ANALISE} ou mais vezes.")
+            elif ORDENAR_POR_LIMITE_INFERIOR:
+                taxas_de_vitoria_filtradas = taxas_de_vitoria_filtradas.reindex(significancia.index)
     
-    if taxas_de_vitoria_filtradas is not None:
-        print(f"\nTop 10 Campeões (Taxa de Vitória):")
-        print(taxas_de_vitoria_filtradas.head(10))
+            if taxas_de_vitoria_filtradas is not None:
+                print("\nTop 10 Campeões (Taxa de Vitória):")
+                print(taxas_de_vitoria_filtradas.head(10))
         
-        print(f"\nPiores 10 Campeões (Taxa de Vitória):")
-        print(taxas_de_vitoria_filtradas.tail(10))
+                print("\nPiores 10 Campeões (Taxa de Vitória):")
+                print(taxas_de_vitoria_filtradas.tail(10))
     
-    # --- Análise de KDA (Específica da Posição e COM FILTRO) ---
-    kda_campeoes = analisar_kda_campeoes(df_filtrado_final, MIN_JOGOS_PARA_ANALISE)
+            # --- Análise de KDA (Específica da Posição e COM FILTRO) ---
+            print(f"\n--- ⚔️  Análise: KDA Médio (Mínimo de {MIN_JOGOS_PARA_ANALISE} jogos) ---")
+            kda_campeoes = metricas.get('kda')
+            if kda_campeoes is None:
+                print(f"Nenhum campeão foi jogado {MIN_JOGOS_PARA_ANALISE} ou mais vezes.")
     
-    if kda_campeoes is not None:
-        print("\nTop 10 Campeões (KDA):")
-        print(kda_campeoes.head(10))
+            if kda_campeoes is not None:
+                print("\nTop 10 Campeões (KDA):")
+                print(kda_campeoes.head(10))
         
-        print("\nPiores 10 Campeões (KDA):")
-        print(kda_campeoes.tail(10))
+                print("\nPiores 10 Campeões (KDA):")
+                print(kda_campeoes.tail(10))
 
-    # --- ANÁLISE ÚNICA (O TEU PEDIDO) ---
-    print(f"\n--- 📈 Análise Única para: {CAMPEAO_PARA_ANALISAR} ({POSICAO_ESCOLHIDA}) ---")
+            # --- Significância: intervalos de confiança (95%) ---
+            print(f"\n--- 📊 Análise: Significância (IC 95%, mínimo de {MIN_JOGOS_PARA_ANALISE} jogos) ---")
+            if significancia is not None:
+                print("Top 10 Campeões (limite inferior da Taxa de Vitória):")
+                print(significancia.head(10).to_string())
 
-    # 1. Procurar Taxa de Vitória Única
-    try:
-        if (taxas_de_vitoria_filtradas is not None) and (CAMPEAO_PARA_ANALISAR in taxas_de_vitoria_filtradas):
-            taxa_vitoria_unica = taxas_de_vitoria_filtradas.loc[CAMPEAO_PARA_ANALISAR]
-            print(f"Taxa de Vitória: {taxa_vitoria_unica}%")
-        else:
-            print(f"Taxa de Vitória: {CAMPEAO_PARA_ANALISAR} não tem jogos suficientes (min {MIN_JOGOS_PARA_ANALISE}) para esta análise.")
-    except Exception as e:
-        print(f"Não foi possível obter a Taxa de Vitória para {CAMPEAO_PARA_ANALISAR}: {e}")
+            # --- ANÁLISE ÚNICA (O TEU PEDIDO) ---
+            print(f"\n--- 📈 Análise Única para: {CAMPEAO_PARA_ANALISAR} ({POSICAO_ESCOLHIDA}) ---")
 
-    # 2. Procurar KDA Único
-    try:
-        if (kda_campeoes is not None) and (CAMPEAO_PARA_ANALISAR in kda_campeoes.index):
-            kda_unico = kda_campeoes.loc[CAMPEAO_PARA_ANALISAR]
-            print("Estatísticas Médias (K/D/A):")
-            print(f"  Kills:   {kda_unico['kills']}")
-            print(f"  Deaths:  {kda_unico['deaths']}")
-            print(f"  Assists: {kda_unico['assists']}")
-            print(f"  KDA:     {kda_unico['kda']}")
-        else:
-            print(f"KDA: {CAMPEAO_PARA_ANALISAR} não tem jogos suficientes (min {MIN_JOGOS_PARA_ANALISE}) para esta análise.")
-    except Exception as e:
-        print(f"Não foi possível obter o KDA para {CAMPEAO_PARA_ANALISAR}: {e}")
+            # 1. Procurar Taxa de Vitória Única
+            try:
+                if (taxas_de_vitoria_filtradas is not None) and (CAMPEAO_PARA_ANALISAR in taxas_de_vitoria_filtradas):
+                    taxa_vitoria_unica = taxas_de_vitoria_filtradas.loc[CAMPEAO_PARA_ANALISAR]
+                    print(f"Taxa de Vitória: {taxa_vitoria_unica}%")
+                else:
+                    print(f"Taxa de Vitória: {CAMPEAO_PARA_ANALISAR} não tem jogos suficientes (min {MIN_JOGOS_PARA_ANALISE}) para esta análise.")
+            except Exception as e:
+                print(f"Não foi possível obter a Taxa de Vitória para {CAMPEAO_PARA_ANALISAR}: {e}")
+
+            # 2. Procurar KDA Único
+            try:
+                if (kda_campeoes is not None) and (CAMPEAO_PARA_ANALISAR in kda_campeoes.index):
+                    kda_unico = kda_campeoes.loc[CAMPEAO_PARA_ANALISAR]
+                    print("Estatísticas Médias (K/D/A):")
+                    print(f"  Kills:   {kda_unico['kills']}")
+                    print(f"  Deaths:  {kda_unico['deaths']}")
+                    print(f"  Assists: {kda_unico['assists']}")
+                    print(f"  KDA:     {kda_unico['kda']}")
+                else:
+                    print(f"KDA: {CAMPEAO_PARA_ANALISAR} não tem jogos suficientes (min {MIN_JOGOS_PARA_ANALISE}) para esta análise.")
+            except Exception as e:
+                print(f"Não foi possível obter o KDA para {CAMPEAO_PARA_ANALISAR}: {e}")
+
+            # 3. Intervalos de confiança
+            if (significancia is not None) and (CAMPEAO_PARA_ANALISAR in significancia.index):
+                intervalos = significancia.loc[CAMPEAO_PARA_ANALISAR]
+                print(f"Taxa de Vitória IC 95%: [{intervalos['win_inferior']}%, {intervalos['win_superior']}%]"
+                      f" (ajustada: {intervalos['win_ajustada']}%)")
+                print(f"KDA IC 95%: [{intervalos['kda_inferior']}, {intervalos['kda_superior']}]")
         
-    # --- Análise de Itens (Específica da Posição) ---
-    itens_populares = analisar_itens_campeao(df_filtrado_final, CAMPEAO_PARA_ANALISAR, mapeamento_de_itens)
+            # --- Análise de Itens (Específica da Posição) ---
+            itens_populares = analisar_itens_campeao(df_filtrado_final, CAMPEAO_PARA_ANALISAR, mapeamento_de_itens)
     
-    if itens_populares is not None:
-        print(f"\nTop 10 Itens para {CAMPEAO_PARA_ANALISAR}:")
-        print(itens_populares.head(10))
-else:
-    print("O carregamento dos dados falhou. O script não pode continuar.")
\ No newline at end of file
+            if itens_populares is not None:
+                print(f"\nTop 10 Itens para {CAMPEAO_PARA_ANALISAR}:")
+                print(itens_populares.head(10))
+
+            # --- Builds: combinações de itens (específica da posição) ---
+            builds = analisar_builds(df_filtrado_final, CAMPEAO_PARA_ANALISAR, mapeamento_de_itens)
+            if builds is not None:
+                mostrar_builds(builds, CAMPEAO_PARA_ANALISAR)
+
+            # --- Confrontos e Sinergias (todas as posições do modo) ---
+            counters, sinergias = analisar_confrontos(df_filtrado, CAMPEAO_PARA_ANALISAR, POSICAO_ESCOLHIDA)
+            if counters is not None:
+                print(f"\nPiores 10 Confrontos (Counters) de {CAMPEAO_PARA_ANALISAR}:")
+                print(counters.head(10))
+            if sinergias is not None:
+                print(f"\nMelhores 10 Parceiros de Dupla de {CAMPEAO_PARA_ANALISAR}:")
+                print(sinergias.head(10))
+        else:
+            print("O carregamento dos dados falhou. O script não pode continuar.")
+
+
+# Os processos filhos (leitura em paralelo) voltam a importar este
+# ficheiro no Windows; a análise só corre no processo principal
+if __name__ == '__main__':
+    ativar_logs_json(FICHEIRO_LOGS_JSON)
+    with perfil():
+        main()
+    resumo_json()
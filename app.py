@@ -1,214 +1,382 @@
 import pandas as pd
-import requests 
 import streamlit as st
 
+from nucleo_lol.builds import fatia_indice_builds, minerar_builds
+from nucleo_lol.catalogo import construir_tabela_nomes
+from nucleo_lol.confrontos import DUPLA, fatia_confrontos
+from nucleo_lol.cubo import fatia_cubo, fatia_histograma_kda
+from nucleo_lol.estatistica import bootstrap_kda
+from nucleo_lol.instrumentacao import (
+    contadores,
+    limpar,
+    medido,
+    medir,
+    perfil,
+    registos,
+)
+from nucleo_lol.incremental import obter_agregados
+from nucleo_lol.itens import (
+    agregar_por_item,
+    fatia_indice_itens,
+    taxa_vitoria_itens,
+)
+from nucleo_lol.metricas import METRICAS, metricas_da_tabela
+from nucleo_lol.particoes import (
+    agregar_particoes,
+    assinatura_dados,
+    e_particionado,
+    valores_atributos,
+)
+from nucleo_lol.resultados import chave_resultado, impressao_dados, resultado_em_cache
+
 # -------------------------------------------------------------------
 # CONFIGURAÇÃO DA PÁGINA
 # -------------------------------------------------------------------
 st.set_page_config(layout="wide")
 
+# Cada execução do script (cada interação) mede as suas próprias etapas
+limpar()
+
 # -------------------------------------------------------------------
 # FUNÇÕES DE CARREGAMENTO DE DADOS (Com @st.cache_data)
 # -------------------------------------------------------------------
+@medido
 @st.cache_data
-def carregar_dados(caminho_do_ficheiro):
+def carregar_agregados(caminho_do_ficheiro, filtros_particao=(), assinatura=()):
     """
-    Carrega os dados do ficheiro Excel ou CSV.
+    Carrega (ou constrói uma vez) o cubo de agregados por
+    modo x posição x campeão, o índice esparso de itens, o histograma
+    de KDA (para os intervalos de confiança), os confrontos entre
+    campeões (counters e duplas) e o índice de builds. Cada interação
+    na barra lateral passa a ser uma consulta a estes agregados em vez
+    de uma passagem pelos dados.
+
+    Quando são acrescentadas partidas ao ficheiro, só as linhas novas
+    são lidas e somadas aos agregados gravados (nucleo_lol.incremental).
+
+    Com uma pasta ou padrão glob, cada partição é agregada num processo
+    separado e só os agregados são juntos (as linhas não são carregadas).
+
+    O resultado também fica na cache de resultados em disco
+    (nucleo_lol.resultados), partilhada pelos vários workers e que
+    sobrevive a reinícios: um worker novo só a lê.
+
+    :param filtros_particao: ((chave, (valores, ...)), ...) para saltar
+                             partições pelo nome (ex: região, data).
+    :param assinatura: Tamanho e data dos ficheiros (assinatura_dados);
+                       muda quando há dados novos e faz parte das chaves.
     """
+    def construir():
+        if e_particionado(caminho_do_ficheiro):
+            *agregados, _ = agregar_particoes(caminho_do_ficheiro, dict(filtros_particao))
+            return tuple(agregados)
+        return obter_agregados(caminho_do_ficheiro)
+
     try:
-        if caminho_do_ficheiro.endswith('.xlsx'):
-            df = pd.read_excel(caminho_do_ficheiro)
-            return df
-        elif caminho_do_ficheiro.endswith('.csv'):
-            df = pd.read_csv(caminho_do_ficheiro)
-            return df
-    except FileNotFoundError:
-        print(f"Erro Ficheiro não encontrado: {caminho_do_ficheiro}")
-        return None
+        chave = chave_resultado('agregados', impressao_dados(assinatura), filtros_particao)
+        return resultado_em_cache(chave, construir, contador='agregados')
     except Exception as e:
-        print(f"Erro ao ler o ficheiro: {e}")
-        return None
+        print(f"Erro ao construir os agregados: {e}")
+        return None, None, None, None, None
 
+@medido
 @st.cache_data
-def carregar_mapeamento_itens():
+def carregar_tabela_nomes_itens(patches):
     """
-    Descarrega o dicionário de itens do Data Dragon.
-    Retorna o mapeamento E a versão.
+    Carrega (em paralelo) o catálogo de itens do Data Dragon de cada
+    patch presente nos dados, para que cada partida use os nomes dos
+    itens do seu próprio patch.
+    Usa os catálogos guardados em disco (nucleo_lol.catalogo), por isso
+    só vai à rede quando sai um patch novo e funciona sem internet.
     """
     try:
-        url_versoes = "https://ddragon.leagueoflegends.com/api/versions.json"
-        resposta_versoes = requests.get(url_versoes)
-        resposta_versoes.raise_for_status()
-        versao_recente = resposta_versoes.json()[0]
-        
-        URL_API = f"https://ddragon.leagueoflegends.com/cdn/{versao_recente}/data/en_US/item.json"
-        
-        resposta_itens = requests.get(URL_API)
-        resposta_itens.raise_for_status() 
-        dados_json = resposta_itens.json()
-        itens_data_dragon = dados_json['data']
-        
-        mapeamento_itens = {}
-        for id_item_str, info_item in itens_data_dragon.items():
-            id_item_int = int(id_item_str)
-            mapeamento_itens[id_item_int] = info_item['name']
-            
-        return mapeamento_itens, versao_recente
-        
+        return construir_tabela_nomes(patches)
     except Exception as e:
         print(f"Erro ao carregar itens: {e}") 
-        return None, None
+        return None
 
 # -------------------------------------------------------------------
 # FUNÇÕES DE ANÁLISE 
 # -------------------------------------------------------------------
-def analisar_taxa_vitoria(df, min_jogos):
-    contagem_jogos = df.groupby('champion_name').size()
-    campeoes_relevantes = contagem_jogos[contagem_jogos >= min_jogos].index
-    df_relevante = df[df['champion_name'].isin(campeoes_relevantes)]
-    if df_relevante.empty: return None, None
-    agrupado_por_campeao = df_relevante.groupby('champion_name')
-    taxas_vitoria = agrupado_por_campeao['win'].mean()
-    taxas_vitoria_perc = (taxas_vitoria * 100).sort_values(ascending=False)
-    return taxas_vitoria_perc.round(2), contagem_jogos
-
-def analisar_itens_campeao(df, nome_do_campeao, mapeamento_itens):
-    df_campeao = df[df['champion_name'] == nome_do_campeao]
-    if df_campeao.empty: return None
-    colunas_itens = ['item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'item6']
-    todos_os_itens = df_campeao[colunas_itens].stack()
-    contagem_itens = todos_os_itens.value_counts()
-    if 0 in contagem_itens: contagem_itens = contagem_itens.drop(0)
-    if mapeamento_itens:
-        contagem_nomeada = contagem_itens.rename(index=mapeamento_itens)
-        df_itens = contagem_nomeada.to_frame(name='Contagem')
-        df_itens.index.name = 'Item'
-        return df_itens
-    else:
-        return contagem_itens.to_frame(name='Contagem')
+@medido
+def analisar_itens_campeao(indice_itens, modo, posicao, nome_do_campeao, tabela_nomes_itens, top=10):
+    # Corte do índice de itens, nomes do patch de cada partida e seleção parcial dos 'top' itens
+    fatia = fatia_indice_itens(indice_itens, nome_do_campeao, modo, posicao)
+    if fatia.empty: return None
+    df_itens = taxa_vitoria_itens(agregar_por_item(fatia, tabela_nomes_itens), top)
+    df_itens.columns = ['Contagem', 'Taxa de Vitória (%)']
+    df_itens.index.name = 'Item' if tabela_nomes_itens is not None else None
+    return df_itens
 
-def analisar_kda_campeoes(df, min_jogos):
-    contagem_jogos = df.groupby('champion_name').size()
-    campeoes_relevantes = contagem_jogos[contagem_jogos >= min_jogos].index
-    df_relevante = df[df['champion_name'].isin(campeoes_relevantes)]
-    if df_relevante.empty: return None
-    try:
-        media_stats = df_relevante.groupby('champion_name')[['kills', 'deaths', 'assists']].mean()
-        media_stats['deaths_para_kda'] = media_stats['deaths'].replace(0, 1)
-        media_stats['kda'] = (media_stats['kills'] + media_stats['assists']) / media_stats['deaths_para_kda']
-        media_stats = media_stats.round(2).sort_values(by='kda', ascending=False)
-        return media_stats[['kills', 'deaths', 'assists', 'kda']]
-    except Exception: return None
+@medido
+@st.cache_data
+def calcular_metricas(_fatia, modo, posicao, min_jogos, filtros_particao=(), assinatura=()):
+    """
+    Todas as métricas (metricas_da_tabela) de um modo / posição / mínimo
+    de jogos, guardadas também na cache de resultados em disco.
+    """
+    chave = chave_resultado('metricas', impressao_dados(assinatura), filtros_particao,
+                            modo, posicao, min_jogos, sorted(METRICAS))
+    return resultado_em_cache(chave, lambda: metricas_da_tabela(_fatia, min_jogos), contador='metricas')
+
+@medido
+@st.cache_data
+def calcular_intervalos_kda(_histograma_kda, modo, posicao, filtros_particao=(), assinatura=()):
+    """
+    Intervalos de confiança do KDA (bootstrap em lote) de todos os campeões
+    de um modo / posição. Fica em cache, por isso mudar de campeão não
+    repete o bootstrap. O histograma ('_') não entra na chave da cache;
+    os filtros de partições e a assinatura dos dados entram.
+    """
+    chave = chave_resultado('intervalos_kda', impressao_dados(assinatura), filtros_particao, modo, posicao)
+    return resultado_em_cache(chave, lambda: bootstrap_kda(fatia_histograma_kda(_histograma_kda, modo, posicao)),
+                              contador='intervalos_kda')
+
+@medido
+@st.cache_data
+def calcular_builds(_indice_builds, _tabela_nomes_itens, modo, posicao, nome_do_campeao,
+                    filtros_particao=(), assinatura=()):
+    """
+    Pares, trios e builds completas frequentes de um campeão num modo /
+    posição (nucleo_lol.builds). Fica em cache por fatia, por isso voltar
+    a um campeão já visto não repete a mineração.
+    """
+    versoes = sorted(_tabela_nomes_itens.versoes.items()) if _tabela_nomes_itens is not None else None
+    chave = chave_resultado('builds', impressao_dados(assinatura), filtros_particao,
+                            modo, posicao, nome_do_campeao, versoes)
+    builds = resultado_em_cache(chave, lambda: minerar_builds(
+        fatia_indice_builds(_indice_builds, nome_do_campeao, modo, posicao), _tabela_nomes_itens),
+        contador='builds')
+    if builds is None: return None
+    builds.columns = ['Tipo', 'Itens', 'Partidas', 'Taxa de Vitória (%)', 'IC 95% (mín)', 'IC 95% (máx)']
+    return builds
+
+@medido
+def tabela_confrontos(confrontos, relacao, modo, posicao, nome_do_campeao, top=10):
+    # Counters ('contra') ou parceiros de dupla ('com'), já ordenados pelo intervalo de confiança
+    fatia = fatia_confrontos(confrontos, relacao, nome_do_campeao, modo, posicao)
+    if fatia is None: return None
+    fatia = fatia.head(top)
+    fatia.columns = ['Partidas', 'Taxa de Vitória (%)', 'IC 95% (mín)', 'IC 95% (máx)']
+    fatia.index.name = 'Adversário' if relacao == 'contra' else 'Parceiro'
+    return fatia
 
 # -------------------------------------------------------------------
 # DASHBOARD (LÓGICA PRINCIPAL)
 # -------------------------------------------------------------------
+# Com LOL_PERFIL=<ficheiro> a página corre com o cProfile; o with desliga-o
+# mesmo quando a execução é interrompida (st.stop, nova interação, erro)
+with perfil():
+    st.title("🎮 Painel de Análise de League of Legends")
 
-st.title("🎮 Painel de Análise de League of Legends")
+    # --- 1. Carregar os Dados ---
+    with st.spinner('A carregar os dados das partidas (pode demorar)...'):
+        NOME_DO_FICHEIRO = r"C:\Users\Pedro Priori\Desktop\analise_lol\AnalyticsChampionsLeagueOfLegends\lol_match_data_2024.xlsx"
 
-# --- 1. Carregar os Dados ---
-with st.spinner('A carregar os dados das partidas (pode demorar)...'):
-    NOME_DO_FICHEIRO = r"C:\Users\Pedro Priori\Desktop\analise_lol\AnalyticsChampionsLeagueOfLegends\lol_match_data_2024.xlsx"
+        # Com dados particionados (pasta ou padrão glob), os atributos no nome
+        # dos ficheiros (ex: region=BR1) permitem saltar partições inteiras
+        filtros_particao = ()
+        if e_particionado(NOME_DO_FICHEIRO):
+            st.sidebar.header("🗂️ Partições")
+            escolhas = []
+            for chave, valores in valores_atributos(NOME_DO_FICHEIRO).items():
+                selecionados = st.sidebar.multiselect(f"{chave}:", options=valores, default=valores)
+                if len(selecionados) < len(valores):
+                    escolhas.append((chave, tuple(selecionados)))
+            filtros_particao = tuple(escolhas)
 
-    dados_brutos = carregar_dados(NOME_DO_FICHEIRO)
-    if dados_brutos is None:
-        st.error(f"Falha ao carregar os dados. Verifica o caminho: {NOME_DO_FICHEIRO}")
+        # O painel só precisa dos agregados; as linhas originais só são
+        # lidas quando o cubo/índice gravados estão desatualizados.
+        assinatura = assinatura_dados(NOME_DO_FICHEIRO)
+        cubo, indice_itens, histograma_kda, confrontos, indice_builds = carregar_agregados(
+            NOME_DO_FICHEIRO, filtros_particao, assinatura)
+        if cubo is None or indice_itens is None or histograma_kda is None:
+            st.error(f"Falha ao carregar os dados. Verifica o caminho: {NOME_DO_FICHEIRO}")
 
-with st.spinner('A descarregar nomes dos itens da Riot...'):
-    mapeamento_de_itens, versao_itens = carregar_mapeamento_itens()
-    if mapeamento_de_itens is not None:
-        st.toast(f"Nomes dos itens carregados (Versão LoL: {versao_itens})")
-    else:
-        st.error("Erro ao descarregar nomes dos itens. A análise mostrará IDs.")
+    with st.spinner('A descarregar nomes dos itens da Riot...'):
+        tabela_nomes_itens = None
+        if indice_itens is not None:
+            patches_dos_dados = tuple(sorted(indice_itens.index.get_level_values('patch').unique().astype(str)))
+            tabela_nomes_itens = carregar_tabela_nomes_itens(patches_dos_dados)
+        if tabela_nomes_itens is not None:
+            versoes_itens = sorted(set(tabela_nomes_itens.versoes.values()))
+            st.toast(f"Nomes dos itens carregados (Versões LoL: {', '.join(versoes_itens)})")
+        else:
+            st.error("Erro ao descarregar nomes dos itens. A análise mostrará IDs.")
 
 
-if dados_brutos is not None and mapeamento_de_itens is not None:
-    # --- 2. A Barra Lateral (Sidebar) com TODOS os Filtros ---
-    st.sidebar.header("🔧 Filtros da Análise")
+    if cubo is not None and indice_itens is not None and histograma_kda is not None:
+        # --- 2. A Barra Lateral (Sidebar) com TODOS os Filtros ---
+        st.sidebar.header("🔧 Filtros da Análise")
     
-    MODO_ESCOLHIDO = st.sidebar.selectbox(
-        'Escolha o Modo de Jogo:',
-        options=dados_brutos['game_mode'].unique(),
-        index=0 
-    )
-    df_filtrado = dados_brutos[dados_brutos['game_mode'] == MODO_ESCOLHIDO]
-
-    posicoes_validas = [p for p in df_filtrado['individual_position'].unique() if p not in ['Invalid', 'NONE']]
-    POSICAO_ESCOLHIDA = st.sidebar.selectbox(
-        'Escolha a Posição:',
-        options=posicoes_validas,
-        index=posicoes_validas.index('UTILITY') if 'UTILITY' in posicoes_validas else 0 
-    )
-    df_filtrado_final = df_filtrado[df_filtrado['individual_position'] == POSICAO_ESCOLHIDA]
-
-    # --- Quantidade de Jogos minimos ---
-    MIN_JOGOS_PARA_ANALISE = 1 
-    st.sidebar.info(f"A analisar todos os campeões com 1 ou mais jogos.")
+        # Modos e posições vêm do cubo (ordenados pelo nº de jogos)
+        jogos_por_modo = cubo.groupby(level='game_mode', observed=True)['jogos'].sum()
+        MODO_ESCOLHIDO = st.sidebar.selectbox(
+            'Escolha o Modo de Jogo:',
+            options=jogos_por_modo.sort_values(ascending=False).index.tolist(),
+            index=0 
+        )
+        cubo_modo = cubo.xs(MODO_ESCOLHIDO, level='game_mode')
+        jogos_por_posicao = cubo_modo.groupby(level='individual_position', observed=True)['jogos'].sum()
+
+        posicoes_validas = [p for p in jogos_por_posicao.sort_values(ascending=False).index if p not in ['Invalid', 'NONE']]
+        if not posicoes_validas:
+            # Sem posição escolhida, fatia_cubo juntaria todas as posições em silêncio
+            st.info(f"O modo '{MODO_ESCOLHIDO}' não tem posições definidas (só 'Invalid' / 'NONE'). Escolha outro modo.")
+            st.stop()
+        POSICAO_ESCOLHIDA = st.sidebar.selectbox(
+            'Escolha a Posição:',
+            options=posicoes_validas,
+            index=posicoes_validas.index('UTILITY') if 'UTILITY' in posicoes_validas else 0 
+        )
+        with medir('fatia_cubo', linhas_entrada=len(cubo)) as registo:
+            fatia = fatia_cubo(cubo, MODO_ESCOLHIDO, POSICAO_ESCOLHIDA)
+            registo['linhas_saida'] = len(fatia)
+
+        # --- Quantidade de Jogos minimos ---
+        MIN_JOGOS_PARA_ANALISE = 1 
+        st.sidebar.info(f"A analisar todos os campeões com 1 ou mais jogos.")
+
+        # Com 1 jogo mínimo, ordenar pela taxa bruta põe no topo campeões com 1 jogo e 100%;
+        # o limite inferior do intervalo de confiança só é alto com muitos jogos
+        ORDENAR_POR_LIMITE_INFERIOR = st.sidebar.checkbox(
+            'Ordenar o ranking pelo limite inferior (IC 95%)', value=True)
     
-    st.sidebar.info(f"A analisar {len(df_filtrado_final)} partidas para '{MODO_ESCOLHIDO}' / '{POSICAO_ESCOLHIDA}'.")
+        st.sidebar.info(f"A analisar {int(fatia['jogos'].sum())} partidas para '{MODO_ESCOLHIDO}' / '{POSICAO_ESCOLHIDA}'.")
     
-    # --- 3. Calcular as Estatísticas Gerais  ---
-    taxas_de_vitoria_geral, contagem_jogos_geral = analisar_taxa_vitoria(df_filtrado_final, MIN_JOGOS_PARA_ANALISE)
-    kda_campeoes_geral = analisar_kda_campeoes(df_filtrado_final, MIN_JOGOS_PARA_ANALISE)
-    media_ouro_geral = df_filtrado_final.groupby('champion_name')['gold_earned'].mean().round(2)
+        # --- 3. Calcular as Estatísticas Gerais (todas de uma vez, a partir do cubo) ---
+        metricas = calcular_metricas(fatia, MODO_ESCOLHIDO, POSICAO_ESCOLHIDA, MIN_JOGOS_PARA_ANALISE,
+                                     filtros_particao, assinatura)
+        taxas_de_vitoria_geral = metricas['taxa_vitoria']
+        contagem_jogos_geral = metricas['jogos']
+        kda_campeoes_geral = metricas['kda']
+        media_ouro_geral = metricas['ouro_medio']
+        significancia_geral = metricas['significancia']
+        intervalos_kda_geral = calcular_intervalos_kda(histograma_kda, MODO_ESCOLHIDO, POSICAO_ESCOLHIDA,
+                                                       filtros_particao, assinatura)
     
-    if taxas_de_vitoria_geral is None or kda_campeoes_geral is None:
-        st.warning(f"Nenhum campeão encontrado para esta combinação de filtros.")
-    else:
-        # --- 4. Filtro do Campeão  ---
-        lista_campeoes_analisaveis = kda_campeoes_geral.index.sort_values().unique()
+        if taxas_de_vitoria_geral is None or kda_campeoes_geral is None:
+            st.warning(f"Nenhum campeão encontrado para esta combinação de filtros.")
+        else:
+            # --- 4. Filtro do Campeão  ---
+            lista_campeoes_analisaveis = kda_campeoes_geral.index.sort_values().unique()
         
-        CAMPEAO_ESCOLHIDO = st.sidebar.selectbox(
-            f"Escolha um Campeão:",
-            options=lista_campeoes_analisaveis
-        )
+            CAMPEAO_ESCOLHIDO = st.sidebar.selectbox(
+                f"Escolha um Campeão:",
+                options=lista_campeoes_analisaveis
+            )
 
-        # --- 5. O Painel Principal  ---
-        st.header(f"📈 Análise Específica: {CAMPEAO_ESCOLHIDO}")
-        st.markdown(f"**Modo:** `{MODO_ESCOLHIDO}` | **Posição:** `{POSICAO_ESCOLHIDA}`")
+            # --- 5. O Painel Principal  ---
+            st.header(f"📈 Análise Específica: {CAMPEAO_ESCOLHIDO}")
+            st.markdown(f"**Modo:** `{MODO_ESCOLHIDO}` | **Posição:** `{POSICAO_ESCOLHIDA}`")
 
-        col_stats, col_itens = st.columns([1, 1])
+            col_stats, col_itens = st.columns([1, 1])
 
-        with col_stats:
-            st.subheader("Estatísticas Principais")
+            with col_stats:
+                st.subheader("Estatísticas Principais")
             
-            if (CAMPEAO_ESCOLHIDO in taxas_de_vitoria_geral) and \
-               (CAMPEAO_ESCOLHIDO in kda_campeoes_geral.index) and \
-               (CAMPEAO_ESCOLHIDO in media_ouro_geral.index):
-                try:
-                    winrate = taxas_de_vitoria_geral.loc[CAMPEAO_ESCOLHIDO]
-                    kda_stats = kda_campeoes_geral.loc[CAMPEAO_ESCOLHIDO]
-                    jogos = contagem_jogos_geral.loc[CAMPEAO_ESCOLHIDO]
-                    ouro = media_ouro_geral.loc[CAMPEAO_ESCOLHIDO]
+                if (CAMPEAO_ESCOLHIDO in taxas_de_vitoria_geral) and \
+                   (CAMPEAO_ESCOLHIDO in kda_campeoes_geral.index) and \
+                   (CAMPEAO_ESCOLHIDO in media_ouro_geral.index):
+                    try:
+                        winrate = taxas_de_vitoria_geral.loc[CAMPEAO_ESCOLHIDO]
+                        kda_stats = kda_campeoes_geral.loc[CAMPEAO_ESCOLHIDO]
+                        jogos = contagem_jogos_geral.loc[CAMPEAO_ESCOLHIDO]
+                        ouro = media_ouro_geral.loc[CAMPEAO_ESCOLHIDO]
+                        significancia = significancia_geral.loc[CAMPEAO_ESCOLHIDO]
+                        intervalo_kda = intervalos_kda_geral.loc[CAMPEAO_ESCOLHIDO]
                     
-                    data = {
-                        'Partidas Analisadas': [jogos],
-                        'Taxa de Vitória (%)': [winrate],
-                        'KDA Médio': [kda_stats['kda']],
-                        'Ouro (Médio)': [ouro],
-                        'Kills (Médio)': [kda_stats['kills']],
-                        'Deaths (Médio)': [kda_stats['deaths']],
-                        'Assists (Médio)': [kda_stats['assists']]
-                    }
-                    df_stats = pd.DataFrame(data)
-                    df_stats_transposta = df_stats.T
-                    df_stats_transposta.columns = ['Valor']
+                        data = {
+                            'Partidas Analisadas': [jogos],
+                            'Taxa de Vitória (%)': [winrate],
+                            'Taxa de Vitória IC 95% (mín)': [significancia['win_inferior']],
+                            'Taxa de Vitória IC 95% (máx)': [significancia['win_superior']],
+                            'Taxa de Vitória Ajustada (%)': [significancia['win_ajustada']],
+                            'KDA Médio': [kda_stats['kda']],
+                            'KDA IC 95% (mín)': [intervalo_kda['kda_inferior']],
+                            'KDA IC 95% (máx)': [intervalo_kda['kda_superior']],
+                            'Ouro (Médio)': [ouro],
+                            'Kills (Médio)': [kda_stats['kills']],
+                            'Deaths (Médio)': [kda_stats['deaths']],
+                            'Assists (Médio)': [kda_stats['assists']]
+                        }
+                        df_stats = pd.DataFrame(data)
+                        df_stats_transposta = df_stats.T
+                        df_stats_transposta.columns = ['Valor']
                     
-                    st.dataframe(df_stats_transposta, use_container_width=True)
+                        st.dataframe(df_stats_transposta, use_container_width=True)
                 
-                except Exception as e:
-                    st.error(f"Ocorreu um erro ao mostrar dados para {CAMPEAO_ESCOLHIDO}: {e}")
+                    except Exception as e:
+                        st.error(f"Ocorreu um erro ao mostrar dados para {CAMPEAO_ESCOLHIDO}: {e}")
             
-            else:
-                st.warning(f"O campeão {CAMPEAO_ESCOLHIDO} não foi encontrado nas listas de análise.")
+                else:
+                    st.warning(f"O campeão {CAMPEAO_ESCOLHIDO} não foi encontrado nas listas de análise.")
 
-        with col_itens:
-            st.subheader(f"Itens Populares para {CAMPEAO_ESCOLHIDO}")
-            itens_populares = analisar_itens_campeao(df_filtrado_final, CAMPEAO_ESCOLHIDO, mapeamento_de_itens)
+            with col_itens:
+                st.subheader(f"Itens Populares para {CAMPEAO_ESCOLHIDO}")
+                itens_populares = analisar_itens_campeao(indice_itens, MODO_ESCOLHIDO, POSICAO_ESCOLHIDA,
+                                                         CAMPEAO_ESCOLHIDO, tabela_nomes_itens)
             
-            if itens_populares is not None:
-                st.dataframe(itens_populares.head(10), use_container_width=True)
+                if itens_populares is not None:
+                    st.dataframe(itens_populares.head(10), use_container_width=True)
+                else:
+                    st.warning("Não foram encontrados dados de itens.")
+
+            # --- 6. Ranking de todos os campeões, com intervalos de confiança ---
+            st.subheader(f"🏅 Ranking de Campeões ({MODO_ESCOLHIDO} / {POSICAO_ESCOLHIDA})")
+            ranking = significancia_geral.join(kda_campeoes_geral['kda']).join(intervalos_kda_geral)
+            ranking = ranking.sort_values(by='win_inferior' if ORDENAR_POR_LIMITE_INFERIOR else 'win', ascending=False)
+            ranking.columns = ['Partidas', 'Taxa de Vitória (%)', 'IC 95% (mín)', 'IC 95% (máx)',
+                               'Taxa Ajustada (%)', 'KDA', 'KDA IC 95% (mín)', 'KDA IC 95% (máx)']
+            st.dataframe(ranking, use_container_width=True)
+
+            # --- 7. Confrontos na rota e sinergias de dupla ---
+            col_counters, col_sinergias = st.columns([1, 1])
+
+            with col_counters:
+                st.subheader(f"⚔️ Counters de {CAMPEAO_ESCOLHIDO}")
+                counters = tabela_confrontos(confrontos, 'contra', MODO_ESCOLHIDO, POSICAO_ESCOLHIDA, CAMPEAO_ESCOLHIDO)
+                if counters is not None:
+                    st.dataframe(counters, use_container_width=True)
+                else:
+                    st.warning("Não foram encontrados confrontos (é preciso a coluna 'match_id').")
+
+            with col_sinergias:
+                st.subheader("🤝 Melhores Parceiros de Dupla")
+                if POSICAO_ESCOLHIDA not in DUPLA:
+                    st.info(f"As sinergias de dupla só existem para {' e '.join(DUPLA)}.")
+                else:
+                    sinergias = tabela_confrontos(confrontos, 'com', MODO_ESCOLHIDO, POSICAO_ESCOLHIDA, CAMPEAO_ESCOLHIDO)
+                    if sinergias is not None:
+                        st.dataframe(sinergias, use_container_width=True)
+                    else:
+                        st.warning("Não foram encontradas duplas para este campeão.")
+
+            # --- 8. Builds: pares, trios e builds completas de itens ---
+            st.subheader(f"🛠️ Builds de {CAMPEAO_ESCOLHIDO}")
+            builds = calcular_builds(indice_builds, tabela_nomes_itens, MODO_ESCOLHIDO, POSICAO_ESCOLHIDA,
+                                     CAMPEAO_ESCOLHIDO, filtros_particao, assinatura)
+            if builds is not None:
+                tipos = builds['Tipo'].cat.categories
+                for aba, tipo in zip(st.tabs(list(tipos)), tipos):
+                    with aba:
+                        tabela = builds[builds['Tipo'] == tipo].drop(columns='Tipo').head(10)
+                        if tabela.empty:
+                            st.info("Nenhuma combinação aparece em 1% das partidas (e em pelo menos 2).")
+                        else:
+                            st.dataframe(tabela.set_index('Itens'), use_container_width=True)
             else:
-                st.warning("Não foram encontrados dados de itens.")
-else:
-    st.error("Os dados ou o mapeamento de itens não puderam ser carregados. O dashboard não pode continuar.")
\ No newline at end of file
+                st.warning("Não foram encontrados dados de builds.")
+    else:
+        st.error("Os dados não puderam ser carregados. O dashboard não pode continuar.")
+
+    # --- 9. Desempenho: tempo, memória e linhas de cada etapa desta execução ---
+    with st.expander("⏱️ Desempenho"):
+        etapas = pd.DataFrame(registos())
+        if not etapas.empty:
+            st.caption(f"Total: {etapas['duracao_s'].sum():.3f} s (com as caches do Streamlit e em disco)")
+            st.dataframe(etapas.set_index('etapa'), use_container_width=True)
+        cache = pd.DataFrame(contadores()).T
+        if not cache.empty:
+            st.caption("Acertos / falhas de cache (desde que o processo arrancou)")
+            st.dataframe(cache.fillna(0).astype(int), use_container_width=True)
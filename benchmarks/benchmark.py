@@ -0,0 +1,353 @@
+"""
+Benchmark das funções de análise e do carregamento dos dados.
+
+Para cada tamanho pedido, gera (uma vez) ficheiros sintéticos com o
+esquema real (benchmarks/dados_sinteticos.py) e mede, cada medição num
+processo novo:
+  - tempo (melhor e mediana de várias repetições);
+  - pico de memória RSS acima do estado antes da chamada;
+  - pico de memória alocada pelo Python/NumPy/pandas (tracemalloc; a
+    memória interna do pyarrow não aparece aqui, só no RSS).
+
+Os resultados são gravados em JSON e podem ser comparados com um
+resultado anterior (baseline).
+
+Exemplos:
+    py benchmarks/benchmark.py --linhas 10000 1000000
+    py benchmarks/benchmark.py --linhas 1000000 --saida atual.json --baseline benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+PASTA_PROJETO = os.path.dirname(PASTA_BENCHMARKS)
+sys.path.insert(0, PASTA_PROJETO)
+sys.path.insert(0, PASTA_BENCHMARKS)
+
+from dados_sinteticos import gravar_partidas  # noqa: E402
+
+try:
+    import psutil
+except ImportError:  # Sem psutil, o RSS só é medido em Linux (/proc)
+    psutil = None
+
+# -------------------------------------------------------------------
+# CONFIGURAÇÃO
+# -------------------------------------------------------------------
+PASTA_DADOS = os.path.join(PASTA_BENCHMARKS, 'dados')
+
+LINHAS_POR_OMISSAO = [10_000, 100_000, 1_000_000]
+REPETICOES_POR_OMISSAO = 3
+
+# O Excel só aceita ~1 milhão de linhas e é muito lento a gerar
+MAX_LINHAS_EXCEL = 200_000
+
+MIN_JOGOS = 20
+
+# Acima deste rácio (tempo atual / baseline) é considerado uma regressão
+TOLERANCIA_POR_OMISSAO = 0.20
+
+INTERVALO_AMOSTRAGEM_RSS = 0.002
+
+# Medidas com o DataFrame já carregado (formato 'memoria')
+FUNCOES_ANALISE = ['analisar_taxa_vitoria', 'analisar_kda_campeoes',
+                   'analisar_itens_campeao', 'analisar_impacto_ouro',
+                   'analisar_campeoes', 'analisar_significancia', 'analisar_confrontos',
+                   'analisar_builds']
+FORMATOS_CARREGAR = ['csv', 'parquet', 'xlsx']
+
+# Motores das análises (nucleo_lol.motores). O 'pandas' é medido com o
+# DataFrame já carregado (formato 'memoria'); os outros com uma Consulta
+# sobre o .parquet (formato = nome do motor), que lê o ficheiro em cada chamada
+MOTORES_POR_OMISSAO = ['pandas']
+
+
+# -------------------------------------------------------------------
+# MEDIÇÃO DE MEMÓRIA
+# -------------------------------------------------------------------
+def _rss_atual():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class _AmostradorRSS:
+    """
+    Lê o RSS do processo numa thread, de 2 em 2 ms, e guarda o máximo.
+    (ru_maxrss não serve: inclui o pico da preparação dos dados.)
+    """
+
+    def __enter__(self):
+        self.inicial = _rss_atual()
+        self.pico = self.inicial
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._amostrar, daemon=True)
+        self._thread.start()
+        return self
+
+    def _amostrar(self):
+        while not self._parar.wait(INTERVALO_AMOSTRAGEM_RSS):
+            self.pico = max(self.pico, _rss_atual())
+
+    def __exit__(self, *erro):
+        self._parar.set()
+        self._thread.join()
+        if self.inicial is not None:
+            self.pico = max(self.pico, _rss_atual())
+
+    @property
+    def pico_mb(self):
+        if self.inicial is None:
+            return None
+        return round((self.pico - self.inicial) / (1024 * 1024), 2)
+
+
+# -------------------------------------------------------------------
+# CADA MEDIÇÃO (corre num processo novo)
+# -------------------------------------------------------------------
+def _apagar_sidecars(caminho):
+    pasta = os.path.dirname(caminho)
+    nome = os.path.basename(caminho)
+    for ficheiro in os.listdir(pasta):
+        if ficheiro.startswith(nome + '.'):
+            os.remove(os.path.join(pasta, ficheiro))
+
+
+def _preparar(funcao, formato, caminhos):
+    """
+    Devolve (chamada, antes_de_cada_repeticao) para a medição pedida.
+    """
+    import analise_lol
+
+    if funcao == 'carregar_dados':
+        caminho = caminhos[formato.split('-')[0]]
+        if formato.endswith('-frio'):
+            # Sem cache Parquet: mede a conversão a partir do original
+            return (lambda: analise_lol.carregar_dados(caminho)), (lambda: _apagar_sidecars(caminho))
+        analise_lol.carregar_dados(caminho)  # Garante que a cache existe
+        return (lambda: analise_lol.carregar_dados(caminho)), None
+
+    from nucleo_lol.motores import contar_por_valor, histograma_kda
+
+    df = analise_lol.carregar_dados(caminhos['parquet'], motor='pandas' if formato == 'memoria' else formato)
+    campeao = contar_por_valor(df, 'champion_name').index[0]
+    if funcao == 'analisar_taxa_vitoria':
+        return (lambda: analise_lol.analisar_taxa_vitoria(df, MIN_JOGOS)), None
+    if funcao == 'analisar_kda_campeoes':
+        return (lambda: analise_lol.analisar_kda_campeoes(df, MIN_JOGOS)), None
+    if funcao == 'analisar_impacto_ouro':
+        return (lambda: analise_lol.analisar_impacto_ouro(df)), None
+    if funcao == 'analisar_campeoes':
+        return (lambda: analise_lol.analisar_campeoes(df, MIN_JOGOS)), None
+    if funcao == 'analisar_significancia':
+        metricas = analise_lol.analisar_campeoes(df, MIN_JOGOS)
+        histograma = histograma_kda(df, ['champion_name'])
+        return (lambda: analise_lol.analisar_significancia(metricas, histograma)), None
+    if funcao == 'analisar_confrontos':
+        return (lambda: analise_lol.analisar_confrontos(df, campeao, 'BOTTOM')), None
+    if funcao == 'analisar_builds':
+        return (lambda: analise_lol.analisar_builds(df, campeao, None)), None
+    if funcao == 'analisar_itens_campeao':
+        return (lambda: analise_lol.analisar_itens_campeao(df, campeao, None)), None
+    raise ValueError(f"Função desconhecida: {funcao}")
+
+
+def medir(funcao, formato, caminhos, repeticoes, medir_alocacoes=True):
+    """
+    Corre 'funcao' 'repeticoes' vezes e devolve as métricas.
+    As mensagens impressas pelas funções são descartadas.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        chamada, antes = _preparar(funcao, formato, caminhos)
+
+        tempos = []
+        pico_rss = None
+        for _ in range(repeticoes):
+            if antes is not None:
+                antes()
+            with _AmostradorRSS() as amostrador:
+                inicio = time.perf_counter()
+                chamada()
+                tempos.append(time.perf_counter() - inicio)
+            if amostrador.pico_mb is not None:
+                pico_rss = max(pico_rss or 0.0, amostrador.pico_mb)
+
+        # O tracemalloc torna tudo mais lento, por isso é uma passagem à parte
+        pico_alocado = None
+        if medir_alocacoes:
+            if antes is not None:
+                antes()
+            tracemalloc.start()
+            chamada()
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            pico_alocado = round(pico / (1024 * 1024), 2)
+
+    return {
+        'tempo_s': round(min(tempos), 6),
+        'tempo_mediana_s': round(statistics.median(tempos), 6),
+        'pico_rss_mb': pico_rss,
+        'pico_alocado_mb': pico_alocado,
+    }
+
+
+def _medir_em_processo_novo(*argumentos):
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(medir, *argumentos).result()
+
+
+# -------------------------------------------------------------------
+# DADOS SINTÉTICOS
+# -------------------------------------------------------------------
+def preparar_dados(linhas, pasta=PASTA_DADOS, semente=42):
+    """
+    Gera (se ainda não existirem) os ficheiros com 'linhas' linhas.
+    :return: {formato: caminho}
+    """
+    caminhos = {}
+    for formato in FORMATOS_CARREGAR:
+        if formato == 'xlsx' and linhas > MAX_LINHAS_EXCEL:
+            continue
+        caminho = os.path.join(pasta, f'partidas_{linhas}_s{semente}.{formato}')
+        if not os.path.exists(caminho):
+            print(f"A gerar {linhas} linhas sintéticas em '{caminho}'...")
+            gravar_partidas(caminho, linhas, semente)
+        caminhos[formato] = caminho
+    return caminhos
+
+
+# -------------------------------------------------------------------
+# RESULTADOS E COMPARAÇÃO
+# -------------------------------------------------------------------
+def _versao_codigo():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PASTA_PROJETO,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metadados():
+    import numpy
+    import pandas
+    return {
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _versao_codigo(),
+        'python': platform.python_version(),
+        'pandas': pandas.__version__,
+        'numpy': numpy.__version__,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+    }
+
+
+def _chave(resultado):
+    return resultado['funcao'], resultado['formato'], resultado['linhas']
+
+
+def comparar(resultados, baseline, tolerancia=TOLERANCIA_POR_OMISSAO):
+    """
+    Imprime a comparação com a baseline e devolve o nº de regressões
+    (medições mais lentas do que a baseline por mais de 'tolerancia').
+    """
+    anteriores = {_chave(r): r for r in baseline['resultados']}
+    regressoes = 0
+    print(f"\n--- Comparação com a baseline ({baseline['meta'].get('commit')}, {baseline['meta'].get('data')}) ---")
+    for resultado in resultados:
+        anterior = anteriores.get(_chave(resultado))
+        if anterior is None:
+            continue
+        racio = resultado['tempo_s'] / anterior['tempo_s'] if anterior['tempo_s'] else float('inf')
+        marca = ''
+        if racio > 1 + tolerancia:
+            marca = '  <-- REGRESSÃO'
+            regressoes += 1
+        print(f"{resultado['funcao']:<24} {resultado['formato']:<14} {resultado['linhas']:>10} "
+              f"{anterior['tempo_s']:>9.4f}s -> {resultado['tempo_s']:>9.4f}s  (x{racio:.2f}){marca}")
+    return regressoes
+
+
+def _imprimir(resultado):
+    rss = '-' if resultado['pico_rss_mb'] is None else f"{resultado['pico_rss_mb']:.1f} MB"
+    alocado = '-' if resultado['pico_alocado_mb'] is None else f"{resultado['pico_alocado_mb']:.1f} MB"
+    print(f"{resultado['funcao']:<24} {resultado['formato']:<14} {resultado['linhas']:>10} "
+          f"{resultado['tempo_s']:>9.4f}s  RSS {rss:>10}  alocado {alocado:>10}")
+
+
+# -------------------------------------------------------------------
+# PROGRAMA
+# -------------------------------------------------------------------
+def executar(linhas, repeticoes, funcoes, medir_alocacoes=True, pasta=PASTA_DADOS, motores=MOTORES_POR_OMISSAO):
+    resultados = []
+    for n in linhas:
+        caminhos = preparar_dados(n, pasta)
+        # csv/xlsx: sem cache Parquet (frio) e com ela (quente); o .parquet é lido diretamente
+        medicoes = [('carregar_dados', formato if formato == 'parquet' else f'{formato}-{cache}')
+                    for formato in FORMATOS_CARREGAR if formato in caminhos
+                    for cache in (('',) if formato == 'parquet' else ('frio', 'quente'))]
+        medicoes += [(funcao, 'memoria' if motor == 'pandas' else motor)
+                     for motor in motores for funcao in FUNCOES_ANALISE]
+        for funcao, formato in medicoes:
+            if funcoes and funcao not in funcoes:
+                continue
+            metricas = _medir_em_processo_novo(funcao, formato, caminhos, repeticoes, medir_alocacoes)
+            resultado = {'funcao': funcao, 'formato': formato, 'linhas': n, **metricas}
+            _imprimir(resultado)
+            resultados.append(resultado)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das funções de análise com dados sintéticos.")
+    parser.add_argument('--linhas', type=int, nargs='+', default=LINHAS_POR_OMISSAO,
+                        help="Tamanhos a medir (nº de linhas, de 10 mil a 50 milhões).")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_POR_OMISSAO)
+    parser.add_argument('--funcoes', nargs='+', choices=['carregar_dados', *FUNCOES_ANALISE],
+                        help="Só mede estas funções.")
+    parser.add_argument('--motores', nargs='+', choices=['pandas', 'polars', 'duckdb'],
+                        default=MOTORES_POR_OMISSAO,
+                        help="Motores com que as análises são medidas (ex: --motores pandas polars duckdb).")
+    parser.add_argument('--sem-alocacoes', action='store_true',
+                        help="Não mede as alocações (tracemalloc), que tornam a medição mais lenta.")
+    parser.add_argument('--pasta-dados', default=PASTA_DADOS,
+                        help="Onde guardar os ficheiros sintéticos (reutilizados entre execuções).")
+    parser.add_argument('--saida', default=os.path.join(PASTA_BENCHMARKS, 'resultados.json'))
+    parser.add_argument('--baseline', help="JSON de uma execução anterior para comparar.")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_POR_OMISSAO,
+                        help="Abrandamento aceite antes de contar como regressão (0.2 = 20%%).")
+    args = parser.parse_args()
+
+    resultados = executar(args.linhas, args.repeticoes, args.funcoes,
+                          not args.sem_alocacoes, args.pasta_dados, args.motores)
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump({'meta': _metadados(), 'resultados': resultados}, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados gravados em '{args.saida}'.")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressoes = comparar(resultados, baseline, args.tolerancia)
+        if regressoes:
+            print(f"\n{regressoes} regressão(ões) acima de {args.tolerancia:.0%}.")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+Gerador determinístico de partidas sintéticas com o mesmo esquema dos
+dados reais (match_id, game_version, champion_name, win, K/D/A,
+gold_earned, item0..item6, game_mode, individual_position).
+
+As linhas são geradas em blocos (sempre completos) de partidas com uma
+semente própria por bloco, por isso um ficheiro com N linhas é sempre
+o início do ficheiro com 2N linhas (útil para testar a atualização
+incremental).
+
+Uso direto:
+    py benchmarks/dados_sinteticos.py 1000000 dados/partidas_1M.parquet
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------------------------
+# DISTRIBUIÇÕES
+# -------------------------------------------------------------------
+CAMPEOES = [
+    'Aatrox', 'Ahri', 'Akali', 'Akshan', 'Alistar', 'Amumu', 'Anivia', 'Annie', 'Aphelios', 'Ashe',
+    'AurelionSol', 'Azir', 'Bard', 'Belveth', 'Blitzcrank', 'Brand', 'Braum', 'Briar', 'Caitlyn', 'Camille',
+    'Cassiopeia', 'Chogath', 'Corki', 'Darius', 'Diana', 'DrMundo', 'Draven', 'Ekko', 'Elise', 'Evelynn',
+    'Ezreal', 'Fiddlesticks', 'Fiora', 'Fizz', 'Galio', 'Gangplank', 'Garen', 'Gnar', 'Gragas', 'Graves',
+    'Gwen', 'Hecarim', 'Heimerdinger', 'Hwei', 'Illaoi', 'Irelia', 'Ivern', 'Janna', 'JarvanIV', 'Jax',
+    'Jayce', 'Jhin', 'Jinx', 'KSante', 'Kaisa', 'Kalista', 'Karma', 'Karthus', 'Kassadin', 'Katarina',
+    'Kayle', 'Kayn', 'Kennen', 'Khazix', 'Kindred', 'Kled', 'KogMaw', 'Leblanc', 'LeeSin', 'Leona',
+    'Lillia', 'Lissandra', 'Lucian', 'Lulu', 'Lux', 'Malphite', 'Malzahar', 'Maokai', 'MasterYi', 'Milio',
+    'MissFortune', 'MonkeyKing', 'Mordekaiser', 'Morgana', 'Naafiri', 'Nami', 'Nasus', 'Nautilus', 'Neeko', 'Nidalee',
+    'Nilah', 'Nocturne', 'Nunu', 'Olaf', 'Orianna', 'Ornn', 'Pantheon', 'Poppy', 'Pyke', 'Qiyana',
+    'Quinn', 'Rakan', 'Rammus', 'RekSai', 'Rell', 'Renata', 'Renekton', 'Rengar', 'Riven', 'Rumble',
+    'Ryze', 'Samira', 'Sejuani', 'Senna', 'Seraphine', 'Sett', 'Shaco', 'Shen', 'Shyvana', 'Singed',
+    'Sion', 'Sivir', 'Skarner', 'Smolder', 'Sona', 'Soraka', 'Swain', 'Sylas', 'Syndra', 'TahmKench',
+    'Taliyah', 'Talon', 'Taric', 'Teemo', 'Thresh', 'Tristana', 'Trundle', 'Tryndamere', 'TwistedFate', 'Twitch',
+    'Udyr', 'Urgot', 'Varus', 'Vayne', 'Veigar', 'Velkoz', 'Vex', 'Vi', 'Viego', 'Viktor',
+    'Vladimir', 'Volibear', 'Warwick', 'Xayah', 'Xerath', 'XinZhao', 'Yasuo', 'Yone', 'Yorick', 'Yuumi',
+    'Zac', 'Zed', 'Zeri', 'Ziggs', 'Zilean', 'Zoe', 'Zyra',
+]
+
+# Itens finais, botas e itens iniciais (IDs do Data Dragon)
+ITENS = [
+    1001, 1054, 1055, 1056, 1082, 1083, 2003, 2010, 2055, 3001, 3003, 3004, 3006, 3009, 3011, 3020,
+    3026, 3031, 3033, 3036, 3047, 3050, 3053, 3065, 3068, 3071, 3072, 3074, 3075, 3078, 3083, 3085,
+    3087, 3089, 3091, 3094, 3100, 3102, 3107, 3109, 3110, 3111, 3115, 3116, 3118, 3124, 3135, 3137,
+    3139, 3142, 3143, 3146, 3152, 3153, 3156, 3157, 3158, 3161, 3165, 3172, 3179, 3181, 3190, 3222,
+    3504, 3508, 3742, 3748, 3814, 4005, 4401, 4628, 4629, 4633, 4645, 4646, 6035, 6333, 6609, 6610,
+    6617, 6620, 6621, 6653, 6655, 6657, 6662, 6664, 6665, 6671, 6672, 6673, 6675, 6676, 6691, 6692,
+    6694, 6695, 6697, 6698, 6699, 6701,
+]
+SENTINELAS = [3340, 3363, 3364]
+PESOS_SENTINELAS = [0.6, 0.25, 0.15]
+
+MODOS = ['CLASSIC', 'ARAM', 'CHERRY', 'URF']
+PESOS_MODOS = [0.72, 0.22, 0.04, 0.02]
+
+POSICOES = ['TOP', 'JUNGLE', 'MIDDLE', 'BOTTOM', 'UTILITY']
+
+# Médias por posição (TOP, JUNGLE, MIDDLE, BOTTOM, UTILITY)
+KILLS_MEDIAS = np.array([5.0, 6.0, 7.0, 7.5, 2.0])
+DEATHS_MEDIAS = np.array([5.0, 5.0, 5.0, 5.5, 5.5])
+ASSISTS_MEDIAS = np.array([5.0, 8.0, 7.0, 7.0, 13.0])
+OURO_POR_MINUTO = np.array([400.0, 380.0, 420.0, 440.0, 280.0])
+
+PATCHES = list(range(1, 25))
+REGIOES = ['BR1', 'EUW1', 'NA1', 'KR', 'LA1']
+
+PARTIDAS_POR_BLOCO = 10_000
+JOGADORES_POR_PARTIDA = 10
+
+
+def _pesos_zipf(n, expoente, rng):
+    """
+    Popularidade ao estilo Zipf (poucos muito jogados, cauda longa),
+    com uma ordem diferente por cada chamada.
+    """
+    pesos = 1.0 / (np.arange(n) + 5.0) ** expoente
+    pesos = pesos[rng.permutation(n)]
+    return pesos / pesos.sum()
+
+
+def _distribuicoes(semente):
+    rng = np.random.default_rng([semente, 0])
+    return {
+        # Cada posição (e o ARAM, índice 5) tem a sua própria lista de favoritos
+        'campeoes': np.stack([_pesos_zipf(len(CAMPEOES), 1.1, rng) for _ in range(len(POSICOES) + 1)]),
+        'itens': _pesos_zipf(len(ITENS), 0.9, rng),
+    }
+
+
+# -------------------------------------------------------------------
+# GERAÇÃO
+# -------------------------------------------------------------------
+def _gerar_bloco(indice_bloco, semente, distribuicoes):
+    rng = np.random.default_rng([semente, indice_bloco + 1])
+    n_partidas = PARTIDAS_POR_BLOCO
+    n = n_partidas * JOGADORES_POR_PARTIDA
+    primeira_partida = indice_bloco * PARTIDAS_POR_BLOCO
+
+    # Por partida: modo, patch, duração e equipa vencedora
+    modo = rng.choice(len(MODOS), size=n_partidas, p=PESOS_MODOS)
+    patch = rng.choice(PATCHES, size=n_partidas)
+    duracao = np.clip(rng.normal(30, 6, size=n_partidas), 15, 55)
+    vence_azul = rng.random(n_partidas) < 0.5
+    regiao = rng.choice(len(REGIOES), size=n_partidas)
+
+    # Por jogador (10 linhas por partida, 5 de cada equipa)
+    modo_l = np.repeat(modo, JOGADORES_POR_PARTIDA)
+    duracao_l = np.repeat(duracao, JOGADORES_POR_PARTIDA)
+    slot = np.tile(np.arange(JOGADORES_POR_PARTIDA), n_partidas)
+    posicao = slot % len(POSICOES)
+    vitoria = np.repeat(vence_azul, JOGADORES_POR_PARTIDA) == (slot < len(POSICOES))
+    com_posicoes = (modo_l == 0) | (modo_l == 3)  # CLASSIC e URF
+
+    # Campeão: pool da posição (ou do ARAM para modos sem posições)
+    pool = np.where(com_posicoes, posicao, len(POSICOES))
+    campeao = np.empty(n, dtype=np.int64)
+    for p in range(len(POSICOES) + 1):
+        linhas = np.flatnonzero(pool == p)
+        campeao[linhas] = rng.choice(len(CAMPEOES), size=len(linhas), p=distribuicoes['campeoes'][p])
+
+    # K/D/A e ouro: dependem da posição, do resultado e do modo
+    fator_vitoria = np.where(vitoria, 1.3, 0.8)
+    fator_modo = np.where(modo_l == 1, 1.6, 1.0)
+    kills = rng.poisson(KILLS_MEDIAS[posicao] * fator_vitoria * fator_modo)
+    deaths = rng.poisson(DEATHS_MEDIAS[posicao] / fator_vitoria * fator_modo)
+    assists = rng.poisson(ASSISTS_MEDIAS[posicao] * fator_vitoria * fator_modo)
+    ouro = duracao_l * OURO_POR_MINUTO[posicao] * np.where(vitoria, 1.1, 0.95)
+    ouro = np.maximum(ouro + rng.normal(0, 800, size=n), 500).astype(np.int64)
+
+    # Itens: mais slots preenchidos em partidas mais longas; slot 6 = sentinela
+    itens = np.array(ITENS)[rng.choice(len(ITENS), size=(n, 6), p=distribuicoes['itens'])]
+    preenchidos = np.clip(np.round(duracao_l / 6 + rng.normal(0, 0.8, size=n)), 1, 6)
+    itens[np.arange(6) >= preenchidos[:, None]] = 0
+    sentinela = np.array(SENTINELAS)[rng.choice(len(SENTINELAS), size=n, p=PESOS_SENTINELAS)]
+
+    id_partida = np.repeat(np.arange(primeira_partida, primeira_partida + n_partidas), JOGADORES_POR_PARTIDA)
+    regiao_l = np.repeat(regiao, JOGADORES_POR_PARTIDA)
+    build = np.repeat(rng.integers(1000, 9999, size=n_partidas), JOGADORES_POR_PARTIDA)
+    patch_l = np.repeat(patch, JOGADORES_POR_PARTIDA)
+
+    df = pd.DataFrame({
+        'match_id': pd.Series(np.array(REGIOES)[regiao_l]) + '_' + pd.Series(6_000_000_000 + id_partida).astype(str),
+        'game_version': ('14.' + pd.Series(patch_l).astype(str) + '.' + pd.Series(550 + patch_l).astype(str)
+                         + '.' + pd.Series(build).astype(str)),
+        'champion_name': np.array(CAMPEOES, dtype=object)[campeao],
+        'win': vitoria,
+        'kills': kills,
+        'deaths': deaths,
+        'assists': assists,
+        'gold_earned': ouro,
+        **{f'item{i}': itens[:, i] for i in range(6)},
+        'item6': sentinela,
+        'game_mode': np.array(MODOS, dtype=object)[modo_l],
+        'individual_position': np.where(com_posicoes, np.array(POSICOES, dtype=object)[posicao], 'Invalid'),
+    })
+    return df
+
+
+def gerar_blocos(n_linhas, semente=42):
+    """
+    Gera as partidas em blocos (DataFrames) de PARTIDAS_POR_BLOCO * 10
+    linhas, até perfazer 'n_linhas' (o último bloco é cortado).
+    """
+    distribuicoes = _distribuicoes(semente)
+    indice_bloco = 0
+    restantes = n_linhas
+    while restantes > 0:
+        bloco = _gerar_bloco(indice_bloco, semente, distribuicoes)
+        if len(bloco) > restantes:
+            bloco = bloco.iloc[:restantes]
+        restantes -= len(bloco)
+        indice_bloco += 1
+        yield bloco
+
+
+def gerar_partidas(n_linhas, semente=42):
+    """
+    Devolve um DataFrame com 'n_linhas' linhas sintéticas (em memória).
+    Para ficheiros grandes usar gravar_partidas.
+    """
+    return pd.concat(gerar_blocos(n_linhas, semente), ignore_index=True)
+
+
+def gravar_partidas(caminho, n_linhas, semente=42):
+    """
+    Grava as partidas sintéticas em .csv, .parquet ou .xlsx, bloco a
+    bloco (a memória usada não depende de 'n_linhas', exceto no Excel).
+    """
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    raiz, extensao = os.path.splitext(caminho)
+    temporario = f"{raiz}.{os.getpid()}.tmp{extensao}"
+
+    if caminho.endswith('.csv'):
+        with open(temporario, 'w', newline='', encoding='utf-8') as f:
+            for i, bloco in enumerate(gerar_blocos(n_linhas, semente)):
+                bloco.to_csv(f, header=(i == 0), index=False)
+    elif caminho.endswith('.parquet'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        escritor = None
+        try:
+            for bloco in gerar_blocos(n_linhas, semente):
+                tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(temporario, tabela.schema)
+                escritor.write_table(tabela)
+        finally:
+            if escritor is not None:
+                escritor.close()
+    elif caminho.endswith('.xlsx'):
+        if n_linhas > 1_048_575:
+            raise ValueError("O Excel só aceita 1 048 575 linhas de dados por folha.")
+        gerar_partidas(n_linhas, semente).to_excel(temporario, index=False, engine='openpyxl')
+    else:
+        raise ValueError(f"Extensão de ficheiro não reconhecida: {caminho}")
+
+    os.replace(temporario, caminho)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("Uso: dados_sinteticos.py <nº de linhas> <ficheiro .csv/.parquet/.xlsx>")
+        sys.exit(1)
+    gravar_partidas(sys.argv[2], int(sys.argv[1]))
+    print(f"Ficheiro '{sys.argv[2]}' gravado.")
@@ -0,0 +1,11 @@
+"""
+Núcleo partilhado entre o script de terminal (analise_lol.py)
+e o dashboard (app.py).
+"""
+from .cache import (
+    COLUNAS_ANALISE,
+    COLUNAS_ITENS,
+    carregar_dados_com_cache,
+    converter_para_parquet,
+)
+from .esquema import aplicar_esquema, relatorio_memoria
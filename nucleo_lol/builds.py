@@ -0,0 +1,272 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from .cache import COLUNAS_ITENS
+from .catalogo import resolver_nomes_itens
+from .cubo import CHAVES_CUBO
+from .esquema import patch_da_versao
+from .estatistica import intervalo_wilson
+from .itens import CHAVES_GRUPO_ITENS
+
+# -------------------------------------------------------------------
+# ÍNDICE DE BUILDS (inventário completo de cada partida)
+# -------------------------------------------------------------------
+
+# O slot 6 é sempre o amuleto (trinket) e não faz parte da build
+COLUNAS_BUILD = COLUNAS_ITENS[:6]
+
+# Cada partida é guardada pela sua chave compacta: os 6 IDs ordenados
+# (0 = slot vazio, sempre primeiro). Partidas com o mesmo inventário
+# ficam numa só linha com o nº de jogos e de vitórias, por isso a
+# mineração trabalha sobre inventários distintos e não sobre partidas.
+COLUNAS_CHAVE_BUILD = ['b1', 'b2', 'b3', 'b4', 'b5', 'b6']
+CHAVES_INDICE_BUILDS = [*CHAVES_GRUPO_ITENS, *COLUNAS_CHAVE_BUILD]
+
+# Suporte mínimo por omissão: fração das partidas da fatia
+SUPORTE_MINIMO = 0.01
+
+# Em fatias pequenas (menos de 100 partidas) 1% arredonda para 1 partida
+# e o Apriori não poda nada; um conjunto tem de aparecer pelo menos aqui
+SUPORTE_MINIMO_JOGOS = 2
+
+TAMANHOS_CONJUNTOS = {2: 'Pares', 3: 'Trios'}
+NOME_BUILD_COMPLETA = 'Builds completas'
+
+
+def construir_indice_builds(df):
+    """
+    Conta as partidas e vitórias de cada inventário (chave ordenada dos
+    6 slots) por modo, posição, campeão e patch.
+    Partidas sem nenhum item são ignoradas.
+    """
+    itens = np.sort(df[COLUNAS_BUILD].to_numpy(dtype=np.int64), axis=1)
+    chaves = {nome: df[nome] for nome in CHAVES_CUBO}
+    chaves['patch'] = patch_da_versao(df)
+    auxiliar = pd.DataFrame({**chaves, **dict(zip(COLUNAS_CHAVE_BUILD, itens.T))}, index=df.index)
+    auxiliar['win'] = df['win'].to_numpy(dtype=np.int64)
+    auxiliar = auxiliar[itens[:, -1] != 0] if len(auxiliar) else auxiliar
+    agrupado = auxiliar.groupby(CHAVES_INDICE_BUILDS, observed=True)['win']
+    return pd.DataFrame({'jogos': agrupado.size(), 'vitorias': agrupado.sum()}).astype('int64')
+
+
+def combinar_indices_builds(indices):
+    """
+    Junta vários índices de builds somando as contagens das mesmas chaves.
+    """
+    indices = [i for i in indices if i is not None and not i.empty]
+    if not indices:
+        return None
+    if len(indices) == 1:
+        return indices[0]
+    juntos = pd.concat([i.reset_index() for i in indices], ignore_index=True)
+    for chave in CHAVES_GRUPO_ITENS:
+        juntos[chave] = juntos[chave].astype(str).astype('category')
+    return juntos.groupby(CHAVES_INDICE_BUILDS, observed=True)[['jogos', 'vitorias']].sum().astype('int64')
+
+
+def fatia_indice_builds(indice, nome_do_campeao, modo=None, posicao=None):
+    """
+    Inventários de um campeão (índice: patch, b1..b6), somando os
+    vários modos/posições quando não são dados.
+    """
+    niveis = indice.index
+    mascara = niveis.get_level_values('champion_name') == nome_do_campeao
+    if modo is not None:
+        mascara &= niveis.get_level_values('game_mode') == modo
+    if posicao is not None:
+        mascara &= niveis.get_level_values('individual_position') == posicao
+    return indice[mascara].groupby(level=['patch', *COLUNAS_CHAVE_BUILD], observed=True).sum()
+
+
+# -------------------------------------------------------------------
+# MINERAÇÃO DE CONJUNTOS FREQUENTES (Apriori)
+# -------------------------------------------------------------------
+def _codificar(fatia, tabela_nomes):
+    """
+    Troca cada (patch, ID) por um código pequeno (1..K) do nome do item
+    nesse patch (ou do ID, sem tabela), ordena cada linha e junta as
+    linhas que ficaram iguais (o mesmo item com IDs de patches diferentes).
+
+    :return: (códigos m x 6, jogos, vitórias, nomes dos códigos)
+    """
+    ids = np.column_stack([fatia.index.get_level_values(c).to_numpy(dtype=np.int64) for c in COLUNAS_CHAVE_BUILD])
+    if tabela_nomes is not None:
+        patches = np.repeat(fatia.index.get_level_values('patch').astype(str).to_numpy(dtype=object), ids.shape[1])
+        rotulos = resolver_nomes_itens(tabela_nomes, patches, ids.ravel())
+    else:
+        rotulos = ids.ravel().astype(str).astype(object)
+    rotulos[ids.ravel() == 0] = None
+    codigos, nomes = pd.factorize(rotulos, sort=True)  # None -> -1; códigos por ordem alfabética
+    codigos = np.sort((codigos + 1).reshape(ids.shape), axis=1)
+
+    unicas, inverso = np.unique(codigos, axis=0, return_inverse=True)
+    inverso = inverso.ravel()
+    jogos = np.bincount(inverso, weights=fatia['jogos'].to_numpy()).astype(np.int64)
+    vitorias = np.bincount(inverso, weights=fatia['vitorias'].to_numpy()).astype(np.int64)
+    return unicas, jogos, vitorias, np.asarray(nomes, dtype=object)
+
+
+def _contar(chaves, jogos, vitorias, minimo):
+    """
+    Soma jogos/vitórias por chave e devolve só as chaves frequentes.
+    """
+    if not len(chaves):
+        return chaves, jogos, vitorias
+    # Chaves por empacotar (ver _empacotar) são linhas de códigos
+    unicas, inverso = np.unique(chaves, axis=0 if chaves.ndim > 1 else None, return_inverse=True)
+    inverso = inverso.ravel()
+    total_jogos = np.bincount(inverso, weights=jogos).astype(np.int64)
+    total_vitorias = np.bincount(inverso, weights=vitorias).astype(np.int64)
+    frequentes = total_jogos >= minimo
+    return unicas[frequentes], total_jogos[frequentes], total_vitorias[frequentes]
+
+
+def _conjuntos(codigos, jogos, vitorias, tamanho, base, minimo, permitidos=None):
+    """
+    Conta todos os conjuntos de 'tamanho' itens distintos de cada linha
+    (as colunas já vêm ordenadas, por isso cada conjunto sai uma só vez).
+    Com 'permitidos', só conta os conjuntos cujos subconjuntos de
+    tamanho-1 são todos frequentes (poda do Apriori).
+    """
+    chaves, pesos_jogos, pesos_vitorias = [], [], []
+    for colunas in combinations(range(codigos.shape[1]), tamanho):
+        partes = codigos[:, colunas]
+        # Com slots vazios (0 ficam à esquerda) o conjunto não tem 'tamanho' itens
+        validas = partes[:, 0] > 0
+        if permitidos is not None:
+            for sub in combinations(range(tamanho), tamanho - 1):
+                validas &= _pertence(_empacotar(partes[:, sub], base), permitidos)
+        chaves.append(_empacotar(partes[validas], base))
+        pesos_jogos.append(jogos[validas])
+        pesos_vitorias.append(vitorias[validas])
+    return _contar(np.concatenate(chaves), np.concatenate(pesos_jogos), np.concatenate(pesos_vitorias), minimo)
+
+
+def _cabe_em_int64(base, tamanho):
+    return base ** tamanho < 2 ** 63
+
+
+def _empacotar(partes, base):
+    """
+    Junta cada linha de códigos numa chave int64 (chave*base + código).
+    Se a chave não couber em int64 (vocabulário grande), devolve as
+    próprias linhas de códigos, que _contar e _pertence tratam como
+    chaves com np.unique(..., axis=0).
+    """
+    if not _cabe_em_int64(base, partes.shape[1]):
+        return np.ascontiguousarray(partes, dtype=np.int64).reshape(len(partes), partes.shape[1])
+    chave = np.zeros(len(partes), dtype=np.int64)
+    for coluna in range(partes.shape[1]):
+        chave = chave * base + partes[:, coluna]
+    return chave
+
+
+def _desempacotar(chave, base, tamanho):
+    if chave.ndim > 1 or not _cabe_em_int64(base, tamanho):
+        return chave.reshape(len(chave), tamanho)
+    partes = []
+    for _ in range(tamanho):
+        partes.append(chave % base)
+        chave = chave // base
+    return np.column_stack(partes[::-1])
+
+
+def _pertence(chaves, permitidos):
+    """
+    np.isin para chaves empacotadas ou, linha a linha, por empacotar.
+    """
+    if chaves.ndim == 1:
+        return np.isin(chaves, permitidos)
+    if not len(chaves) or not len(permitidos):
+        return np.zeros(len(chaves), dtype=bool)
+    _, inverso = np.unique(np.concatenate([chaves, permitidos]), axis=0, return_inverse=True)
+    inverso = inverso.ravel()
+    return np.isin(inverso[:len(chaves)], inverso[len(chaves):])
+
+
+def _tabela(tipo, codigos, jogos, vitorias, nomes):
+    rotulos = [' + '.join(nomes[c - 1] for c in linha if c > 0) for linha in codigos]
+    inferior, superior = intervalo_wilson(vitorias, jogos)
+    return pd.DataFrame({
+        'tipo': tipo,
+        'itens': rotulos,
+        'jogos': jogos,
+        'win': vitorias / np.maximum(jogos, 1) * 100,
+        'win_inferior': inferior * 100,
+        'win_superior': superior * 100,
+    })
+
+
+def minerar_builds(fatia, tabela_nomes=None, suporte_minimo=SUPORTE_MINIMO, tamanhos=(2, 3),
+                   min_jogos=SUPORTE_MINIMO_JOGOS, top=None):
+    """
+    Pares e trios de itens frequentes e builds completas (6 slots cheios)
+    de uma fatia do índice de builds, com a taxa de vitória de cada uma.
+
+    Apriori: os itens com menos jogos do que o suporte mínimo são retirados
+    logo no início (nenhum conjunto com eles pode ser frequente) e um trio
+    só é contado se os seus 3 pares forem frequentes. Tudo é vetorizado
+    sobre os inventários distintos, com os conjuntos como chaves inteiras.
+
+    :param fatia: Resultado de fatia_indice_builds.
+    :param tabela_nomes: Catálogo dos nomes por patch (ou None para IDs).
+    :param suporte_minimo: Fração das partidas (0.01 = 1%) ou, se >= 1,
+                           nº mínimo de partidas de cada conjunto.
+    :param min_jogos: Mínimo absoluto de partidas de cada conjunto, seja
+                      qual for o suporte (nunca menos de SUPORTE_MINIMO_JOGOS).
+    :param top: Nº máximo de linhas de cada tipo (None = todas).
+    :return: DataFrame com 'tipo', 'itens', 'jogos', 'win' (%) e o intervalo
+             de Wilson, ordenado pelo limite inferior dentro de cada tipo;
+             None se a fatia estiver vazia.
+    """
+    if fatia is None or fatia.empty:
+        return None
+    codigos, jogos, vitorias, nomes = _codificar(fatia, tabela_nomes)
+    total = int(jogos.sum())
+    minimo = max(int(np.ceil(suporte_minimo * total)) if suporte_minimo < 1 else int(suporte_minimo),
+                 min_jogos, SUPORTE_MINIMO_JOGOS)
+    base = len(nomes) + 1
+
+    tabelas = []
+
+    # Builds completas: os 6 slots com itens (antes de retirar os pouco frequentes)
+    completas = np.all(codigos > 0, axis=1)
+    chaves, jogos_b, vitorias_b = _contar(_empacotar(codigos[completas], base),
+                                          jogos[completas], vitorias[completas], minimo)
+    tabelas.append(_tabela(NOME_BUILD_COMPLETA, _desempacotar(chaves, base, codigos.shape[1]),
+                           jogos_b, vitorias_b, nomes))
+
+    # Nos conjuntos cada item conta uma vez por partida: as repetições
+    # (ficam seguidas, porque as linhas estão ordenadas) passam a slot vazio
+    repetidos = np.zeros_like(codigos, dtype=bool)
+    repetidos[:, 1:] = codigos[:, 1:] == codigos[:, :-1]
+    codigos = np.where(repetidos, 0, codigos)
+
+    # Itens frequentes (1 item): os outros também passam a slot vazio
+    presentes = np.bincount(codigos.ravel(), weights=np.repeat(jogos, codigos.shape[1]), minlength=base)
+    frequentes = presentes >= minimo
+    frequentes[0] = True
+    codigos = np.sort(np.where(frequentes[codigos], codigos, 0), axis=1)
+    codigos, inverso = np.unique(codigos, axis=0, return_inverse=True)
+    inverso = inverso.ravel()
+    jogos = np.bincount(inverso, weights=jogos).astype(np.int64)
+    vitorias = np.bincount(inverso, weights=vitorias).astype(np.int64)
+
+    permitidos = None
+    for tamanho in sorted(tamanhos):
+        chaves, jogos_c, vitorias_c = _conjuntos(codigos, jogos, vitorias, tamanho, base, minimo,
+                                                 permitidos if tamanho > min(tamanhos) else None)
+        tabelas.append(_tabela(TAMANHOS_CONJUNTOS.get(tamanho, f'{tamanho} itens'),
+                               _desempacotar(chaves, base, tamanho), jogos_c, vitorias_c, nomes))
+        permitidos = chaves
+
+    resultado = pd.concat(tabelas, ignore_index=True).round(2)
+    ordem_tipos = [TAMANHOS_CONJUNTOS.get(t, f'{t} itens') for t in sorted(tamanhos)] + [NOME_BUILD_COMPLETA]
+    resultado['tipo'] = pd.Categorical(resultado['tipo'], categories=ordem_tipos, ordered=True)
+    resultado = resultado.sort_values(by=['tipo', 'win_inferior', 'jogos'], ascending=[True, False, False],
+                                      ignore_index=True)
+    if top is not None:
+        resultado = resultado.groupby('tipo', observed=True).head(top).reset_index(drop=True)
+    return resultado
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from .instrumentacao import contar
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # O pyarrow é opcional: sem ele lemos sempre o ficheiro original
+    pa = pq = None
+
+# -------------------------------------------------------------------
+# CONSTANTES
+# -------------------------------------------------------------------
+
+# Colunas que as análises realmente usam (projeção na leitura)
+COLUNAS_ITENS = ['item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'item6']
+
+# Identifica a partida de cada linha (confrontos e agregados incrementais)
+COLUNA_PARTIDA = 'match_id'
+
+COLUNAS_ANALISE = [
+    'champion_name', 'win', 'kills', 'deaths', 'assists', 'gold_earned',
+    *COLUNAS_ITENS,
+    'game_mode', 'individual_position', 'game_version', COLUNA_PARTIDA,
+]
+
+# Ficheiros "sidecar" gravados ao lado do ficheiro original
+SUFIXO_CACHE = '.cache.parquet'
+SUFIXO_META = '.cache.json'
+
+TAMANHO_BLOCO_HASH = 1024 * 1024
+
+# Linhas por row group da cache: a leitura com filtros salta row groups
+# inteiros e a atualização incremental só relê o último
+LINHAS_POR_GRUPO_CACHE = 100_000
+
+# Erros ao gravar a cache: disco (OSError) ou dados que o Arrow não sabe
+# converter (ex: uma coluna do Excel com números e texto misturados)
+ERROS_CONVERSAO = (OSError, ValueError, TypeError) + ((pa.ArrowException,) if pa is not None else ())
+
+
+# -------------------------------------------------------------------
+# FUNÇÕES AUXILIARES
+# -------------------------------------------------------------------
+def _caminhos_cache(caminho_do_ficheiro):
+    return caminho_do_ficheiro + SUFIXO_CACHE, caminho_do_ficheiro + SUFIXO_META
+
+
+def hash_ficheiro(caminho_do_ficheiro):
+    """
+    Calcula o SHA-256 do ficheiro original, lido em blocos.
+    """
+    sha = hashlib.sha256()
+    with open(caminho_do_ficheiro, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def gravar_json_atomico(caminho, dados):
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f)
+    os.replace(temporario, caminho)
+
+
+def _ler_ficheiro_original(caminho_do_ficheiro, colunas=None):
+    """
+    Lê o .xlsx ou .csv original (o caminho lento).
+    Se 'colunas' for dado, só essas colunas são lidas.
+    """
+    usecols = None
+    if colunas is not None:
+        conjunto = set(colunas)
+        usecols = lambda coluna: coluna in conjunto
+
+    if caminho_do_ficheiro.endswith('.xlsx'):
+        return pd.read_excel(caminho_do_ficheiro, usecols=usecols)
+    elif caminho_do_ficheiro.endswith('.csv'):
+        return pd.read_csv(caminho_do_ficheiro, usecols=usecols)
+    else:
+        raise ValueError(f"Extensão de ficheiro não reconhecida: {caminho_do_ficheiro}")
+
+
+def _ler_meta(caminho_meta):
+    try:
+        with open(caminho_meta, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _filtrar(df, filtros):
+    if not filtros:
+        return df
+    mascara = pd.Series(True, index=df.index)
+    for coluna, valor in filtros.items():
+        mascara &= df[coluna] == valor
+    return df[mascara.to_numpy()].reset_index(drop=True)
+
+
+def ler_parquet(caminho_parquet, colunas=None, filtros=None):
+    """
+    Lê um ficheiro Parquet com projeção de colunas e, com 'filtros'
+    ({coluna: valor}), só as linhas que os passam (os row groups que as
+    estatísticas excluem nem são lidos).
+
+    O ficheiro é aberto com memory_map, por isso vários processos
+    (workers do Streamlit) partilham as mesmas páginas do disco em vez
+    de cada um ter o seu próprio buffer de leitura.
+    Colunas pedidas que não existem no ficheiro são ignoradas.
+    """
+    if colunas is not None:
+        existentes = set(pq.read_schema(caminho_parquet).names)
+        colunas = [c for c in colunas if c in existentes]
+    condicoes = [(coluna, '==', valor) for coluna, valor in filtros.items()] if filtros else None
+    tabela = pq.read_table(caminho_parquet, columns=colunas, filters=condicoes, memory_map=True)
+    return tabela.to_pandas()
+
+
+# -------------------------------------------------------------------
+# VALIDAÇÃO E CONVERSÃO DA CACHE
+# -------------------------------------------------------------------
+def sidecar_valido(caminho_do_ficheiro, caminho_sidecar, caminho_meta):
+    """
+    Verifica se um ficheiro "sidecar" (cache, cubo, ...) corresponde
+    ao ficheiro original, usando os metadados gravados em 'caminho_meta'.
+
+    Tamanho e data de modificação iguais chegam para aceitar o sidecar.
+    Se só a data mudou (ex: ficheiro copiado), comparamos o hash e,
+    se o conteúdo for o mesmo, atualizamos os metadados e reutilizamos.
+    """
+    if not (os.path.exists(caminho_sidecar) and os.path.exists(caminho_meta)):
+        return False
+
+    meta = _ler_meta(caminho_meta)
+    if not meta:
+        return False
+
+    estado = os.stat(caminho_do_ficheiro)
+    if meta.get('tamanho') != estado.st_size:
+        return False
+    if meta.get('mtime_ns') == estado.st_mtime_ns:
+        return True
+
+    if meta.get('sha256') != hash_ficheiro(caminho_do_ficheiro):
+        return False
+
+    meta['mtime_ns'] = estado.st_mtime_ns
+    try:
+        gravar_json_atomico(caminho_meta, meta)
+    except OSError:
+        pass
+    return True
+
+
+def gravar_meta_sidecar(caminho_do_ficheiro, caminho_meta, estado, sha256, **extra):
+    """
+    Grava os metadados (tamanho, mtime, hash) do ficheiro original que
+    deu origem a um sidecar. 'estado' e 'sha256' devem ser obtidos ANTES
+    de ler o ficheiro, para nunca aceitar um sidecar mais antigo do que
+    o ficheiro.
+    """
+    gravar_json_atomico(caminho_meta, {
+        'origem': os.path.basename(caminho_do_ficheiro),
+        'tamanho': estado.st_size,
+        'mtime_ns': estado.st_mtime_ns,
+        'sha256': sha256,
+        **extra,
+    })
+
+
+def cache_valida(caminho_do_ficheiro):
+    """
+    Verifica se a cache Parquet corresponde ao ficheiro original.
+    """
+    caminho_cache, caminho_meta = _caminhos_cache(caminho_do_ficheiro)
+    return sidecar_valido(caminho_do_ficheiro, caminho_cache, caminho_meta)
+
+
+def _gravar_cache(caminho_do_ficheiro, df, estado, sha256):
+    """
+    Grava 'df' na cache Parquet (temporário + os.replace) e os metadados.
+    Se falhar, o temporário é apagado e o erro (ERROS_CONVERSAO) sobe.
+    """
+    caminho_cache, caminho_meta = _caminhos_cache(caminho_do_ficheiro)
+    temporario = f"{caminho_cache}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(temporario, engine='pyarrow', index=False, row_group_size=LINHAS_POR_GRUPO_CACHE)
+        os.replace(temporario, caminho_cache)
+    except ERROS_CONVERSAO:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    gravar_meta_sidecar(caminho_do_ficheiro, caminho_meta, estado, sha256)
+
+
+def converter_para_parquet(caminho_do_ficheiro):
+    """
+    Converte o ficheiro original (.xlsx/.csv) para a cache Parquet.
+
+    A cache guarda TODAS as colunas (a projeção é feita na leitura) e
+    é escrita primeiro num ficheiro temporário e depois trocada com
+    os.replace, para que outro processo nunca leia uma cache a meio.
+    Devolve o DataFrame completo que foi lido.
+    """
+    estado = os.stat(caminho_do_ficheiro)
+    sha256 = hash_ficheiro(caminho_do_ficheiro)
+
+    df = _ler_ficheiro_original(caminho_do_ficheiro)
+    _gravar_cache(caminho_do_ficheiro, df, estado, sha256)
+    return df
+
+
+def caminho_parquet(caminho_do_ficheiro):
+    """
+    Ficheiro Parquet com os dados de 'caminho_do_ficheiro': o próprio
+    .parquet ou a cache do .xlsx/.csv (convertida agora se for preciso).
+    Para quem lê o Parquet diretamente (em blocos ou com outro motor).
+
+    :return: Caminho do Parquet, ou None se a cache não puder ser gravada
+             (quem chama lê então o ficheiro com carregar_dados_com_cache).
+    """
+    if caminho_do_ficheiro.endswith('.parquet'):
+        return caminho_do_ficheiro
+    if not cache_valida(caminho_do_ficheiro):
+        print(f"A converter '{caminho_do_ficheiro}' para a cache Parquet (só acontece uma vez)...")
+        try:
+            converter_para_parquet(caminho_do_ficheiro)
+        except ERROS_CONVERSAO as e:
+            print(f"Aviso: não foi possível gravar a cache Parquet ({e}).")
+            return None
+    caminho_cache, _ = _caminhos_cache(caminho_do_ficheiro)
+    return caminho_cache
+
+
+# -------------------------------------------------------------------
+# FUNÇÃO PRINCIPAL: CARREGAR COM CACHE
+# -------------------------------------------------------------------
+def carregar_dados_com_cache(caminho_do_ficheiro, colunas=COLUNAS_ANALISE, filtros=None):
+    """
+    Carrega o ficheiro de partidas usando uma cache Parquet ao lado dele.
+
+    Na primeira leitura (ou quando o ficheiro muda) o .xlsx/.csv é
+    convertido; nas seguintes só lemos as 'colunas' pedidas do Parquet.
+    Sem pyarrow, ou se a cache não puder ser gravada, lemos o original.
+
+    :param caminho_do_ficheiro: Caminho para o .xlsx, .csv ou .parquet.
+    :param colunas: Colunas a carregar (None = todas).
+    :param filtros: {coluna: valor} das linhas a carregar (None = todas),
+                    ex: {'game_mode': 'CLASSIC'}.
+    """
+    if pq is None:
+        print("Aviso: pyarrow não está instalado, a cache Parquet está desativada.")
+        return _filtrar(_ler_ficheiro_original(caminho_do_ficheiro, colunas), filtros)
+
+    if caminho_do_ficheiro.endswith('.parquet'):
+        return ler_parquet(caminho_do_ficheiro, colunas, filtros)
+
+    if cache_valida(caminho_do_ficheiro):
+        contar('cache_parquet', 'acerto')
+        caminho_cache, _ = _caminhos_cache(caminho_do_ficheiro)
+        return ler_parquet(caminho_cache, colunas, filtros)
+
+    contar('cache_parquet', 'falha')
+
+    print(f"A converter '{caminho_do_ficheiro}' para a cache Parquet (só acontece uma vez)...")
+    estado = os.stat(caminho_do_ficheiro)
+    sha256 = hash_ficheiro(caminho_do_ficheiro)
+    df = _ler_ficheiro_original(caminho_do_ficheiro)
+    try:
+        _gravar_cache(caminho_do_ficheiro, df, estado, sha256)
+    except ERROS_CONVERSAO as e:
+        # Os dados já foram lidos: usamo-los sem cache (igual a antes da cache)
+        print(f"Aviso: não foi possível gravar a cache Parquet ({e}). A usar o ficheiro original.")
+
+    df = _filtrar(df, filtros)
+    if colunas is not None:
+        df = df[[c for c in colunas if c in df.columns]]
+    return df
@@ -0,0 +1,325 @@
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import gravar_json_atomico
+from .instrumentacao import contar
+from .resultados import chave_resultado, gravar_resultado, ler_resultado
+
+# -------------------------------------------------------------------
+# CATÁLOGO DE ITENS DO DATA DRAGON (com cache em disco)
+# -------------------------------------------------------------------
+
+# Pode ser trocado (ex: por um servidor local de testes) com a variável
+# de ambiente LOL_DDRAGON_URL
+URL_BASE_DDRAGON = os.environ.get('LOL_DDRAGON_URL', 'https://ddragon.leagueoflegends.com')
+
+# Onde os catálogos descarregados ficam guardados (um por versão)
+PASTA_CATALOGO = os.environ.get(
+    'LOL_CATALOGO_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'analise_lol', 'ddragon'),
+)
+
+# Snapshot opcional distribuído com o projeto (só de leitura).
+# Basta copiar para aqui uma pasta de PASTA_CATALOGO para o dashboard
+# arrancar sem rede numa máquina nova.
+PASTA_CATALOGO_INCLUIDO = os.path.join(os.path.dirname(__file__), 'catalogo_incluido')
+
+IDIOMA = 'en_US'
+
+# A lista de versões muda a cada patch; revalidamos depois deste tempo
+TTL_VERSOES_SEGUNDOS = 6 * 60 * 60
+
+# (ligação, leitura) em segundos
+TIMEOUT = (3.05, 10)
+
+_sessao = None
+
+
+def obter_sessao():
+    """
+    Sessão HTTP partilhada (reutiliza as ligações ao ddragon).
+    """
+    global _sessao
+    if _sessao is None:
+        _sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=2)
+        _sessao.mount('https://', adaptador)
+        _sessao.mount('http://', adaptador)
+    return _sessao
+
+
+def _ler_json(caminho):
+    try:
+        with open(caminho, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _chave_versao(versao):
+    """
+    '14.10.1' -> (14, 10, 1), para ordenar versões numericamente.
+    Versões antigas com outro formato (ex: 'lolpatch_3.7') ficam no fim.
+    """
+    try:
+        return tuple(int(parte) for parte in versao.split('.'))
+    except ValueError:
+        return ()
+
+
+def versoes_locais(pasta=PASTA_CATALOGO):
+    """
+    Versões cujo catálogo de itens já existe em disco (pasta de cache
+    e snapshot incluído), da mais recente para a mais antiga.
+    """
+    versoes = set()
+    for base in (pasta, PASTA_CATALOGO_INCLUIDO):
+        if os.path.isdir(base):
+            for nome in os.listdir(base):
+                if os.path.exists(os.path.join(base, nome, f'item_{IDIOMA}.json')):
+                    versoes.add(nome)
+    return sorted(versoes, key=_chave_versao, reverse=True)
+
+
+# -------------------------------------------------------------------
+# LISTA DE VERSÕES (versions.json, com TTL + ETag/If-Modified-Since)
+# -------------------------------------------------------------------
+def obter_versoes(pasta=PASTA_CATALOGO, url_base=URL_BASE_DDRAGON):
+    """
+    Devolve a lista de versões do Data Dragon (a mais recente primeiro).
+
+    Dentro do TTL usa a cópia em disco sem ir à rede. Depois do TTL faz
+    um pedido condicional (ETag / If-Modified-Since): um 304 só renova
+    a data da cópia. Sem rede, devolve a cópia antiga ou, em último
+    caso, as versões que já existem em disco.
+    """
+    caminho = os.path.join(pasta, 'versions.json')
+    guardado = _ler_json(caminho)
+
+    if guardado and time.time() - guardado.get('obtido_em', 0) < TTL_VERSOES_SEGUNDOS:
+        contar('catalogo_versoes', 'acerto')
+        return guardado['versoes']
+
+    cabecalhos = {}
+    if guardado:
+        if guardado.get('etag'):
+            cabecalhos['If-None-Match'] = guardado['etag']
+        if guardado.get('last_modified'):
+            cabecalhos['If-Modified-Since'] = guardado['last_modified']
+
+    try:
+        resposta = obter_sessao().get(f"{url_base}/api/versions.json", headers=cabecalhos, timeout=TIMEOUT)
+        if resposta.status_code == 304 and guardado:
+            contar('catalogo_versoes', 'revalidado')
+            guardado['obtido_em'] = time.time()
+        else:
+            resposta.raise_for_status()
+            contar('catalogo_versoes', 'falha')
+            guardado = {
+                'versoes': resposta.json(),
+                'etag': resposta.headers.get('ETag'),
+                'last_modified': resposta.headers.get('Last-Modified'),
+                'obtido_em': time.time(),
+            }
+        try:
+            os.makedirs(pasta, exist_ok=True)
+            gravar_json_atomico(caminho, guardado)
+        except OSError as e:
+            print(f"Aviso: não foi possível gravar a lista de versões ({e}).")
+        return guardado['versoes']
+
+    except (requests.RequestException, ValueError) as e:
+        if guardado:
+            print(f"Aviso: Data Dragon indisponível ({e}). A usar a lista de versões em disco.")
+            return guardado['versoes']
+        locais = versoes_locais(pasta)
+        if locais:
+            print(f"Aviso: Data Dragon indisponível ({e}). A usar os catálogos em disco.")
+            return locais
+        raise
+
+
+# -------------------------------------------------------------------
+# CATÁLOGO DE UMA VERSÃO (item.json, imutável por versão)
+# -------------------------------------------------------------------
+def _caminho_catalogo(pasta, versao):
+    return os.path.join(pasta, versao, f'item_{IDIOMA}.json')
+
+
+def _descarregar_catalogo(versao, url_base):
+    url = f"{url_base}/cdn/{versao}/data/{IDIOMA}/item.json"
+    resposta = obter_sessao().get(url, timeout=TIMEOUT)
+    resposta.raise_for_status()
+    itens_data_dragon = resposta.json()['data']
+    return {id_item_str: info_item['name'] for id_item_str, info_item in itens_data_dragon.items()}
+
+
+def carregar_catalogo_itens(versao=None, pasta=PASTA_CATALOGO, url_base=URL_BASE_DDRAGON):
+    """
+    Devolve o dicionário {id_item (int): nome} de uma versão do jogo
+    e a versão usada.
+
+    O item.json de uma versão nunca muda, por isso depois de descarregado
+    fica em disco para sempre. Sem 'versao', usa a mais recente.
+    Se a versão pedida não estiver disponível (sem rede e sem cópia),
+    usa o catálogo local mais recente.
+
+    :return: (mapeamento_itens, versao)
+    """
+    if versao is None:
+        versao = obter_versoes(pasta, url_base)[0]
+
+    nomes = None
+    for base in (pasta, PASTA_CATALOGO_INCLUIDO):
+        nomes = _ler_json(_caminho_catalogo(base, versao))
+        if nomes is not None:
+            break
+
+    contar('catalogo_itens', 'falha' if nomes is None else 'acerto')
+    if nomes is None:
+        try:
+            nomes = _descarregar_catalogo(versao, url_base)
+        except (requests.RequestException, ValueError, KeyError) as e:
+            locais = [v for v in versoes_locais(pasta) if v != versao]
+            if not locais:
+                raise
+            print(f"Aviso: não foi possível descarregar os itens da versão {versao} ({e}). "
+                  f"A usar a versão {locais[0]} guardada em disco.")
+            return carregar_catalogo_itens(locais[0], pasta, url_base)
+        try:
+            os.makedirs(os.path.join(pasta, versao), exist_ok=True)
+            gravar_json_atomico(_caminho_catalogo(pasta, versao), nomes)
+        except OSError as e:
+            print(f"Aviso: não foi possível gravar o catálogo de itens ({e}).")
+
+    mapeamento_itens = {int(id_item_str): nome for id_item_str, nome in nomes.items()}
+    return mapeamento_itens, versao
+
+
+# -------------------------------------------------------------------
+# NOMES POR PATCH (um catálogo por cada patch presente nos dados)
+# -------------------------------------------------------------------
+
+# Tabela compacta (patch, id_item) -> nome:
+#   patches: patches ordenados ('14.1', '14.2', ...)
+#   chaves:  int64 ordenados = posição do patch * BASE_CHAVE + id_item
+#   codigos: para cada chave, a posição do nome em 'nomes'
+#   nomes:   nomes únicos (um nome repetido em vários patches só existe uma vez)
+TabelaNomesItens = namedtuple('TabelaNomesItens', ['patches', 'chaves', 'codigos', 'nomes', 'versoes'])
+
+BASE_CHAVE = 1 << 32
+
+MAX_DESCARGAS_PARALELAS = 8
+
+
+def versao_ddragon_do_patch(patch, versoes):
+    """
+    Escolhe a versão do Data Dragon de um patch ('14.1' -> '14.1.1').
+    Se o patch não existir na lista (ou for desconhecido: ''), usa a
+    versão mais recente.
+    """
+    if patch:
+        prefixo = patch + '.'
+        for versao in versoes:
+            if versao.startswith(prefixo):
+                return versao
+    return versoes[0]
+
+
+def carregar_catalogos(patches, pasta=PASTA_CATALOGO, url_base=URL_BASE_DDRAGON):
+    """
+    Carrega em paralelo (threads) o catálogo de cada patch.
+    Patches que partilham a mesma versão só são carregados uma vez.
+
+    :return: {patch: (mapeamento_itens, versao)}
+    """
+    versoes = obter_versoes(pasta, url_base)
+    versao_de = {patch: versao_ddragon_do_patch(patch, versoes) for patch in patches}
+
+    with ThreadPoolExecutor(max_workers=MAX_DESCARGAS_PARALELAS) as executor:
+        futuros = {versao: executor.submit(carregar_catalogo_itens, versao, pasta, url_base)
+                   for versao in set(versao_de.values())}
+        catalogos = {versao: futuro.result() for versao, futuro in futuros.items()}
+
+    return {patch: catalogos[versao] for patch, versao in versao_de.items()}
+
+
+def construir_tabela_nomes(patches, pasta=PASTA_CATALOGO, url_base=URL_BASE_DDRAGON):
+    """
+    Constrói a TabelaNomesItens para os patches dados.
+
+    O item.json de cada versão nunca muda, por isso a tabela fica na
+    cache de resultados (nucleo_lol.resultados) com a chave das versões
+    escolhidas: outro processo, ou o mesmo depois de reiniciar, não
+    volta a ler e juntar os catálogos.
+    """
+    versoes = obter_versoes(pasta, url_base)
+    versao_de = sorted((patch, versao_ddragon_do_patch(patch, versoes)) for patch in patches)
+    chave = chave_resultado('tabela_nomes_itens', url_base, IDIOMA, versao_de)
+    encontrado, tabela = ler_resultado(chave, contador='tabela_nomes_itens')
+    if encontrado:
+        return tabela
+
+    tabela = _tabela_dos_catalogos(carregar_catalogos(patches, pasta, url_base))
+    # Se alguma versão não pôde ser descarregada foi usada outra: não guardamos
+    if all(tabela.versoes.get(patch) == versao for patch, versao in versao_de):
+        gravar_resultado(chave, tabela)
+    return tabela
+
+
+def _tabela_dos_catalogos(catalogos):
+    patches_ordenados = np.array(sorted(catalogos), dtype=object)
+
+    nomes_unicos = {}
+    chaves, codigos = [], []
+    for posicao, patch in enumerate(patches_ordenados):
+        mapeamento_itens, _ = catalogos[patch]
+        ids = np.fromiter(mapeamento_itens.keys(), dtype=np.int64, count=len(mapeamento_itens))
+        chaves.append(posicao * BASE_CHAVE + ids)
+        codigos.append(np.fromiter((nomes_unicos.setdefault(nome, len(nomes_unicos))
+                                    for nome in mapeamento_itens.values()),
+                                   dtype=np.int32, count=len(mapeamento_itens)))
+
+    chaves = np.concatenate(chaves) if chaves else np.empty(0, dtype=np.int64)
+    codigos = np.concatenate(codigos) if codigos else np.empty(0, dtype=np.int32)
+    ordem = np.argsort(chaves, kind='stable')
+    return TabelaNomesItens(
+        patches=patches_ordenados,
+        chaves=chaves[ordem],
+        codigos=codigos[ordem],
+        nomes=np.array(list(nomes_unicos), dtype=object),
+        versoes={patch: catalogos[patch][1] for patch in patches_ordenados},
+    )
+
+
+def resolver_nomes_itens(tabela, patches, ids_itens):
+    """
+    Traduz pares (patch, id_item) para nomes de forma vetorizada
+    (duas pesquisas binárias, sem dicionários por linha).
+    IDs que não existem no catálogo do seu patch ficam como texto ('1234').
+    """
+    patches = np.asarray(patches, dtype=object)
+    ids_itens = np.asarray(ids_itens, dtype=np.int64)
+    if len(ids_itens) == 0:
+        return np.empty(0, dtype=object)
+
+    posicao_patch = np.searchsorted(tabela.patches, patches)
+    patch_existe = (posicao_patch < len(tabela.patches))
+    patch_existe[patch_existe] = tabela.patches[posicao_patch[patch_existe]] == patches[patch_existe]
+
+    chaves = posicao_patch * BASE_CHAVE + ids_itens
+    posicao = np.searchsorted(tabela.chaves, chaves)
+    posicao = np.minimum(posicao, max(len(tabela.chaves) - 1, 0))
+    encontrado = patch_existe & (len(tabela.chaves) > 0)
+    encontrado[encontrado] = tabela.chaves[posicao[encontrado]] == chaves[encontrado]
+
+    nomes = ids_itens.astype(str).astype(object)
+    nomes[encontrado] = tabela.nomes[tabela.codigos[posicao[encontrado]]]
+    return nomes
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+from .cache import COLUNA_PARTIDA
+from .estatistica import intervalo_wilson
+
+# -------------------------------------------------------------------
+# CONFRONTOS E SINERGIAS (pares de campeões na mesma partida)
+# -------------------------------------------------------------------
+
+# Os dados têm uma linha por jogador e não dizem a equipa; numa partida
+# uma equipa ganha e a outra perde, por isso a equipa é o próprio 'win'.
+#   'contra': adversário na mesma posição (mesma partida, 'win' diferente)
+#   'com':    parceiro de dupla (mesma partida, mesmo 'win', posições de DUPLA)
+# Cada par é guardado nos dois sentidos: (A, B) e (B, A).
+CHAVES_CONFRONTOS = ['game_mode', 'relacao', 'individual_position', 'champion_name', 'outro_campeao']
+
+# Posições que formam dupla (bot lane: atirador + suporte)
+DUPLA = ('BOTTOM', 'UTILITY')
+
+# Posições que não são rotas (ARAM, dados incompletos)
+POSICOES_SEM_ROTA = ('Invalid', 'NONE', '')
+
+# Colunas de que construir_confrontos precisa (lidas só para os confrontos)
+COLUNAS_CONFRONTOS = [COLUNA_PARTIDA, 'game_mode', 'individual_position', 'champion_name', 'win']
+
+
+def _codigos(coluna):
+    if isinstance(coluna.dtype, pd.CategoricalDtype):
+        return coluna.cat.codes.to_numpy().astype(np.int64), coluna.cat.categories
+    codigos, valores = pd.factorize(coluna)
+    return codigos.astype(np.int64), valores
+
+
+def _pares(grupo, ordem_no_grupo):
+    """
+    Linhas dos grupos com exatamente 2 linhas: (primeira, segunda), com
+    a primeira a de menor 'ordem_no_grupo'. Um só lexsort, sem merges.
+    """
+    ordem = np.lexsort((ordem_no_grupo, grupo))
+    grupos = grupo[ordem]
+    inicios = np.flatnonzero(np.r_[True, grupos[1:] != grupos[:-1]])
+    tamanhos = np.diff(np.r_[inicios, len(grupos)])
+    dois = inicios[tamanhos == 2]
+    return ordem[dois], ordem[dois + 1]
+
+
+def _registos(df, a, b, relacao):
+    """
+    Um registo por campeão de cada par (A contra/com B e B contra/com A).
+    """
+    colunas = ['game_mode', 'individual_position', 'champion_name', 'win']
+    lado_a = df[colunas].take(a).reset_index(drop=True)
+    lado_b = df[colunas].take(b).reset_index(drop=True)
+    registos = []
+    for campeao, outro in ((lado_a, lado_b), (lado_b, lado_a)):
+        registos.append(campeao.assign(relacao=relacao, outro_campeao=outro['champion_name']))
+    return registos
+
+
+def construir_confrontos(df):
+    """
+    Agrega, numa só passagem agrupada por partida, quantos jogos e
+    vitórias teve cada campeão contra cada adversário de rota e com cada
+    parceiro de dupla. Só são usados índices das linhas (sem self-joins),
+    por isso a memória extra é proporcional ao nº de linhas e não ao nº
+    de pares possíveis.
+
+    Partidas cortadas a meio (o resto noutro ficheiro/bloco) contam só
+    os pares que estiverem completos.
+    """
+    vazio = pd.DataFrame({'jogos': pd.Series(dtype='int64'), 'vitorias': pd.Series(dtype='int64')},
+                         index=pd.MultiIndex.from_arrays([[]] * len(CHAVES_CONFRONTOS), names=CHAVES_CONFRONTOS))
+    if df.empty or COLUNA_PARTIDA not in df.columns:
+        return vazio
+
+    partida, _ = _codigos(df[COLUNA_PARTIDA])
+    posicao, posicoes = _codigos(df['individual_position'])
+    vitoria = df['win'].to_numpy().astype(np.int64)
+    validas = (partida >= 0) & (posicao >= 0) & ~np.isin(posicao, posicoes.get_indexer(POSICOES_SEM_ROTA))
+
+    registos = []
+
+    # Adversários de rota: grupos (partida, posição) com um vencido e um vencedor
+    linhas = np.flatnonzero(validas)
+    a, b = _pares(partida[linhas] * len(posicoes) + posicao[linhas], vitoria[linhas])
+    a, b = linhas[a], linhas[b]
+    diferentes = vitoria[a] != vitoria[b]
+    registos += _registos(df, a[diferentes], b[diferentes], 'contra')
+
+    # Duplas: grupos (partida, equipa) com uma linha de cada posição da DUPLA
+    codigos_dupla = posicoes.get_indexer(DUPLA)
+    linhas = np.flatnonzero(validas & np.isin(posicao, codigos_dupla))
+    a, b = _pares(partida[linhas] * 2 + vitoria[linhas], posicao[linhas])
+    a, b = linhas[a], linhas[b]
+    diferentes = posicao[a] != posicao[b]
+    registos += _registos(df, a[diferentes], b[diferentes], 'com')
+
+    juntos = pd.concat(registos, ignore_index=True)
+    if juntos.empty:
+        return vazio
+    juntos['relacao'] = juntos['relacao'].astype('category')
+    agrupado = juntos.groupby(CHAVES_CONFRONTOS, observed=True)['win']
+    return pd.DataFrame({'jogos': agrupado.size(), 'vitorias': agrupado.sum()}).astype('int64')
+
+
+def separar_ultima_partida(df):
+    """
+    Separa as linhas da última partida (que pode continuar no bloco
+    seguinte) das restantes: (partidas completas, última partida).
+    """
+    if df.empty or COLUNA_PARTIDA not in df.columns:
+        return df, df.iloc[0:0]
+    ultima = (df[COLUNA_PARTIDA] == df[COLUNA_PARTIDA].iloc[-1]).to_numpy()
+    return df[~ultima], df[ultima]
+
+
+def combinar_confrontos(confrontos):
+    """
+    Junta vários agregados de confrontos somando os mesmos pares.
+    """
+    confrontos = [c for c in confrontos if c is not None and not c.empty]
+    if not confrontos:
+        return None
+    if len(confrontos) == 1:
+        return confrontos[0]
+    juntos = pd.concat([c.reset_index() for c in confrontos], ignore_index=True)
+    for chave in CHAVES_CONFRONTOS:
+        juntos[chave] = juntos[chave].astype(str).astype('category')
+    return juntos.groupby(CHAVES_CONFRONTOS, observed=True)[['jogos', 'vitorias']].sum().astype('int64')
+
+
+# -------------------------------------------------------------------
+# CONSULTAS
+# -------------------------------------------------------------------
+def fatia_confrontos(confrontos, relacao, nome_do_campeao, modo=None, posicao=None, min_jogos=1):
+    """
+    Confrontos ('contra') ou sinergias ('com') de um campeão: uma linha
+    por outro campeão com os jogos, a taxa de vitória do campeão escolhido
+    e o intervalo de Wilson (95%).
+
+    Os 'contra' vêm ordenados do pior para o melhor confronto (pelo limite
+    superior: os counters mais certos primeiro); os 'com' do melhor para o
+    pior parceiro (pelo limite inferior).
+    """
+    if confrontos is None or confrontos.empty:
+        return None
+    indice = confrontos.index
+    mascara = (indice.get_level_values('relacao') == relacao) & \
+              (indice.get_level_values('champion_name') == nome_do_campeao)
+    if modo is not None:
+        mascara &= indice.get_level_values('game_mode') == modo
+    if posicao is not None:
+        mascara &= indice.get_level_values('individual_position') == posicao
+    fatia = confrontos[mascara].groupby(level='outro_campeao', observed=True).sum()
+    fatia = fatia[fatia['jogos'] >= min_jogos]
+    if fatia.empty:
+        return None
+
+    inferior, superior = intervalo_wilson(fatia['vitorias'], fatia['jogos'])
+    tabela = pd.DataFrame({
+        'jogos': fatia['jogos'],
+        'win': fatia['vitorias'] / fatia['jogos'] * 100,
+        'win_inferior': inferior * 100,
+        'win_superior': superior * 100,
+    }, index=fatia.index).round(2)
+    if relacao == 'contra':
+        return tabela.sort_values(by=['win_superior', 'jogos'], ascending=[True, False])
+    return tabela.sort_values(by=['win_inferior', 'jogos'], ascending=[False, False])
@@ -0,0 +1,109 @@
+import pandas as pd
+
+from .metricas import agregar_somas
+
+# -------------------------------------------------------------------
+# CUBO DE AGREGADOS (game_mode x individual_position x champion_name)
+# -------------------------------------------------------------------
+
+CHAVES_CUBO = ['game_mode', 'individual_position', 'champion_name']
+
+# Estatísticas suficientes guardadas em cada célula do cubo: as somas das
+# métricas incluídas em nucleo_lol.metricas. Com elas calculamos taxa de
+# vitória, KDA médio, ouro médio e ouro em vitórias/derrotas sem voltar às
+# linhas originais. Métricas registadas depois só podem usar estas somas
+# quando calculadas a partir do cubo.
+COLUNAS_CUBO = ['jogos', 'vitorias', 'kills', 'deaths', 'assists', 'ouro', 'ouro_vitorias']
+
+
+def construir_cubo(df):
+    """
+    Agrega o DataFrame numa única passagem (um só groupby) por
+    modo de jogo, posição e campeão, com as somas de COLUNAS_CUBO.
+    """
+    return agregar_somas(df, CHAVES_CUBO, COLUNAS_CUBO)
+
+
+def combinar_cubos(cubos):
+    """
+    Junta vários cubos (ex: de ficheiros ou blocos diferentes) somando
+    as células com as mesmas chaves.
+    """
+    cubos = [c for c in cubos if c is not None and not c.empty]
+    if not cubos:
+        return None
+    if len(cubos) == 1:
+        return cubos[0]
+    juntos = pd.concat([c.reset_index() for c in cubos], ignore_index=True)
+    for chave in CHAVES_CUBO:
+        juntos[chave] = juntos[chave].astype(str).astype('category')
+    return juntos.groupby(CHAVES_CUBO, observed=True)[COLUNAS_CUBO].sum().astype('int64')
+
+
+# -------------------------------------------------------------------
+# CONSULTAS (O(nº de campeões); as métricas vêm de metricas.metricas_da_tabela)
+# -------------------------------------------------------------------
+def fatia_cubo(cubo, modo=None, posicao=None):
+    """
+    Seleciona um modo e/ou posição e devolve uma linha por campeão
+    com as somas de todas as células escolhidas.
+    """
+    mascara = pd.Series(True, index=cubo.index)
+    if modo is not None:
+        mascara &= cubo.index.get_level_values('game_mode') == modo
+    if posicao is not None:
+        mascara &= cubo.index.get_level_values('individual_position') == posicao
+    return cubo[mascara.to_numpy()].groupby(level='champion_name', observed=True).sum()
+
+
+# -------------------------------------------------------------------
+# HISTOGRAMA DE KDA (para os intervalos de confiança por bootstrap)
+# -------------------------------------------------------------------
+
+# O KDA de um campeão é (média de kills + média de assists) / média de
+# deaths, por isso cada partida só conta pelo par (kills + assists,
+# deaths). Guardamos quantas partidas houve de cada par em cada célula
+# do cubo: são poucos pares distintos, mesmo com milhões de partidas.
+CHAVES_HISTOGRAMA_KDA = [*CHAVES_CUBO, 'kills_assists', 'deaths']
+
+
+def construir_histograma_kda(df, chaves=CHAVES_CUBO):
+    """
+    Conta as partidas de cada par (kills + assists, deaths) por 'chaves'.
+    """
+    chaves = list(chaves)
+    auxiliar = df[chaves].assign(
+        kills_assists=df['kills'].astype('int64') + df['assists'].astype('int64'),
+        deaths=df['deaths'].astype('int64'),
+    )
+    contagens = auxiliar.groupby([*chaves, 'kills_assists', 'deaths'], observed=True).size()
+    return contagens.astype('int64').to_frame('jogos')
+
+
+def combinar_histogramas_kda(histogramas):
+    """
+    Junta vários histogramas somando as contagens dos mesmos pares.
+    """
+    histogramas = [h for h in histogramas if h is not None and not h.empty]
+    if not histogramas:
+        return None
+    if len(histogramas) == 1:
+        return histogramas[0]
+    juntos = pd.concat([h.reset_index() for h in histogramas], ignore_index=True)
+    for chave in CHAVES_CUBO:
+        juntos[chave] = juntos[chave].astype(str).astype('category')
+    return juntos.groupby(CHAVES_HISTOGRAMA_KDA, observed=True)[['jogos']].sum().astype('int64')
+
+
+def fatia_histograma_kda(histograma, modo=None, posicao=None):
+    """
+    Seleciona um modo e/ou posição e devolve o histograma por campeão
+    (índice: champion_name, kills_assists, deaths).
+    """
+    mascara = pd.Series(True, index=histograma.index)
+    if modo is not None:
+        mascara &= histograma.index.get_level_values('game_mode') == modo
+    if posicao is not None:
+        mascara &= histograma.index.get_level_values('individual_position') == posicao
+    niveis = ['champion_name', 'kills_assists', 'deaths']
+    return histograma[mascara.to_numpy()].groupby(level=niveis, observed=True).sum()
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+from .cache import COLUNAS_ITENS
+
+# -------------------------------------------------------------------
+# ESQUEMA COMPACTO DOS DADOS
+# -------------------------------------------------------------------
+
+# Texto com poucos valores distintos -> 'category'
+COLUNAS_CATEGORICAS = ['champion_name', 'game_mode', 'individual_position', 'game_version', 'match_id']
+
+# Inteiros não negativos -> o menor uint que cabe (uint8/uint16/uint32)
+COLUNAS_INTEIRAS = ['kills', 'deaths', 'assists', 'gold_earned', *COLUNAS_ITENS]
+
+COLUNA_VITORIA = 'win'
+
+# Versão do jogo de cada partida (ex: '14.1.556.3445')
+COLUNA_VERSAO = 'game_version'
+
+# Só convertemos para 'category' se houver muito menos valores do que linhas
+RACIO_MAXIMO_CATEGORIAS = 0.5
+
+_TEXTO_PARA_BOOL = {'true': True, 'false': False, '1': True, '0': False}
+
+# Linhas descartadas por não terem resultado (fica em df.attrs)
+ATRIBUTO_SEM_VITORIA = 'linhas_sem_vitoria'
+
+
+def _memoria_mb(df):
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def _converter_vitoria(coluna):
+    if pd.api.types.is_bool_dtype(coluna):
+        return coluna.astype(bool)
+    if pd.api.types.is_numeric_dtype(coluna):
+        # As linhas sem resultado (NaN) já foram retiradas em aplicar_esquema
+        return coluna.astype(bool)
+    # Texto ("True"/"False"): só convertemos se todos os valores forem reconhecidos
+    convertida = coluna.astype(str).str.strip().str.lower().map(_TEXTO_PARA_BOOL)
+    if convertida.isna().any():
+        return coluna
+    return convertida.astype(bool)
+
+
+def _converter_inteiro(coluna):
+    if not pd.api.types.is_integer_dtype(coluna) or pd.api.types.is_bool_dtype(coluna):
+        return coluna
+    if len(coluna) == 0:
+        return coluna
+    if coluna.min() >= 0:
+        return pd.to_numeric(coluna, downcast='unsigned')
+    return pd.to_numeric(coluna, downcast='integer')
+
+
+def _converter_categoria(coluna):
+    if isinstance(coluna.dtype, pd.CategoricalDtype):
+        return coluna
+    if len(coluna) == 0 or coluna.nunique(dropna=False) > RACIO_MAXIMO_CATEGORIAS * len(coluna):
+        return coluna
+    return coluna.astype('category')
+
+
+# -------------------------------------------------------------------
+# FUNÇÃO PRINCIPAL: APLICAR ESQUEMA
+# -------------------------------------------------------------------
+def aplicar_esquema(df, mostrar_relatorio=True):
+    """
+    Converte o DataFrame carregado para tipos compactos:
+    texto -> 'category', K/D/A, ouro e itens -> uint, 'win' -> bool.
+
+    Colunas que não existem ou que não podem ser convertidas sem perda
+    (ex: itens com valores em falta) ficam como estão. Linhas com 'win'
+    numérico em falta são descartadas (não são vitórias nem derrotas);
+    o número fica em df.attrs['linhas_sem_vitoria'].
+
+    :param df: O DataFrame acabado de carregar.
+    :param mostrar_relatorio: Se True, imprime a memória antes/depois.
+    :return: Um novo DataFrame com os tipos compactos.
+    """
+    memoria_antes = _memoria_mb(df) if mostrar_relatorio else None
+    sem_vitoria = 0
+    if COLUNA_VITORIA in df.columns and pd.api.types.is_numeric_dtype(df[COLUNA_VITORIA]):
+        em_falta = df[COLUNA_VITORIA].isna()
+        sem_vitoria = int(em_falta.sum())
+        if sem_vitoria:
+            print(f"Aviso: {sem_vitoria} linhas sem valor em '{COLUNA_VITORIA}' foram descartadas.")
+            df = df[~em_falta.to_numpy()]
+    conversoes = {}
+
+    for nome in COLUNAS_CATEGORICAS:
+        if nome in df.columns:
+            conversoes[nome] = _converter_categoria(df[nome])
+    for nome in COLUNAS_INTEIRAS:
+        if nome in df.columns:
+            conversoes[nome] = _converter_inteiro(df[nome])
+    if COLUNA_VITORIA in df.columns:
+        conversoes[COLUNA_VITORIA] = _converter_vitoria(df[COLUNA_VITORIA])
+
+    df_compacto = df.assign(**conversoes)
+    df_compacto.attrs[ATRIBUTO_SEM_VITORIA] = sem_vitoria
+
+    if mostrar_relatorio:
+        memoria_depois = _memoria_mb(df_compacto)
+        reducao = (1 - memoria_depois / memoria_antes) * 100 if memoria_antes else 0.0
+        print(f"Memória dos dados: {memoria_antes:.1f} MB -> {memoria_depois:.1f} MB "
+              f"({reducao:.0f}% menos)")
+
+    return df_compacto
+
+
+def patch_da_versao(df):
+    """
+    Devolve o patch de cada linha ('14.1.556.3445' -> '14.1') como
+    'category'. A conversão é feita uma vez por versão distinta, não
+    por linha. Sem a coluna 'game_version' o patch fica '' (desconhecido).
+    """
+    if COLUNA_VERSAO not in df.columns:
+        return pd.Series(pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), [''], validate=False),
+                         index=df.index, name='patch')
+
+    versoes = df[COLUNA_VERSAO].astype('category')
+    patches = (versoes.cat.categories.astype(str)
+               .str.extract(r'^(\d+\.\d+)', expand=False).fillna(''))
+    unicos = sorted(set(patches) | {''})
+    codigo_do_patch = {patch: codigo for codigo, patch in enumerate(unicos)}
+
+    # Código da versão -> código do patch (a última posição é para versões em falta)
+    novo_codigo = np.array([codigo_do_patch[p] for p in patches] + [codigo_do_patch['']], dtype=np.int32)
+    codigos = versoes.cat.codes.to_numpy()
+    codigos = np.where(codigos < 0, len(patches), codigos)
+    return pd.Series(pd.Categorical.from_codes(novo_codigo[codigos], unicos, validate=False),
+                     index=df.index, name='patch')
+
+
+def relatorio_memoria(df):
+    """
+    Devolve a memória (em MB) e o tipo de cada coluna do DataFrame e,
+    em 'linhas_descartadas', as linhas retiradas por aplicar_esquema
+    por causa dessa coluna (hoje só 'win' em falta).
+    """
+    uso = df.memory_usage(deep=True, index=False) / (1024 * 1024)
+    descartadas = pd.Series(0, index=df.columns, dtype='int64')
+    if COLUNA_VITORIA in df.columns:
+        descartadas[COLUNA_VITORIA] = df.attrs.get(ATRIBUTO_SEM_VITORIA, 0)
+    return pd.DataFrame({'tipo': df.dtypes.astype(str), 'memoria_mb': uso.round(2),
+                         'linhas_descartadas': descartadas})
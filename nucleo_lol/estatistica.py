@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------------------------
+# SIGNIFICÂNCIA (intervalos de confiança e taxas ajustadas)
+# -------------------------------------------------------------------
+
+# Tudo é calculado para todos os campeões de uma vez (arrays NumPy),
+# a partir das contagens por campeão (cubo) e do histograma de KDA.
+Z_95 = 1.959963984540054
+
+N_AMOSTRAS_BOOTSTRAP = 1000
+
+# Gerar os pesos é o que custa (~40 ns cada). Nas posições com mais pares
+# distintos o nº de amostras baixa até caber em MAX_ELEMENTOS_BOOTSTRAP
+# (~1 s), mas nunca para menos de N_AMOSTRAS_MINIMO
+MAX_ELEMENTOS_BOOTSTRAP = 20_000_000
+N_AMOSTRAS_MINIMO = 200
+
+# Pesos gerados de cada vez (amostras x pares), para limitar a memória (~40 MB)
+ELEMENTOS_POR_LOTE = 5_000_000
+
+
+def intervalo_wilson(vitorias, jogos, z=Z_95):
+    """
+    Intervalo de Wilson da taxa de vitória de cada campeão. Ao contrário
+    do intervalo normal, continua certo com poucos jogos (1 jogo e 1
+    vitória dá [0.21, 1] e não [1, 1]).
+
+    :return: (limite inferior, limite superior), em proporção (0 a 1)
+    """
+    vitorias = np.asarray(vitorias, dtype=np.float64)
+    jogos = np.asarray(jogos, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = vitorias / jogos
+        z2 = z * z
+        denominador = 1 + z2 / jogos
+        centro = (p + z2 / (2 * jogos)) / denominador
+        margem = z * np.sqrt(p * (1 - p) / jogos + z2 / (4 * jogos ** 2)) / denominador
+    return centro - margem, centro + margem
+
+
+def taxa_bayes_empirico(vitorias, jogos):
+    """
+    Taxa de vitória de cada campeão puxada para a média de todos, tanto
+    mais quanto menos jogos tiver (Bayes empírico com uma Beta ajustada
+    pelos próprios dados, pelo método dos momentos).
+
+    :return: Taxas ajustadas, em proporção (0 a 1)
+    """
+    vitorias = np.asarray(vitorias, dtype=np.float64)
+    jogos = np.asarray(jogos, dtype=np.float64)
+    if not len(jogos) or jogos.sum() == 0:
+        return np.full(len(jogos), np.nan)
+    media = vitorias.sum() / jogos.sum()
+    if media in (0, 1):
+        return np.full(len(jogos), media)
+    # Variância real entre campeões = variância observada - ruído binomial
+    variancia = np.average((vitorias / jogos - media) ** 2, weights=jogos)
+    variancia_real = variancia - media * (1 - media) * len(jogos) / jogos.sum()
+    if variancia_real <= 0:
+        return np.full(len(jogos), media)
+    forca = max(media * (1 - media) / variancia_real - 1, 0)
+    return (vitorias + media * forca) / (jogos + forca)
+
+
+def bootstrap_kda(histograma, n_amostras=N_AMOSTRAS_BOOTSTRAP, nivel=0.95, semente=0):
+    """
+    Intervalo de confiança do KDA de cada campeão por bootstrap,
+    com todos os campeões e amostras em lote (sem ciclos por campeão).
+
+    Usa o bootstrap de Poisson sobre o histograma: cada par
+    (kills + assists, deaths) visto m vezes entra em cada amostra
+    Poisson(m) vezes. O custo depende do nº de pares distintos e não
+    do nº de partidas, por isso é rápido mesmo nas maiores posições.
+
+    :param histograma: Índice (champion_name, kills_assists, deaths) e
+                       coluna 'jogos' (ex: cubo.fatia_histograma_kda).
+    :return: DataFrame por campeão com 'kda_inferior' e 'kda_superior'
+    """
+    if histograma is None or histograma.empty:
+        return pd.DataFrame(columns=['kda_inferior', 'kda_superior'], dtype='float64')
+    histograma = histograma.sort_index(level='champion_name')
+    campeoes = histograma.index.get_level_values('champion_name')
+    codigos, nomes = pd.factorize(campeoes)
+    inicios = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]])
+    contagens = histograma['jogos'].to_numpy(dtype=np.float64)
+    kills_assists = histograma.index.get_level_values('kills_assists').to_numpy(dtype=np.float64)
+    deaths = histograma.index.get_level_values('deaths').to_numpy(dtype=np.float64)
+
+    n_amostras = max(min(n_amostras, MAX_ELEMENTOS_BOOTSTRAP // len(contagens)),
+                     min(n_amostras, N_AMOSTRAS_MINIMO))
+    gerador = np.random.default_rng(semente)
+    por_lote = max(ELEMENTOS_POR_LOTE // len(contagens), 1)
+    amostras = []
+    for inicio in range(0, n_amostras, por_lote):
+        pesos = gerador.poisson(contagens, size=(min(por_lote, n_amostras - inicio), len(contagens)))
+        soma_pesos = np.add.reduceat(pesos, inicios, axis=1).astype(np.float64)
+        soma_ka = np.add.reduceat(pesos * kills_assists, inicios, axis=1)
+        soma_deaths = np.add.reduceat(pesos * deaths, inicios, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Igual a analisar_kda_campeoes: média de deaths 0 conta como 1
+            media_deaths = np.where(soma_deaths > 0, soma_deaths / soma_pesos, 1)
+            amostras.append(soma_ka / soma_pesos / media_deaths)
+    amostras = np.concatenate(amostras)
+
+    alfa = (1 - nivel) / 2
+    with np.errstate(invalid='ignore'):
+        limites = np.nanquantile(amostras, [alfa, 1 - alfa], axis=0)
+    return pd.DataFrame({'kda_inferior': limites[0], 'kda_superior': limites[1]},
+                        index=pd.Index(nomes, name='champion_name')).round(2)
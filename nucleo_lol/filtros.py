@@ -0,0 +1,109 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .cubo import CHAVES_CUBO
+
+# -------------------------------------------------------------------
+# ÍNDICE DE FILTROS (posições das linhas por modo / posição / campeão)
+# -------------------------------------------------------------------
+
+# Para cada coluna e cada valor guardamos as posições (ordenadas) das
+# linhas com esse valor. Filtrar passa a ser intersetar estes arrays em
+# vez de comparar a coluna inteira e copiar as linhas escolhidas.
+#
+# posicoes: {coluna: {valor: array de posições (int32/int64)}}
+IndiceFiltros = namedtuple('IndiceFiltros', ['n_linhas', 'posicoes'])
+
+
+def construir_indice_filtros(df, colunas=CHAVES_CUBO):
+    """
+    Constrói o índice numa passagem por coluna: um argsort estável dos
+    códigos das categorias. Os arrays de cada valor são vistas sobre esse
+    único array ordenado (não há uma cópia por valor).
+    """
+    tipo = np.int32 if len(df) < np.iinfo(np.int32).max else np.int64
+    posicoes = {}
+    for coluna in colunas:
+        serie = df[coluna]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            codigos, valores = serie.cat.codes.to_numpy(), serie.cat.categories
+        else:
+            codigos, valores = pd.factorize(serie)
+        # Os valores em falta (código -1) ficam no grupo 0, que é ignorado
+        codigos = codigos.astype(np.int64) + 1
+        ordem = np.argsort(codigos, kind='stable').astype(tipo)
+        limites = np.cumsum(np.bincount(codigos, minlength=len(valores) + 1))
+        grupos = np.split(ordem, limites[:-1])[1:]
+        posicoes[coluna] = {valor: grupo for valor, grupo in zip(valores, grupos) if len(grupo)}
+    return IndiceFiltros(len(df), posicoes)
+
+
+def valores_filtro(indice, coluna):
+    """
+    Valores de uma coluna presentes nos dados, do mais para o menos frequente.
+    """
+    contagens = {valor: len(p) for valor, p in indice.posicoes[coluna].items()}
+    return sorted(contagens, key=contagens.get, reverse=True)
+
+
+# -------------------------------------------------------------------
+# SELEÇÃO
+# -------------------------------------------------------------------
+def _intersetar(a, b):
+    """
+    Interseção de dois arrays ordenados e sem repetidos: procura cada
+    posição do mais pequeno no maior (O(pequeno x log(grande))).
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    encontrados = np.searchsorted(b, a).clip(max=len(b) - 1)
+    return a[b[encontrados] == a]
+
+
+def _posicoes_valor(indice, coluna, condicao):
+    por_valor = indice.posicoes[coluna]
+    if isinstance(condicao, (list, tuple, set)):
+        grupos = [por_valor[v] for v in condicao if v in por_valor]
+        if not grupos:
+            return np.empty(0, dtype=np.int64)
+        return grupos[0] if len(grupos) == 1 else np.sort(np.concatenate(grupos))
+    return por_valor.get(condicao, np.empty(0, dtype=np.int64))
+
+
+def posicoes_filtro(indice, filtros):
+    """
+    Posições (ordenadas) das linhas que cumprem todos os filtros.
+
+    :param filtros: {coluna: valor} ou {coluna: [valores, ...]},
+                    ex: {'game_mode': 'CLASSIC', 'individual_position': 'BOTTOM'}.
+                    Vazio = todas as linhas.
+    """
+    if not filtros:
+        return np.arange(indice.n_linhas)
+    # Começa pelo filtro mais seletivo para as interseções serem pequenas
+    grupos = sorted((_posicoes_valor(indice, coluna, condicao) for coluna, condicao in filtros.items()), key=len)
+    resultado = grupos[0]
+    for grupo in grupos[1:]:
+        if not len(resultado):
+            break
+        resultado = _intersetar(resultado, grupo)
+    return resultado
+
+
+def filtrar_linhas(df, indice, filtros):
+    """
+    Linhas de 'df' que cumprem os filtros. Se forem um bloco contínuo
+    (dados ordenados por essas colunas) devolve uma fatia sem copiar os
+    dados; senão copia só as linhas escolhidas, uma vez.
+    """
+    posicoes = posicoes_filtro(indice, filtros)
+    if not len(posicoes):
+        return df.iloc[0:0]
+    inicio, fim = int(posicoes[0]), int(posicoes[-1]) + 1
+    if fim - inicio == len(posicoes):
+        return df.iloc[inicio:fim]
+    return df.take(posicoes)
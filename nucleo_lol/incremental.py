@@ -0,0 +1,458 @@
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Sem pyarrow os agregados são calculados sempre de raiz
+    pq = None
+
+from .builds import combinar_indices_builds, construir_indice_builds
+from .cache import (
+    COLUNA_PARTIDA,
+    COLUNAS_ANALISE,
+    caminho_parquet,
+    carregar_dados_com_cache,
+    gravar_json_atomico,
+)
+from .confrontos import (
+    COLUNAS_CONFRONTOS,
+    combinar_confrontos,
+    construir_confrontos,
+    separar_ultima_partida,
+)
+from .cubo import (
+    combinar_cubos,
+    combinar_histogramas_kda,
+    construir_cubo,
+    construir_histograma_kda,
+)
+from .esquema import aplicar_esquema
+from .instrumentacao import contar
+from .itens import combinar_indices_itens, construir_indice_itens
+
+# -------------------------------------------------------------------
+# AGREGADOS INCREMENTAIS (só as partidas novas são somadas)
+# -------------------------------------------------------------------
+
+# Ao lado do ficheiro de dados ficam:
+#   '<ficheiro>.agregados.json'                  -> manifesto (marca de água + geração atual)
+#   '<ficheiro>.agregados.<geração>-<pid>.cubo.parquet'
+#   '<ficheiro>.agregados.<geração>-<pid>.itens.parquet'
+#   '<ficheiro>.agregados.<geração>-<pid>.kda.parquet'
+#   '<ficheiro>.agregados.<geração>-<pid>.confrontos.parquet'
+#   '<ficheiro>.agregados.<geração>-<pid>.builds.parquet'
+# Uma atualização grava uma geração nova e só no fim troca o manifesto
+# (os.replace), por isso quem lê vê sempre todos os agregados da mesma
+# geração, mesmo a meio de uma atualização.
+SUFIXO_AGREGADOS = '.agregados'
+VERSAO_FORMATO_AGREGADOS = 7
+NOMES_AGREGADOS = ('cubo', 'itens', 'kda', 'confrontos', 'builds')
+
+# A última partida agregada pode continuar nas linhas acrescentadas
+# depois: as suas linhas (só as colunas dos confrontos) ficam na marca de
+# água e, na atualização seguinte, os pares que já contaram são retirados
+# e a partida volta a ser emparelhada com as linhas novas.
+#
+# O match_id (COLUNA_PARTIDA) da última linha agregada serve para
+# confirmar que as linhas antigas não mudaram (só foram acrescentadas
+# linhas no fim). Para o custo de uma atualização depender só das linhas
+# novas, as linhas antigas não voltam a ser lidas todas:
+# - CSV: comparamos o inode (um ficheiro reescrito é outro ficheiro) e o
+#   hash dos primeiros e dos últimos JANELA_IMPRESSAO bytes antes da marca.
+# - Parquet (e a cache Parquet do Excel): comparamos as estatísticas de
+#   cada row group (nº de linhas e, por coluna, bytes comprimidos, mín.,
+#   máx. e nulos), que estão no rodapé do ficheiro, e só o último row
+#   group agregado (que um escritor pode ter completado) é lido e
+#   comparado por hash.
+JANELA_IMPRESSAO = 1024 * 1024
+
+TAMANHO_BLOCO_CSV = 250_000
+
+# Leitura do fim do CSV (à procura da última linha completa)
+_TAMANHO_RECUO = 64 * 1024
+
+_GERACAO = re.compile(r'\.agregados\.(\d+)-\d+\.(cubo|itens|kda|confrontos|builds)\.parquet$')
+
+
+def _caminho_manifesto(caminho_do_ficheiro):
+    return f"{caminho_do_ficheiro}{SUFIXO_AGREGADOS}.json"
+
+
+def _ler_manifesto(caminho_do_ficheiro):
+    try:
+        with open(_caminho_manifesto(caminho_do_ficheiro), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _impressao_csv(caminho_do_ficheiro, fim):
+    """
+    SHA-256 de 'fim' e dos primeiros e últimos JANELA_IMPRESSAO bytes
+    de [0, fim): lê no máximo 2 * JANELA_IMPRESSAO bytes.
+    """
+    sha = hashlib.sha256(str(fim).encode())
+    with open(caminho_do_ficheiro, 'rb') as f:
+        inicio = f.read(min(JANELA_IMPRESSAO, fim))
+        sha.update(inicio)
+        cauda = max(fim - JANELA_IMPRESSAO, len(inicio))
+        f.seek(cauda)
+        sha.update(f.read(fim - cauda))
+    return sha.hexdigest()
+
+
+def _impressao_linhas(df):
+    """
+    Hash do conteúdo das linhas (não depende dos tipos usados na leitura,
+    ex: 'category' ou texto).
+    """
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def _assinatura_grupo(grupo, colunas):
+    """
+    Nº de linhas e, para cada uma das 'colunas', os bytes comprimidos e
+    as estatísticas (mín., máx., nulos) de um row group, lidos só dos
+    metadados do Parquet.
+    """
+    estatisticas = []
+    for i in range(grupo.num_columns):
+        coluna = grupo.column(i)
+        if coluna.path_in_schema not in colunas:
+            continue
+        valores = coluna.statistics
+        minimo_maximo = ([str(valores.min), str(valores.max), valores.null_count]
+                         if valores is not None and valores.has_min_max else [None, None, None])
+        estatisticas.append([coluna.path_in_schema, coluna.total_compressed_size, *minimo_maximo])
+    return hashlib.sha256(json.dumps([grupo.num_rows, estatisticas]).encode()).hexdigest()
+
+
+# -------------------------------------------------------------------
+# LEITURA DAS LINHAS NOVAS
+# -------------------------------------------------------------------
+class _LeitorLimitado(io.RawIOBase):
+    """
+    Lê no máximo 'restantes' bytes de um ficheiro já aberto (linhas
+    acrescentadas depois de escolhido o fim ficam para a próxima vez).
+    """
+
+    def __init__(self, ficheiro, restantes):
+        super().__init__()
+        self._ficheiro = ficheiro
+        self._restantes = restantes
+
+    def readable(self):
+        return True
+
+    def readinto(self, destino):
+        n = self._ficheiro.readinto(memoryview(destino)[:min(len(destino), self._restantes)])
+        self._restantes -= n
+        return n
+
+
+def _fim_ultima_linha(ficheiro, inicio):
+    """
+    Byte a seguir ao último '\n' depois de 'inicio' (lendo do fim para
+    trás), ou 'inicio' se não houver nenhuma linha completa.
+    """
+    posicao = ficheiro.seek(0, os.SEEK_END)
+    while posicao > inicio:
+        tamanho = min(_TAMANHO_RECUO, posicao - inicio)
+        ficheiro.seek(posicao - tamanho)
+        quebra = ficheiro.read(tamanho).rfind(b'\n')
+        if quebra >= 0:
+            return posicao - tamanho + quebra + 1
+        posicao -= tamanho
+    return inicio
+
+
+def _ler_csv_desde(caminho_do_ficheiro, desde_byte):
+    """
+    Lê as linhas completas do CSV a partir do byte 'desde_byte'
+    (0 = desde o início), em blocos de TAMANHO_BLOCO_CSV linhas lidos
+    diretamente do ficheiro. Uma última linha ainda a ser escrita
+    (sem '\n') fica para a próxima atualização.
+
+    :return: (blocos de linhas, byte onde a leitura para)
+    """
+    with open(caminho_do_ficheiro, 'rb') as f:
+        cabecalho = f.readline()
+        inicio = max(desde_byte, len(cabecalho))
+        fim = _fim_ultima_linha(f, inicio)
+    if fim == inicio:
+        return [], inicio
+
+    colunas = list(pd.read_csv(io.BytesIO(cabecalho), nrows=0).columns)
+    conjunto = set(COLUNAS_ANALISE)
+
+    def blocos():
+        with open(caminho_do_ficheiro, 'rb') as f:
+            f.seek(inicio)
+            leitor = io.BufferedReader(_LeitorLimitado(f, fim - inicio))
+            for bloco in pd.read_csv(leitor, header=None, names=colunas,
+                                     usecols=lambda coluna: coluna in conjunto, chunksize=TAMANHO_BLOCO_CSV):
+                contar('linhas_lidas', 'agregados', len(bloco))
+                yield bloco
+
+    return blocos(), fim
+
+
+def _ler_parquet_desde(caminho_parquet, marca):
+    """
+    Lê as linhas do Parquet depois da marca de água. Os row groups
+    anteriores ao último agregado são confirmados pelas estatísticas;
+    esse último é lido e comparado pelo hash e pelo match_id da última
+    linha agregada.
+
+    :return: (linhas novas, marca válida, marca nova sem o match_id)
+    """
+    ficheiro = pq.ParquetFile(caminho_parquet, memory_map=True)
+    existentes = set(ficheiro.schema_arrow.names)
+    colunas = [c for c in COLUNAS_ANALISE if c in existentes]
+    metadados = ficheiro.metadata
+    grupos = [metadados.row_group(i) for i in range(metadados.num_row_groups)]
+    assinaturas = [_assinatura_grupo(grupo, colunas) for grupo in grupos]
+    tamanhos = [grupo.num_rows for grupo in grupos]
+
+    linhas = marca.get('linhas', 0)
+    conhecidos = marca.get('grupos', [])
+    valida = bool(linhas) and assinaturas[:len(conhecidos)] == conhecidos and sum(tamanhos) >= linhas
+    primeiro = len(conhecidos) if valida else 0
+    inicio = sum(tamanhos[:primeiro])
+
+    if primeiro < len(grupos):
+        df = ficheiro.read_row_groups(range(primeiro, len(grupos)), columns=colunas).to_pandas()
+    else:
+        df = ficheiro.schema_arrow.empty_table().select(colunas).to_pandas()
+    contar('linhas_lidas', 'agregados', len(df))
+
+    if valida:
+        agregadas = df.iloc[:linhas - inicio]
+        valida = (
+            not agregadas.empty and _impressao_linhas(agregadas) == marca.get('impressao')
+            and COLUNA_PARTIDA in agregadas.columns
+            and str(agregadas[COLUNA_PARTIDA].iloc[-1]) == marca.get('ultima_partida')
+        )
+    if not valida:
+        if primeiro:
+            return _ler_parquet_desde(caminho_parquet, {})
+        linhas = 0
+
+    # Todos os row groups menos o último ficam confirmados pelas estatísticas
+    ultimo = max(len(grupos) - 1, 0)
+    nova = {'grupos': assinaturas[:ultimo],
+            'impressao': _impressao_linhas(df.iloc[sum(tamanhos[:ultimo]) - inicio:])}
+    return df.iloc[linhas - inicio:], valida, nova
+
+
+# -------------------------------------------------------------------
+# MANIFESTO E GERAÇÕES
+# -------------------------------------------------------------------
+def ler_agregados(caminho_do_ficheiro):
+    """
+    Lê os agregados (NOMES_AGREGADOS) da geração atual, sem verificar
+    se o ficheiro de dados mudou entretanto.
+
+    :return: (cubo, indice_itens, histograma_kda, confrontos, indice_builds,
+             manifesto) ou (None, None, None, None, None, {}) se não existirem
+    """
+    # Uma atualização pode apagar a geração lida entre abrir o manifesto
+    # e os ficheiros; nesse caso voltamos a ler o manifesto
+    for _ in range(3):
+        manifesto = _ler_manifesto(caminho_do_ficheiro)
+        if manifesto.get('versao_formato') != VERSAO_FORMATO_AGREGADOS:
+            return None, None, None, None, None, {}
+        pasta = os.path.dirname(caminho_do_ficheiro)
+        try:
+            return (*(pd.read_parquet(os.path.join(pasta, manifesto['ficheiros'][nome]))
+                      for nome in NOMES_AGREGADOS), manifesto)
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            print(f"Aviso: agregados de '{caminho_do_ficheiro}' ilegíveis ({e}). A reconstruir.")
+            break
+    return None, None, None, None, None, {}
+
+
+def _gravar_geracao(caminho_do_ficheiro, agregados, manifesto):
+    """
+    Grava uma geração nova e publica-a trocando o manifesto.
+    As gerações anteriores à que estava publicada são apagadas
+    (a anterior fica, para quem ainda a estiver a ler).
+    """
+    geracao = manifesto['geracao']
+    base = f"{caminho_do_ficheiro}{SUFIXO_AGREGADOS}.{geracao}-{os.getpid()}"
+    ficheiros = {}
+    for nome, agregado in zip(NOMES_AGREGADOS, agregados):
+        caminho = f"{base}.{nome}.parquet"
+        temporario = f"{caminho}.tmp"
+        agregado.to_parquet(temporario)
+        os.replace(temporario, caminho)
+        ficheiros[nome] = os.path.basename(caminho)
+
+    gravar_json_atomico(_caminho_manifesto(caminho_do_ficheiro), {**manifesto, 'ficheiros': ficheiros})
+
+    for antigo in glob.glob(glob.escape(caminho_do_ficheiro) + SUFIXO_AGREGADOS + '.*.parquet'):
+        correspondencia = _GERACAO.search(antigo)
+        if correspondencia and int(correspondencia.group(1)) < geracao - 1:
+            try:
+                os.remove(antigo)
+            except OSError:
+                pass
+
+
+def _somar(guardado, parciais, combinar):
+    """
+    Soma os agregados dos blocos novos (juntos de uma só vez) ao
+    agregado gravado sem o voltar a agrupar: as chaves que já existem
+    são somadas no lugar e as novas acrescentadas no fim, por isso o
+    custo depende das linhas novas e não de tudo o que já foi somado.
+    """
+    novo = combinar(parciais)
+    if novo is None and parciais:
+        novo = parciais[0]
+    if novo is None or novo.empty:
+        return novo if guardado is None else guardado
+    if guardado is None:
+        return novo
+    novo = novo[guardado.columns]
+    posicoes = guardado.index.get_indexer(novo.index)
+    existentes = posicoes >= 0
+    valores = guardado.to_numpy(copy=True)
+    valores[posicoes[existentes]] += novo.to_numpy()[existentes]
+    somado = pd.DataFrame(valores, index=guardado.index, columns=guardado.columns)
+    return pd.concat([somado, novo[~existentes]]).astype('int64')
+
+
+# -------------------------------------------------------------------
+# FUNÇÃO PRINCIPAL
+# -------------------------------------------------------------------
+def obter_agregados(caminho_do_ficheiro):
+    """
+    Devolve os agregados do ficheiro de dados (cubo, índice de itens,
+    histograma de KDA, confrontos e índice de builds), atualizados.
+
+    - Ficheiro igual ao da última vez: lê os agregados gravados.
+    - Ficheiro que só cresceu (partidas acrescentadas no fim): lê só as
+      linhas depois da marca de água e soma-as aos agregados gravados,
+      por isso o custo depende das partidas novas e não da época toda.
+      No CSV a marca é o byte onde a leitura parou; no Parquet/Excel é
+      o nº de linhas, confirmado pelo match_id da última linha agregada.
+      O Excel não permite ler só o fim, por isso é convertido de novo
+      para a cache Parquet, mas só as linhas novas são agregadas.
+    - Outra alteração (ficheiro reescrito, linhas editadas ou apagadas):
+      reconstrói. Para o confirmar sem reler as linhas antigas, usamos o
+      inode e o início/fim dos bytes antigos no CSV e as estatísticas de
+      cada row group no Parquet (ver JANELA_IMPRESSAO).
+
+    :return: (cubo, indice_itens, histograma_kda, confrontos, indice_builds)
+    """
+    if pq is None:
+        df = aplicar_esquema(carregar_dados_com_cache(caminho_do_ficheiro), mostrar_relatorio=False)
+        return (construir_cubo(df), construir_indice_itens(df),
+                construir_histograma_kda(df), construir_confrontos(df), construir_indice_builds(df))
+
+    estado = os.stat(caminho_do_ficheiro)
+    cubo, indice_itens, histograma_kda, confrontos, indice_builds, manifesto = ler_agregados(caminho_do_ficheiro)
+    if (cubo is not None and manifesto.get('tamanho') == estado.st_size
+            and manifesto.get('mtime_ns') == estado.st_mtime_ns):
+        contar('agregados_gravados', 'acerto')
+        return cubo, indice_itens, histograma_kda, confrontos, indice_builds
+
+    marca = manifesto.get('marca_agua', {}) if cubo is not None else {}
+    linhas = marca.get('linhas', 0)
+    e_csv = caminho_do_ficheiro.endswith('.csv')
+
+    if e_csv:
+        desde = marca.get('bytes', 0)
+        if desde and (estado.st_size < desde or marca.get('inode') != estado.st_ino
+                      or _impressao_csv(caminho_do_ficheiro, desde) != marca.get('impressao')):
+            desde = 0
+        if not desde:
+            cubo, indice_itens, histograma_kda, confrontos, indice_builds, linhas = None, None, None, None, None, 0
+        blocos, fim = _ler_csv_desde(caminho_do_ficheiro, desde)
+        ultima_partida = marca.get('ultima_partida') if desde else None
+    else:
+        parquet = caminho_parquet(caminho_do_ficheiro)
+        if parquet is None:  # Excel sem cache Parquet: reconstrói sempre
+            novas, valida, marca_tabela = carregar_dados_com_cache(caminho_do_ficheiro, COLUNAS_ANALISE), False, {}
+        else:
+            novas, valida, marca_tabela = _ler_parquet_desde(parquet, marca)
+        if not valida:
+            cubo, indice_itens, histograma_kda, confrontos, indice_builds, linhas = None, None, None, None, None, 0
+        blocos = [novas]
+        ultima_partida = marca.get('ultima_partida') if linhas else None
+
+    if cubo is None:
+        contar('agregados_gravados', 'falha')
+        print(f"A calcular os agregados de '{caminho_do_ficheiro}' (só acontece uma vez)...")
+    else:
+        contar('agregados_gravados', 'incremental')
+    linhas_novas = 0
+    cubos, indices_itens, histogramas_kda, lista_confrontos, indices_builds = [], [], [], [], []
+    # A última partida de cada bloco pode continuar no bloco seguinte (ou
+    # na próxima atualização): os confrontos só a contam quando estiver completa
+    pendentes = None
+    if linhas and marca.get('pendentes'):
+        pendentes = pd.DataFrame(marca['pendentes'], columns=COLUNAS_CONFRONTOS)
+        lista_confrontos.append(-construir_confrontos(pendentes))
+    for bloco in blocos:
+        if bloco.empty:
+            continue
+        if COLUNA_PARTIDA in bloco.columns:
+            ultima_partida = str(bloco[COLUNA_PARTIDA].iloc[-1])
+        # A marca de água conta as linhas do ficheiro, mesmo as que o esquema descarta
+        linhas_novas += len(bloco)
+        bloco = aplicar_esquema(bloco, mostrar_relatorio=False)
+        cubos.append(construir_cubo(bloco))
+        indices_itens.append(construir_indice_itens(bloco))
+        histogramas_kda.append(construir_histograma_kda(bloco))
+        indices_builds.append(construir_indice_builds(bloco))
+        completas, pendentes = separar_ultima_partida(
+            bloco if pendentes is None else pd.concat([pendentes, bloco], ignore_index=True))
+        lista_confrontos.append(construir_confrontos(completas))
+    if pendentes is not None:
+        lista_confrontos.append(construir_confrontos(pendentes))
+    cubo = _somar(cubo, cubos, combinar_cubos)
+    indice_itens = _somar(indice_itens, indices_itens, combinar_indices_itens)
+    histograma_kda = _somar(histograma_kda, histogramas_kda, combinar_histogramas_kda)
+    confrontos = _somar(confrontos, lista_confrontos, combinar_confrontos)
+    if confrontos is not None:
+        # Pares da última partida antiga que deixaram de existir
+        confrontos = confrontos[confrontos['jogos'].to_numpy() > 0]
+    indice_builds = _somar(indice_builds, indices_builds, combinar_indices_builds)
+
+    if cubo is None:  # Ficheiro sem linhas
+        vazio = aplicar_esquema(pd.DataFrame(columns=COLUNAS_ANALISE), mostrar_relatorio=False)
+        cubo, indice_itens = construir_cubo(vazio), construir_indice_itens(vazio)
+        histograma_kda, confrontos = construir_histograma_kda(vazio), construir_confrontos(vazio)
+        indice_builds = construir_indice_builds(vazio)
+    if linhas and linhas_novas:
+        print(f"'{caminho_do_ficheiro}': {linhas_novas} linhas novas somadas aos agregados.")
+
+    marca = {'linhas': linhas + linhas_novas, 'ultima_partida': ultima_partida, 'pendentes': []}
+    if pendentes is not None and set(COLUNAS_CONFRONTOS) <= set(pendentes.columns):
+        marca['pendentes'] = json.loads(pendentes[COLUNAS_CONFRONTOS].to_json(orient='records'))
+    if e_csv:
+        marca.update(bytes=fim, inode=estado.st_ino, impressao=_impressao_csv(caminho_do_ficheiro, fim))
+    else:
+        marca.update(marca_tabela)
+
+    try:
+        _gravar_geracao(caminho_do_ficheiro, (cubo, indice_itens, histograma_kda, confrontos, indice_builds), {
+            'versao_formato': VERSAO_FORMATO_AGREGADOS,
+            'origem': os.path.basename(caminho_do_ficheiro),
+            'tamanho': estado.st_size,
+            'mtime_ns': estado.st_mtime_ns,
+            'geracao': manifesto.get('geracao', 0) + 1,
+            'marca_agua': marca,
+        })
+    except Exception as e:
+        print(f"Aviso: não foi possível gravar os agregados de '{caminho_do_ficheiro}' ({e}).")
+    return cubo, indice_itens, histograma_kda, confrontos, indice_builds
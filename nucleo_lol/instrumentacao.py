@@ -0,0 +1,210 @@
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # Sem psutil, o RSS só é medido em Linux (/proc)
+    psutil = None
+
+# -------------------------------------------------------------------
+# INSTRUMENTAÇÃO (tempos, memória, contadores de cache e nº de linhas)
+# -------------------------------------------------------------------
+
+# Cada etapa medida gera um registo:
+#   {'etapa', 'duracao_s', 'memoria_mb', 'delta_memoria_mb',
+#    'linhas_entrada', 'linhas_saida', ...}
+# Os registos ficam numa lista por thread (cada sessão do Streamlit corre
+# na sua thread) e os contadores de cache ({contador: {evento: n}}) são
+# globais ao processo.
+
+# Com LOL_LOGS_JSON=1 cada registo é também escrito em JSON (uma linha)
+# no stderr; com outro valor, acrescentado a esse ficheiro
+VARIAVEL_LOGS_JSON = 'LOL_LOGS_JSON'
+
+# Com LOL_PERFIL=<ficheiro.prof> o script/dashboard corre com o cProfile
+# e grava as estatísticas nesse ficheiro (formato pstats, ex: snakeviz).
+# O py-spy não precisa de nada disto: py-spy record -- python analise_lol.py
+VARIAVEL_PERFIL = 'LOL_PERFIL'
+
+_local = threading.local()
+_contadores = defaultdict(lambda: defaultdict(int))
+_trinco = threading.Lock()
+_destino_logs = None
+
+
+def _registos():
+    if not hasattr(_local, 'registos'):
+        _local.registos = []
+    return _local.registos
+
+
+def _rss_mb():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+# -------------------------------------------------------------------
+# LOGS EM JSON
+# -------------------------------------------------------------------
+def ativar_logs_json(destino=None):
+    """
+    Passa a escrever cada registo (e os contadores, em resumo_json) como
+    uma linha JSON. 'destino': caminho de um ficheiro, '1' (stderr) ou
+    '0' (desligado). Sem argumentos usa a variável de ambiente
+    LOL_LOGS_JSON; sem ela os logs JSON ficam desligados.
+    """
+    global _destino_logs
+    valor = os.environ.get(VARIAVEL_LOGS_JSON, '') if destino is None else destino
+    _destino_logs = None if valor in ('', '0') else valor
+
+
+def _escrever_json(registo):
+    if _destino_logs is None:
+        return
+    linha = json.dumps({'ts': round(time.time(), 3), 'pid': os.getpid(), **registo},
+                       default=str, ensure_ascii=False)
+    if _destino_logs == '1':
+        print(linha, file=sys.stderr, flush=True)
+        return
+    try:
+        with open(_destino_logs, 'a', encoding='utf-8') as f:
+            f.write(linha + '\n')
+    except OSError as e:
+        print(f"Aviso: não foi possível escrever os logs em '{_destino_logs}' ({e}).")
+
+
+# -------------------------------------------------------------------
+# ETAPAS E CONTADORES
+# -------------------------------------------------------------------
+def _linhas(objeto):
+    if objeto is None or not hasattr(objeto, 'shape'):
+        return None
+    return int(objeto.shape[0])
+
+
+@contextmanager
+def medir(etapa, **campos):
+    """
+    Mede o tempo e a memória (RSS) de um bloco:
+
+        with medir('filtrar_modo', linhas_entrada=len(df)) as registo:
+            df_modo = ...
+            registo['linhas_saida'] = len(df_modo)
+
+    O registo fica em registos() e, com os logs JSON ativos, é escrito logo.
+    """
+    registo = {'etapa': etapa, **campos}
+    memoria_inicial = _rss_mb()
+    inicio = time.perf_counter()
+    try:
+        yield registo
+    except BaseException as e:
+        registo['erro'] = repr(e)
+        raise
+    finally:
+        registo['duracao_s'] = round(time.perf_counter() - inicio, 4)
+        memoria_final = _rss_mb()
+        if memoria_final is not None:
+            registo['memoria_mb'] = round(memoria_final, 1)
+            registo['delta_memoria_mb'] = round(memoria_final - memoria_inicial, 1)
+        _registos().append(registo)
+        _escrever_json({'evento': 'etapa', **registo})
+
+
+def medido(funcao):
+    """
+    Decorador: mede cada chamada de 'funcao' (ver medir), com o nº de linhas
+    do primeiro argumento e do resultado quando são DataFrames / Series.
+    """
+    @functools.wraps(funcao)
+    def envolvida(*args, **kwargs):
+        with medir(funcao.__name__, linhas_entrada=_linhas(args[0]) if args else None) as registo:
+            resultado = funcao(*args, **kwargs)
+            registo['linhas_saida'] = _linhas(resultado)
+        return resultado
+    return envolvida
+
+
+def contar(contador, evento, n=1):
+    """
+    Soma 'n' ao 'evento' de um contador (ex: contar('cache_parquet', 'acerto')).
+    """
+    with _trinco:
+        _contadores[contador][evento] += n
+
+
+def registos():
+    """
+    Registos das etapas medidas nesta thread (desde o último limpar).
+    """
+    return list(_registos())
+
+
+def contadores():
+    with _trinco:
+        return {nome: dict(eventos) for nome, eventos in _contadores.items()}
+
+
+def limpar():
+    """
+    Esquece os registos desta thread (ex: no início de cada execução
+    do dashboard). Os contadores acumulam durante a vida do processo.
+    """
+    _registos().clear()
+
+
+def resumo_json():
+    """
+    Escreve os contadores de cache como uma linha JSON (se ativos).
+    """
+    _escrever_json({'evento': 'contadores', 'contadores': contadores()})
+
+
+# -------------------------------------------------------------------
+# MODO DE PERFIL (cProfile)
+# -------------------------------------------------------------------
+def iniciar_perfil():
+    """
+    Liga o cProfile se LOL_PERFIL estiver definida; devolve o perfil ou None.
+    """
+    if not os.environ.get(VARIAVEL_PERFIL):
+        return None
+    perfil_ativo = cProfile.Profile()
+    perfil_ativo.enable()
+    return perfil_ativo
+
+
+def terminar_perfil(perfil_ativo):
+    """
+    Desliga o perfil e grava as estatísticas no ficheiro de LOL_PERFIL.
+    """
+    if perfil_ativo is None:
+        return
+    perfil_ativo.disable()
+    caminho = os.environ[VARIAVEL_PERFIL]
+    try:
+        perfil_ativo.dump_stats(caminho)
+        print(f"Perfil gravado em '{caminho}' (ver com: python -m pstats {caminho}).")
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar o perfil ({e}).")
+
+
+@contextmanager
+def perfil():
+    perfil_ativo = iniciar_perfil()
+    try:
+        yield
+    finally:
+        terminar_perfil(perfil_ativo)
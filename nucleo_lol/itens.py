@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+from .cache import COLUNAS_ITENS
+from .catalogo import resolver_nomes_itens
+from .cubo import CHAVES_CUBO
+from .esquema import patch_da_versao
+
+# -------------------------------------------------------------------
+# ÍNDICE ESPARSO (modo x posição x campeão x patch) x ITEM
+# -------------------------------------------------------------------
+
+# O índice é uma matriz esparsa em formato "longo": uma linha por
+# (game_mode, individual_position, champion_name, patch, item) que existe
+# nos dados, ordenada pelas chaves, com o nº de vezes que o item aparece
+# nos slots item0..item6 e quantas dessas vezes foram vitórias.
+# O patch faz parte da chave porque o mesmo ID pode ser outro item
+# noutro patch (ver catalogo.construir_tabela_nomes).
+CHAVES_GRUPO_ITENS = [*CHAVES_CUBO, 'patch']
+CHAVES_INDICE_ITENS = [*CHAVES_GRUPO_ITENS, 'item']
+COLUNAS_INDICE_ITENS = ['contagem', 'vitorias']
+
+
+def construir_indice_itens(df):
+    """
+    Constrói o índice numa única passagem vetorizada pelas 7 colunas
+    de itens (sem stack/value_counts por campeão).
+
+    O slot vazio (item 0) é ignorado. Um item repetido na mesma linha
+    conta as duas vezes, tal como em analisar_itens_campeao.
+    """
+    chaves = [df[nome] for nome in CHAVES_CUBO] + [patch_da_versao(df)]
+    agrupado = df.groupby(chaves, observed=True, sort=True)
+    grupos = agrupado.size().index
+    codigo_grupo = agrupado.ngroup().to_numpy()
+
+    itens = df[COLUNAS_ITENS].to_numpy(dtype=np.int64)
+    n_slots = itens.shape[1]
+    itens_planos = itens.ravel()
+    grupo_plano = np.repeat(codigo_grupo, n_slots)
+    vitoria_plana = np.repeat(df['win'].to_numpy(dtype=bool), n_slots)
+
+    # Linhas com chaves em falta ficam com ngroup() == -1
+    validos = (itens_planos != 0) & (grupo_plano >= 0)
+    itens_planos = itens_planos[validos]
+    grupo_plano = grupo_plano[validos]
+    vitoria_plana = vitoria_plana[validos]
+
+    # Chave única por (grupo, item): ordenar estas chaves dá a ordem CSR
+    base = int(itens_planos.max()) + 1 if len(itens_planos) else 1
+    chave = grupo_plano * base + itens_planos
+    chaves_unicas, inverso = np.unique(chave, return_inverse=True)
+    contagem = np.bincount(inverso)
+    vitorias = np.bincount(inverso, weights=vitoria_plana).astype(np.int64)
+
+    grupo_da_chave = chaves_unicas // base
+    niveis = [grupos.get_level_values(nome)[grupo_da_chave] for nome in CHAVES_GRUPO_ITENS]
+    indice = pd.MultiIndex.from_arrays([*niveis, chaves_unicas % base], names=CHAVES_INDICE_ITENS)
+    return pd.DataFrame({'contagem': contagem, 'vitorias': vitorias}, index=indice)
+
+
+def combinar_indices_itens(indices):
+    """
+    Junta vários índices de itens somando as contagens das mesmas chaves.
+    """
+    indices = [i for i in indices if i is not None and not i.empty]
+    if not indices:
+        return None
+    if len(indices) == 1:
+        return indices[0]
+    juntos = pd.concat([i.reset_index() for i in indices], ignore_index=True)
+    for chave in CHAVES_GRUPO_ITENS:
+        juntos[chave] = juntos[chave].astype(str).astype('category')
+    agrupado = juntos.groupby(CHAVES_INDICE_ITENS, observed=True)[COLUNAS_INDICE_ITENS].sum()
+    return agrupado.astype('int64')
+
+
+# -------------------------------------------------------------------
+# CONSULTAS
+# -------------------------------------------------------------------
+def fatia_indice_itens(indice, nome_do_campeao, modo=None, posicao=None):
+    """
+    Devolve as contagens por (patch, item) de um campeão.
+    Com modo e posição dados é um simples corte do índice ordenado;
+    sem eles, somamos as linhas dos vários modos/posições.
+    """
+    if modo is not None and posicao is not None:
+        try:
+            return indice.loc[(modo, posicao, nome_do_campeao)]
+        except KeyError:
+            return indice.iloc[0:0].droplevel(CHAVES_CUBO)
+
+    mascara = indice.index.get_level_values('champion_name') == nome_do_campeao
+    if modo is not None:
+        mascara &= indice.index.get_level_values('game_mode') == modo
+    if posicao is not None:
+        mascara &= indice.index.get_level_values('individual_position') == posicao
+    return indice[mascara].groupby(level=['patch', 'item'], observed=True).sum()
+
+
+def agregar_por_item(fatia, tabela_nomes=None):
+    """
+    Junta as linhas (patch, item) de uma fatia numa linha por item.
+
+    Com uma tabela de nomes (catalogo.construir_tabela_nomes), cada
+    (patch, item) é traduzido para o nome do item NESSE patch de forma
+    vetorizada e as contagens são somadas por nome. Sem tabela, as
+    contagens são somadas por ID.
+    """
+    if tabela_nomes is None:
+        return fatia.groupby(level='item').sum()
+    nomes = resolver_nomes_itens(tabela_nomes,
+                                 fatia.index.get_level_values('patch'),
+                                 fatia.index.get_level_values('item'))
+    por_nome = fatia.groupby(nomes).sum()
+    por_nome.index.name = 'item'
+    return por_nome
+
+
+def top_itens(fatia, top=None):
+    """
+    Contagem de cada item, do mais para o menos usado.
+    Com 'top' só os 'top' primeiros são ordenados (seleção parcial).
+    Empates são desfeitos pelo índice (ID ou nome do item).
+    """
+    contagem = fatia['contagem'].sort_index()
+    if top is not None:
+        contagem = contagem.nlargest(top)
+    return contagem.sort_values(ascending=False, kind='stable').rename('count')
+
+
+def taxa_vitoria_itens(fatia, top=None):
+    """
+    Contagem e taxa de vitória (%) de cada item, ordenados pela contagem.
+    """
+    contagem = top_itens(fatia, top)
+    vitorias = fatia['vitorias'].reindex(contagem.index)
+    taxa = (vitorias / contagem * 100).round(2)
+    return pd.DataFrame({'contagem': contagem, 'taxa_vitoria': taxa})
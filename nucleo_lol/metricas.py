@@ -0,0 +1,177 @@
+from collections import namedtuple
+
+import pandas as pd
+
+from .estatistica import intervalo_wilson, taxa_bayes_empirico
+
+# -------------------------------------------------------------------
+# MOTOR DE MÉTRICAS POR CAMPEÃO (uma só passagem pelos dados)
+# -------------------------------------------------------------------
+
+# Cada métrica declara as somas de que precisa ('somas') e calcula o
+# resultado a partir de uma tabela com uma linha por campeão e uma
+# coluna por soma ('calcular'). Todas as somas das métricas pedidas são
+# feitas num único groupby e o mínimo de jogos é aplicado uma só vez.
+#
+# Para acrescentar uma métrica basta registá-la (registar_metrica), sem
+# mais nenhuma passagem pelos dados. Se precisar de uma soma nova,
+# registar também a soma (registar_soma).
+Metrica = namedtuple('Metrica', ['nome', 'somas', 'calcular', 'aplica_minimo'])
+
+# Valor de cada soma numa linha do DataFrame. As somas são feitas em
+# int64 para não transbordar os tipos compactos (uint8/uint16) do esquema.
+SOMAS = {
+    'jogos': lambda df: 1,
+    'vitorias': lambda df: df['win'].astype('int64'),
+    'kills': lambda df: df['kills'].astype('int64'),
+    'deaths': lambda df: df['deaths'].astype('int64'),
+    'assists': lambda df: df['assists'].astype('int64'),
+    'ouro': lambda df: df['gold_earned'].astype('int64'),
+    'ouro_vitorias': lambda df: df['gold_earned'].astype('int64') * df['win'].astype('int64'),
+}
+
+METRICAS = {}
+
+
+def registar_soma(nome, valor):
+    """
+    Regista uma soma nova.
+
+    :param valor: Função que recebe o DataFrame e devolve o valor de
+                  cada linha (Series numérica ou escalar).
+    """
+    SOMAS[nome] = valor
+
+
+def registar_metrica(nome, somas, calcular, aplica_minimo=True):
+    """
+    Regista uma métrica por campeão.
+
+    :param somas: Nomes das somas (em SOMAS) de que a métrica precisa.
+    :param calcular: Função que recebe a tabela por campeão (uma coluna
+                     por soma, mais 'jogos') e devolve o resultado.
+    :param aplica_minimo: Se True, só recebe os campeões com pelo menos
+                          'min_jogos' jogos; se False, recebe todos.
+    """
+    em_falta = [soma for soma in somas if soma not in SOMAS]
+    if em_falta:
+        raise ValueError(f"Somas desconhecidas para a métrica '{nome}': {em_falta}")
+    METRICAS[nome] = Metrica(nome, tuple(somas), calcular, aplica_minimo)
+
+
+# -------------------------------------------------------------------
+# AGREGAÇÃO E CÁLCULO
+# -------------------------------------------------------------------
+def somas_necessarias(nomes=None):
+    """
+    Somas (sem repetidos, 'jogos' primeiro) de que as métricas precisam.
+    """
+    nomes = list(METRICAS) if nomes is None else nomes
+    somas = ['jogos']
+    for nome in nomes:
+        for soma in METRICAS[nome].somas:
+            if soma not in somas:
+                somas.append(soma)
+    return somas
+
+
+def agregar_somas(df, chaves, somas):
+    """
+    Calcula todas as 'somas' por 'chaves' num único groupby.
+    """
+    chaves = list(chaves)
+    auxiliar = df[chaves].assign(**{soma: SOMAS[soma](df) for soma in somas})
+    return auxiliar.groupby(chaves, observed=True)[list(somas)].sum().astype('int64')
+
+
+def metricas_da_tabela(tabela, min_jogos=1, nomes=None):
+    """
+    Calcula as métricas a partir de uma tabela que já tem as somas por
+    campeão (ex: cubo.fatia_cubo ou agregar_somas).
+
+    :return: {nome da métrica: resultado}; None quando não há campeões
+             com jogos suficientes.
+    """
+    nomes = list(METRICAS) if nomes is None else nomes
+    relevantes = tabela[tabela['jogos'] >= min_jogos]
+    resultados = {}
+    for nome in nomes:
+        metrica = METRICAS[nome]
+        base = relevantes if metrica.aplica_minimo else tabela
+        resultados[nome] = None if base.empty else metrica.calcular(base)
+    return resultados
+
+
+def calcular_metricas(df, min_jogos=1, nomes=None):
+    """
+    Calcula as métricas pedidas (todas, por omissão) para cada campeão
+    do DataFrame, com uma única passagem pelos dados.
+    """
+    nomes = list(METRICAS) if nomes is None else nomes
+    tabela = agregar_somas(df, ['champion_name'], somas_necessarias(nomes))
+    return metricas_da_tabela(tabela, min_jogos, nomes)
+
+
+# -------------------------------------------------------------------
+# MÉTRICAS INCLUÍDAS
+# -------------------------------------------------------------------
+def _jogos(tabela):
+    return tabela['jogos']
+
+
+def _taxa_vitoria(tabela):
+    taxas_vitoria = tabela['vitorias'] / tabela['jogos']
+    taxas_vitoria_perc = (taxas_vitoria * 100).sort_values(ascending=False)
+    return taxas_vitoria_perc.round(2).rename('win')
+
+
+def _kda(tabela):
+    media_stats = tabela[['kills', 'deaths', 'assists']].div(tabela['jogos'], axis=0)
+    media_stats['deaths_para_kda'] = media_stats['deaths'].replace(0, 1)
+    media_stats['kda'] = (media_stats['kills'] + media_stats['assists']) / media_stats['deaths_para_kda']
+    media_stats = media_stats.round(2).sort_values(by='kda', ascending=False)
+    return media_stats[['kills', 'deaths', 'assists', 'kda']]
+
+
+def _ouro_medio(tabela):
+    return (tabela['ouro'] / tabela['jogos']).round(2).rename('gold_earned')
+
+
+def _impacto_ouro(tabela):
+    """
+    Média de ouro em derrotas vs. vitórias (de todos os campeões).
+    """
+    total = tabela[['jogos', 'vitorias', 'ouro', 'ouro_vitorias']].sum()
+    derrotas = total['jogos'] - total['vitorias']
+    medias = {}
+    if derrotas > 0:
+        medias['Derrota'] = (total['ouro'] - total['ouro_vitorias']) / derrotas
+    if total['vitorias'] > 0:
+        medias['Vitória'] = total['ouro_vitorias'] / total['vitorias']
+    media_ouro = pd.Series(medias, name='gold_earned', dtype='float64').round(2)
+    media_ouro.index.name = 'win'
+    return media_ouro
+
+
+def _significancia(tabela):
+    """
+    Taxa de vitória com o intervalo de Wilson (95%) e a taxa ajustada
+    por Bayes empírico, ordenada pelo limite inferior do intervalo.
+    """
+    inferior, superior = intervalo_wilson(tabela['vitorias'], tabela['jogos'])
+    significancia = pd.DataFrame({
+        'jogos': tabela['jogos'],
+        'win': tabela['vitorias'] / tabela['jogos'] * 100,
+        'win_inferior': inferior * 100,
+        'win_superior': superior * 100,
+        'win_ajustada': taxa_bayes_empirico(tabela['vitorias'], tabela['jogos']) * 100,
+    }, index=tabela.index)
+    return significancia.round(2).sort_values(by='win_inferior', ascending=False)
+
+
+registar_metrica('jogos', [], _jogos)
+registar_metrica('taxa_vitoria', ['vitorias'], _taxa_vitoria)
+registar_metrica('kda', ['kills', 'deaths', 'assists'], _kda)
+registar_metrica('ouro_medio', ['ouro'], _ouro_medio)
+registar_metrica('impacto_ouro', ['vitorias', 'ouro', 'ouro_vitorias'], _impacto_ouro, aplica_minimo=False)
+registar_metrica('significancia', ['vitorias'], _significancia)
@@ -0,0 +1,502 @@
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .builds import COLUNAS_BUILD, COLUNAS_CHAVE_BUILD, CHAVES_INDICE_BUILDS, construir_indice_builds
+from .cache import COLUNAS_ITENS, caminho_parquet
+from .confrontos import COLUNAS_CONFRONTOS, construir_confrontos
+from .cubo import CHAVES_CUBO, construir_histograma_kda
+from .esquema import COLUNA_VERSAO, aplicar_esquema, patch_da_versao
+from .filtros import filtrar_linhas
+from .itens import CHAVES_INDICE_ITENS, construir_indice_itens
+from .metricas import agregar_somas, metricas_da_tabela, somas_necessarias
+from .particoes import e_particionado, listar_particoes, podar_particoes
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Os motores preguiçosos leem a cache Parquet, que precisa do pyarrow
+    pq = None
+
+try:
+    import polars as pl
+except ImportError:  # O polars é opcional: sem ele o motor 'polars' não está disponível
+    pl = None
+
+try:
+    import duckdb
+except ImportError:  # O duckdb é opcional: sem ele o motor 'duckdb' não está disponível
+    duckdb = None
+
+# -------------------------------------------------------------------
+# MOTORES DE ANÁLISE (pandas, polars, duckdb)
+# -------------------------------------------------------------------
+
+# Todas as análises começam por reduzir as linhas a uma tabela de somas
+# ou contagens (somas por campeão, histograma de KDA, índice de itens,
+# índice de builds); o resto (métricas, top de itens, builds) só usa
+# essas tabelas. O motor decide como as tabelas são calculadas:
+#   - 'pandas': sobre o DataFrame carregado (o caminho de sempre);
+#   - 'polars' / 'duckdb': uma consulta preguiçosa sobre a cache Parquet,
+#     multi-thread, com os filtros de modo / posição / campeão e as
+#     colunas passados ao leitor (predicate / projection pushdown), sem
+#     nunca carregar o ficheiro nem copiar as linhas filtradas.
+# As tabelas saem iguais às do pandas (mesmos valores, tipos e ordem),
+# por isso os resultados das análises também.
+#
+# Consulta: ficheiros Parquet + filtros {coluna: valor ou [valores]},
+# ainda por executar. Filtrar uma consulta só junta filtros.
+Consulta = namedtuple('Consulta', ['motor', 'caminhos', 'colunas', 'filtros'])
+
+# Motor por omissão (analise_lol.MOTOR_ANALISE, benchmarks --motores)
+MOTOR_POR_OMISSAO = os.environ.get('LOL_MOTOR', 'pandas')
+
+Motor = namedtuple('Motor', ['nome', 'agregar', 'histograma_kda', 'indice_itens', 'indice_builds',
+                             'contar_linhas', 'contar_por_valor', 'materializar'])
+
+MOTORES = {}
+
+
+
+def motores_disponiveis():
+    """
+    Nomes dos motores que podem ser usados nesta instalação.
+    """
+    disponiveis = ['pandas']
+    if pq is not None:
+        disponiveis += [nome for nome, modulo in (('polars', pl), ('duckdb', duckdb)) if modulo is not None]
+    return disponiveis
+
+
+def abrir_consulta(caminho, motor, filtros_particao=None):
+    """
+    Prepara uma consulta do 'motor' sobre um ficheiro de dados ou uma pasta /
+    padrão glob de partições, sem ler os dados: só garante que cada ficheiro
+    tem a sua cache Parquet e lê o esquema.
+
+    :return: Consulta, ou None se o motor não estiver disponível ou não
+             houver ficheiros (quem chama usa então o pandas).
+    """
+    if motor not in motores_disponiveis():
+        print(f"Aviso: o motor '{motor}' não está disponível (falta o {motor} ou o pyarrow). A usar o pandas.")
+        return None
+    if e_particionado(caminho):
+        base = caminho if os.path.isdir(caminho) else ''
+        ficheiros = podar_particoes(listar_particoes(caminho), filtros_particao, base)
+    else:
+        ficheiros = [caminho]
+    if not ficheiros:
+        return None
+    caminhos = tuple(caminho_parquet(ficheiro) for ficheiro in ficheiros)
+    if None in caminhos:
+        print(f"Aviso: sem cache Parquet o motor '{motor}' não pode ler os dados. A usar o pandas.")
+        return None
+    colunas = tuple(pq.read_schema(caminhos[0]).names)
+    return Consulta(motor, caminhos, colunas, {})
+
+
+# -------------------------------------------------------------------
+# INTERFACE COMUM (DataFrame do pandas ou Consulta)
+# -------------------------------------------------------------------
+def _motor(dados):
+    return MOTORES[dados.motor]
+
+
+def _verificar_colunas(consulta, colunas):
+    # Igual ao pandas: uma coluna em falta é um KeyError
+    for coluna in colunas:
+        if coluna not in consulta.colunas:
+            raise KeyError(coluna)
+
+
+def filtrar(dados, filtros, indice_filtros=None):
+    """
+    Linhas que cumprem os filtros ({coluna: valor ou [valores]}).
+    DataFrame: com o índice de filtros (filtros.construir_indice_filtros)
+    se for dado, senão com uma máscara. Consulta: só junta os filtros.
+    """
+    if isinstance(dados, Consulta):
+        return dados._replace(filtros={**dados.filtros, **filtros})
+    if indice_filtros is not None:
+        return filtrar_linhas(dados, indice_filtros, filtros)
+    mascara = pd.Series(True, index=dados.index)
+    for coluna, condicao in filtros.items():
+        if isinstance(condicao, (list, tuple, set)):
+            mascara &= dados[coluna].isin(condicao)
+        else:
+            mascara &= dados[coluna] == condicao
+    return dados[mascara.to_numpy()]
+
+
+def agregar(dados, chaves, somas):
+    """
+    metricas.agregar_somas: as 'somas' por 'chaves' (índice: chaves; int64).
+    """
+    if isinstance(dados, Consulta):
+        return _motor(dados).agregar(dados, list(chaves), list(somas))
+    return agregar_somas(dados, chaves, somas)
+
+
+def calcular_metricas(dados, min_jogos=1, nomes=None):
+    """
+    metricas.calcular_metricas com qualquer motor.
+    """
+    tabela = agregar(dados, ['champion_name'], somas_necessarias(nomes))
+    return metricas_da_tabela(tabela, min_jogos, nomes)
+
+
+def histograma_kda(dados, chaves=CHAVES_CUBO):
+    """
+    cubo.construir_histograma_kda com qualquer motor.
+    """
+    if isinstance(dados, Consulta):
+        return _motor(dados).histograma_kda(dados, list(chaves))
+    return construir_histograma_kda(dados, chaves)
+
+
+def indice_itens(dados):
+    """
+    itens.construir_indice_itens com qualquer motor.
+    """
+    if isinstance(dados, Consulta):
+        return _motor(dados).indice_itens(dados)
+    return construir_indice_itens(dados)
+
+
+def indice_builds(dados):
+    """
+    builds.construir_indice_builds com qualquer motor.
+    """
+    if isinstance(dados, Consulta):
+        return _motor(dados).indice_builds(dados)
+    return construir_indice_builds(dados)
+
+
+def confrontos(dados):
+    """
+    confrontos.construir_confrontos com qualquer motor. Os pares precisam
+    das linhas de cada partida, por isso a consulta lê só as colunas dos
+    confrontos (já filtradas) e o agrupamento é feito no pandas.
+    """
+    if isinstance(dados, Consulta):
+        dados = _motor(dados).materializar(dados, [c for c in COLUNAS_CONFRONTOS if c in dados.colunas])
+    return construir_confrontos(dados)
+
+
+def contar_por_valor(dados, coluna):
+    """
+    Nº de linhas de cada valor de 'coluna' (ou 'patch'), do mais para o
+    menos frequente (empates pelo valor).
+    """
+    if isinstance(dados, Consulta):
+        return _motor(dados).contar_por_valor(dados, coluna)
+    valores = patch_da_versao(dados) if coluna == 'patch' else dados[coluna]
+    contagens = valores.value_counts(sort=False)
+    contagens = contagens[contagens > 0].astype('int64')
+    return contagens.iloc[np.lexsort((contagens.index.astype(str), -contagens.to_numpy()))]
+
+
+def contar_linhas(dados):
+    if isinstance(dados, Consulta):
+        return _motor(dados).contar_linhas(dados)
+    return len(dados)
+
+
+def valores_distintos(dados, coluna):
+    """
+    Valores de 'coluna' presentes nos dados (DataFrame: por ordem de
+    aparição, como Series.unique; Consulta: por ordem alfabética).
+    """
+    if isinstance(dados, Consulta):
+        return sorted(contar_por_valor(dados, coluna).index)
+    return dados[coluna].unique()
+
+
+def patches(dados):
+    """
+    Patches presentes nos dados ('14.1', ...), para o catálogo de itens.
+    """
+    if isinstance(dados, Consulta):
+        return list(contar_por_valor(dados, 'patch').index)
+    return patch_da_versao(dados).unique()
+
+
+# -------------------------------------------------------------------
+# RESULTADOS NO FORMATO DO PANDAS
+# -------------------------------------------------------------------
+def _tabela_pandas(tabela, chaves_texto, chaves, colunas):
+    """
+    Tabela já agrupada e ordenada pelo motor -> DataFrame com as chaves
+    no índice (texto como 'category', como nos agregados) e as colunas em int64.
+    """
+    for chave in chaves_texto:
+        tabela[chave] = tabela[chave].astype(str).astype('category')
+    for chave in chaves:
+        if chave not in chaves_texto:
+            tabela[chave] = tabela[chave].astype('int64')
+    return tabela.set_index(chaves)[colunas].astype('int64')
+
+
+def _registar(nome, **funcoes):
+    MOTORES[nome] = Motor(nome, **funcoes)
+
+
+# -------------------------------------------------------------------
+# MOTOR POLARS (LazyFrame)
+# -------------------------------------------------------------------
+def _polars_somas():
+    vitoria = pl.col('win').cast(pl.Boolean).cast(pl.Int64)
+    ouro = pl.col('gold_earned').cast(pl.Int64)
+    return {
+        'jogos': pl.len(),
+        'vitorias': vitoria.sum(),
+        'kills': pl.col('kills').cast(pl.Int64).sum(),
+        'deaths': pl.col('deaths').cast(pl.Int64).sum(),
+        'assists': pl.col('assists').cast(pl.Int64).sum(),
+        'ouro': ouro.sum(),
+        'ouro_vitorias': (ouro * vitoria).sum(),
+    }
+
+
+def _polars_coluna(consulta, coluna):
+    if coluna != 'patch':
+        return pl.col(coluna).cast(pl.Utf8)
+    if COLUNA_VERSAO not in consulta.colunas:
+        return pl.lit('').alias('patch')
+    return pl.col(COLUNA_VERSAO).cast(pl.Utf8).str.extract(r'^(\d+\.\d+)', 1).fill_null('').alias('patch')
+
+
+def _polars_base(consulta, chaves):
+    """
+    LazyFrame filtrado e sem linhas com chaves em falta (como o groupby do pandas).
+    O polars passa os filtros e as colunas usadas ao leitor do Parquet.
+    """
+    consulta_lazy = pl.scan_parquet(list(consulta.caminhos))
+    for coluna, condicao in consulta.filtros.items():
+        _verificar_colunas(consulta, [coluna])
+        if isinstance(condicao, (list, tuple, set)):
+            consulta_lazy = consulta_lazy.filter(pl.col(coluna).is_in(list(condicao)))
+        else:
+            consulta_lazy = consulta_lazy.filter(pl.col(coluna) == condicao)
+    nulos = [c for c in chaves if c != 'patch']
+    _verificar_colunas(consulta, nulos)
+    # Linhas sem resultado ficam de fora, como em aplicar_esquema
+    if 'win' in consulta.colunas:
+        nulos.append('win')
+    return consulta_lazy.drop_nulls(nulos) if nulos else consulta_lazy
+
+
+def _polars_agrupar(consulta_lazy, chaves, agregacoes):
+    return consulta_lazy.group_by(chaves).agg(agregacoes).sort(chaves).collect().to_pandas()
+
+
+def _polars_agregar(consulta, chaves, somas):
+    expressoes = _polars_somas()
+    desconhecidas = [s for s in somas if s not in expressoes]
+    if desconhecidas:
+        raise ValueError(f"Somas sem expressão no motor polars: {desconhecidas}")
+    colunas = {'vitorias': ['win'], 'kills': ['kills'], 'deaths': ['deaths'], 'assists': ['assists'],
+               'ouro': ['gold_earned'], 'ouro_vitorias': ['gold_earned', 'win']}
+    _verificar_colunas(consulta, [c for s in somas for c in colunas.get(s, [])])
+    base = _polars_base(consulta, chaves).with_columns([_polars_coluna(consulta, c) for c in chaves])
+    tabela = _polars_agrupar(base, chaves, [expressoes[s].alias(s) for s in somas])
+    return _tabela_pandas(tabela, chaves, chaves, somas)
+
+
+def _polars_histograma_kda(consulta, chaves):
+    _verificar_colunas(consulta, ['kills', 'deaths', 'assists'])
+    base = _polars_base(consulta, chaves).select(
+        *[_polars_coluna(consulta, c) for c in chaves],
+        (pl.col('kills').cast(pl.Int64) + pl.col('assists').cast(pl.Int64)).alias('kills_assists'),
+        pl.col('deaths').cast(pl.Int64),
+    )
+    niveis = [*chaves, 'kills_assists', 'deaths']
+    tabela = _polars_agrupar(base.drop_nulls(['kills_assists', 'deaths']), niveis, [pl.len().alias('jogos')])
+    return _tabela_pandas(tabela, chaves, niveis, ['jogos'])
+
+
+def _polars_indice_itens(consulta):
+    _verificar_colunas(consulta, [*COLUNAS_ITENS, 'win'])
+    chaves = [*CHAVES_CUBO, 'patch']
+    base = _polars_base(consulta, chaves).select(
+        *[_polars_coluna(consulta, c) for c in chaves],
+        pl.col('win').cast(pl.Boolean).cast(pl.Int64).alias('win'),
+        pl.concat_list([pl.col(c).cast(pl.Int64) for c in COLUNAS_ITENS]).alias('item'),
+    ).explode('item').filter(pl.col('item') != 0)
+    tabela = _polars_agrupar(base, CHAVES_INDICE_ITENS,
+                             [pl.len().alias('contagem'), pl.col('win').sum().alias('vitorias')])
+    return _tabela_pandas(tabela, chaves, CHAVES_INDICE_ITENS, ['contagem', 'vitorias'])
+
+
+def _polars_indice_builds(consulta):
+    _verificar_colunas(consulta, [*COLUNAS_BUILD, 'win'])
+    chaves = [*CHAVES_CUBO, 'patch']
+    ordenados = pl.concat_list([pl.col(c).cast(pl.Int64) for c in COLUNAS_BUILD]).list.sort()
+    base = _polars_base(consulta, chaves).select(
+        *[_polars_coluna(consulta, c) for c in chaves],
+        pl.col('win').cast(pl.Boolean).cast(pl.Int64).alias('win'),
+        *[ordenados.list.get(i).alias(nome) for i, nome in enumerate(COLUNAS_CHAVE_BUILD)],
+    ).filter(pl.col(COLUNAS_CHAVE_BUILD[-1]) != 0)
+    tabela = _polars_agrupar(base, CHAVES_INDICE_BUILDS,
+                             [pl.len().alias('jogos'), pl.col('win').sum().alias('vitorias')])
+    return _tabela_pandas(tabela, chaves, CHAVES_INDICE_BUILDS, ['jogos', 'vitorias'])
+
+
+def _polars_contar_linhas(consulta):
+    return int(_polars_base(consulta, []).select(pl.len()).collect().item())
+
+
+def _polars_contar_por_valor(consulta, coluna):
+    base = _polars_base(consulta, [coluna]).select(_polars_coluna(consulta, coluna).alias('valor'))
+    tabela = (base.group_by('valor').agg(pl.len().alias('linhas'))
+              .sort(['linhas', 'valor'], descending=[True, False]).collect().to_pandas())
+    return pd.Series(tabela['linhas'].to_numpy(dtype='int64'), index=pd.Index(tabela['valor'], name=coluna),
+                     name='count')
+
+
+def _polars_materializar(consulta, colunas):
+    df = _polars_base(consulta, []).select(colunas).collect().to_pandas()
+    return aplicar_esquema(df, mostrar_relatorio=False)
+
+
+if pl is not None:
+    _registar('polars', agregar=_polars_agregar, histograma_kda=_polars_histograma_kda,
+              indice_itens=_polars_indice_itens, indice_builds=_polars_indice_builds,
+              contar_linhas=_polars_contar_linhas, contar_por_valor=_polars_contar_por_valor, materializar=_polars_materializar)
+
+
+# -------------------------------------------------------------------
+# MOTOR DUCKDB (SQL sobre o Parquet)
+# -------------------------------------------------------------------
+SOMAS_SQL = {
+    'jogos': 'COUNT(*)',
+    'vitorias': 'SUM(CAST(CAST(win AS BOOLEAN) AS BIGINT))',
+    'kills': 'SUM(CAST(kills AS BIGINT))',
+    'deaths': 'SUM(CAST(deaths AS BIGINT))',
+    'assists': 'SUM(CAST(assists AS BIGINT))',
+    'ouro': 'SUM(CAST(gold_earned AS BIGINT))',
+    'ouro_vitorias': 'SUM(CAST(gold_earned AS BIGINT) * CAST(CAST(win AS BOOLEAN) AS BIGINT))',
+}
+
+
+def _sql_texto(valor):
+    return "'" + str(valor).replace("'", "''") + "'"
+
+
+def _sql_coluna(consulta, coluna):
+    if coluna != 'patch':
+        return f'CAST("{coluna}" AS VARCHAR) AS "{coluna}"'
+    if COLUNA_VERSAO not in consulta.colunas:
+        return "'' AS patch"
+    return (f"COALESCE(REGEXP_EXTRACT(CAST(\"{COLUNA_VERSAO}\" AS VARCHAR), '^(\\d+\\.\\d+)', 1), '')"
+            " AS patch")
+
+
+def _sql_base(consulta, chaves, expressoes):
+    """
+    SELECT das 'expressoes' sobre os ficheiros, com os filtros (o DuckDB
+    passa-os ao leitor do Parquet, tal como as colunas usadas) e sem linhas
+    com chaves em falta. Devolve (sql, parâmetros).
+    """
+    condicoes, parametros = [], []
+    for coluna, condicao in consulta.filtros.items():
+        _verificar_colunas(consulta, [coluna])
+        valores = list(condicao) if isinstance(condicao, (list, tuple, set)) else [condicao]
+        condicoes.append(f'"{coluna}" IN ({", ".join("?" * len(valores))})')
+        parametros += valores
+    nulos = [c for c in chaves if c != 'patch']
+    _verificar_colunas(consulta, nulos)
+    # Linhas sem resultado ficam de fora, como em aplicar_esquema
+    if 'win' in consulta.colunas:
+        nulos.append('win')
+    condicoes += [f'"{c}" IS NOT NULL' for c in nulos]
+    ficheiros = ', '.join(_sql_texto(c) for c in consulta.caminhos)
+    onde = f" WHERE {' AND '.join(condicoes)}" if condicoes else ''
+    return f"SELECT {', '.join(expressoes)} FROM read_parquet([{ficheiros}]){onde}", parametros
+
+
+def _sql_executar(sql, parametros):
+    with duckdb.connect() as ligacao:
+        return ligacao.execute(sql, parametros).df()
+
+
+def _sql_agrupar(consulta, chaves, expressoes, niveis, agregacoes, onde=''):
+    base, parametros = _sql_base(consulta, chaves, expressoes)
+    lista = ', '.join(f'"{n}"' for n in niveis)
+    sql = (f"SELECT {lista}, {', '.join(agregacoes)} FROM ({base}){onde} "
+           f"GROUP BY {lista} ORDER BY {lista}")
+    return _sql_executar(sql, parametros)
+
+
+def _duckdb_agregar(consulta, chaves, somas):
+    desconhecidas = [s for s in somas if s not in SOMAS_SQL]
+    if desconhecidas:
+        raise ValueError(f"Somas sem expressão no motor duckdb: {desconhecidas}")
+    colunas = {'vitorias': ['win'], 'kills': ['kills'], 'deaths': ['deaths'], 'assists': ['assists'],
+               'ouro': ['gold_earned'], 'ouro_vitorias': ['gold_earned', 'win']}
+    usadas = list(dict.fromkeys(c for s in somas for c in colunas.get(s, [])))
+    _verificar_colunas(consulta, usadas)
+    expressoes = [_sql_coluna(consulta, c) for c in chaves] + [f'"{c}"' for c in usadas]
+    agregacoes = [f'CAST({SOMAS_SQL[s]} AS BIGINT) AS "{s}"' for s in somas]
+    tabela = _sql_agrupar(consulta, chaves, expressoes, chaves, agregacoes)
+    return _tabela_pandas(tabela, chaves, chaves, somas)
+
+
+def _duckdb_histograma_kda(consulta, chaves):
+    _verificar_colunas(consulta, ['kills', 'deaths', 'assists'])
+    expressoes = [_sql_coluna(consulta, c) for c in chaves] + [
+        'CAST(kills AS BIGINT) + CAST(assists AS BIGINT) AS kills_assists',
+        'CAST(deaths AS BIGINT) AS deaths',
+    ]
+    niveis = [*chaves, 'kills_assists', 'deaths']
+    tabela = _sql_agrupar(consulta, chaves, expressoes, niveis, ['COUNT(*) AS jogos'],
+                          ' WHERE kills_assists IS NOT NULL AND deaths IS NOT NULL')
+    return _tabela_pandas(tabela, chaves, niveis, ['jogos'])
+
+
+def _duckdb_indice_itens(consulta):
+    _verificar_colunas(consulta, [*COLUNAS_ITENS, 'win'])
+    chaves = [*CHAVES_CUBO, 'patch']
+    itens = ', '.join(f'CAST("{c}" AS BIGINT)' for c in COLUNAS_ITENS)
+    expressoes = [_sql_coluna(consulta, c) for c in chaves] + [
+        'CAST(CAST(win AS BOOLEAN) AS BIGINT) AS win', f'UNNEST([{itens}]) AS item']
+    tabela = _sql_agrupar(consulta, chaves, expressoes, CHAVES_INDICE_ITENS,
+                          ['COUNT(*) AS contagem', 'CAST(SUM(win) AS BIGINT) AS vitorias'], ' WHERE item <> 0')
+    return _tabela_pandas(tabela, chaves, CHAVES_INDICE_ITENS, ['contagem', 'vitorias'])
+
+
+def _duckdb_indice_builds(consulta):
+    _verificar_colunas(consulta, [*COLUNAS_BUILD, 'win'])
+    chaves = [*CHAVES_CUBO, 'patch']
+    itens = ', '.join(f'CAST("{c}" AS BIGINT)' for c in COLUNAS_BUILD)
+    expressoes = [_sql_coluna(consulta, c) for c in chaves] + ['CAST(CAST(win AS BOOLEAN) AS BIGINT) AS win'] + [
+        f'list_sort([{itens}])[{i + 1}] AS {nome}' for i, nome in enumerate(COLUNAS_CHAVE_BUILD)]
+    tabela = _sql_agrupar(consulta, chaves, expressoes, CHAVES_INDICE_BUILDS,
+                          ['COUNT(*) AS jogos', 'CAST(SUM(win) AS BIGINT) AS vitorias'],
+                          f' WHERE {COLUNAS_CHAVE_BUILD[-1]} <> 0')
+    return _tabela_pandas(tabela, chaves, CHAVES_INDICE_BUILDS, ['jogos', 'vitorias'])
+
+
+def _duckdb_contar_linhas(consulta):
+    base, parametros = _sql_base(consulta, [], ['1'])
+    return int(_sql_executar(f'SELECT COUNT(*) AS linhas FROM ({base})', parametros)['linhas'].iloc[0])
+
+
+def _duckdb_contar_por_valor(consulta, coluna):
+    base, parametros = _sql_base(consulta, [coluna], [_sql_coluna(consulta, coluna)])
+    tabela = _sql_executar(f'SELECT "{coluna}" AS valor, COUNT(*) AS linhas FROM ({base}) '
+                           'GROUP BY valor ORDER BY linhas DESC, valor', parametros)
+    return pd.Series(tabela['linhas'].to_numpy(dtype='int64'), index=pd.Index(tabela['valor'], name=coluna),
+                     name='count')
+
+
+def _duckdb_materializar(consulta, colunas):
+    base, parametros = _sql_base(consulta, [], [f'"{c}"' for c in colunas])
+    return aplicar_esquema(_sql_executar(base, parametros), mostrar_relatorio=False)
+
+
+if duckdb is not None:
+    _registar('duckdb', agregar=_duckdb_agregar, histograma_kda=_duckdb_histograma_kda,
+              indice_itens=_duckdb_indice_itens, indice_builds=_duckdb_indice_builds,
+              contar_linhas=_duckdb_contar_linhas, contar_por_valor=_duckdb_contar_por_valor, materializar=_duckdb_materializar)
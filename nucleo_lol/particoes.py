@@ -0,0 +1,201 @@
+import glob
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pandas as pd
+
+from .builds import combinar_indices_builds
+from .cache import COLUNAS_ANALISE, carregar_dados_com_cache
+from .confrontos import combinar_confrontos
+from .cubo import combinar_cubos, combinar_histogramas_kda
+from .esquema import aplicar_esquema
+from .incremental import obter_agregados
+from .itens import combinar_indices_itens
+
+# -------------------------------------------------------------------
+# DADOS PARTICIONADOS (um ficheiro por dia / região / ...)
+# -------------------------------------------------------------------
+
+EXTENSOES_DADOS = ('.csv', '.xlsx', '.parquet')
+
+# Ficheiros que nós próprios gravamos ao lado dos dados (caches, cubos, ...)
+_SIDECAR = re.compile(r'\.(cache|cubo|itens|kda|confrontos|builds)\.parquet$')
+
+# Atributos no caminho ao estilo Hive: 'region=BR1/date=2024-05-01/parte.csv'
+# (cada pasta é um atributo e o valor pode ter '_', ex: 'queue=ranked_solo')
+# ou, no nome do ficheiro, separados por '_': 'region=BR1_date=2024-05-01.csv'
+_ATRIBUTO = re.compile(r'([A-Za-z][A-Za-z0-9]*)=(.+)')
+_SEPARADOR_NOME = re.compile(r'_(?=[A-Za-z][A-Za-z0-9]*=)')
+
+
+def e_particionado(caminho):
+    """
+    True se 'caminho' for uma pasta ou um padrão glob (ex: 'dados/*.csv')
+    em vez de um único ficheiro.
+    """
+    return os.path.isdir(caminho) or any(c in caminho for c in '*?[')
+
+
+def listar_particoes(caminho):
+    """
+    Lista os ficheiros de dados de uma pasta (recursivamente), de um
+    padrão glob ou devolve o próprio ficheiro, por ordem alfabética.
+    """
+    if os.path.isdir(caminho):
+        candidatos = glob.glob(os.path.join(caminho, '**', '*'), recursive=True)
+    elif e_particionado(caminho):
+        candidatos = glob.glob(caminho, recursive=True)
+    else:
+        candidatos = [caminho]
+    return sorted(c for c in candidatos
+                  if c.endswith(EXTENSOES_DADOS) and not _SIDECAR.search(c) and os.path.isfile(c))
+
+
+def atributos_particao(caminho, base=''):
+    """
+    Extrai os atributos 'chave=valor' do caminho de uma partição
+    (pastas e nome do ficheiro sem extensão).
+    """
+    relativo = os.path.relpath(caminho, base) if base else caminho
+    *pastas, nome = os.path.normpath(os.path.splitext(relativo)[0]).split(os.sep)
+    atributos = {}
+    for parte in [*pastas, *_SEPARADOR_NOME.split(nome)]:
+        encontrado = _ATRIBUTO.fullmatch(parte)
+        if encontrado:
+            atributos[encontrado[1]] = encontrado[2]
+    return atributos
+
+
+def podar_particoes(particoes, filtros_particao, base=''):
+    """
+    Remove as partições cujo nome exclui os filtros, sem abrir os ficheiros.
+
+    :param filtros_particao: {chave: valores aceites} ou {chave: função},
+                             ex: {'region': ['BR1'], 'date': lambda d: d >= '2024-06'}.
+                             Partições sem essa chave no nome nunca são removidas.
+    """
+    if not filtros_particao:
+        return list(particoes)
+    escolhidas = []
+    for particao in particoes:
+        atributos = atributos_particao(particao, base)
+        aceite = True
+        for chave, condicao in filtros_particao.items():
+            if chave not in atributos:
+                continue
+            valor = atributos[chave]
+            aceite = condicao(valor) if callable(condicao) else valor in condicao
+            if not aceite:
+                break
+        if aceite:
+            escolhidas.append(particao)
+    return escolhidas
+
+
+# -------------------------------------------------------------------
+# TRABALHO DE CADA PROCESSO
+# -------------------------------------------------------------------
+def _carregar_particao(caminho, filtros=None, colunas=COLUNAS_ANALISE):
+    """
+    Corre num processo filho: lê só as 'colunas' e as linhas que passam
+    'filtros' (no Parquet, o filtro é feito pelo leitor), para que só
+    essas linhas sejam enviadas ao processo principal.
+    """
+    return aplicar_esquema(carregar_dados_com_cache(caminho, colunas, filtros), mostrar_relatorio=False)
+
+
+def _agregar_particao(caminho):
+    """
+    Corre num processo filho: calcula os agregados de uma partição
+    (cubo, índice de itens, histograma de KDA, confrontos e builds),
+    reutilizando os que estiverem gravados ao lado dela e somando só as
+    linhas novas, e devolve só estes agregados ao processo principal.
+    """
+    return obter_agregados(caminho)
+
+
+def _executar(funcao, particoes, max_processos):
+    if len(particoes) <= 1 or max_processos == 1:
+        return [funcao(p) for p in particoes]
+    with ProcessPoolExecutor(max_workers=max_processos) as executor:
+        return list(executor.map(funcao, particoes))
+
+
+# -------------------------------------------------------------------
+# FUNÇÕES PRINCIPAIS
+# -------------------------------------------------------------------
+def agregar_particoes(caminho, filtros_particao=None, max_processos=None):
+    """
+    Calcula os agregados (cubo, índice de itens, histograma de KDA,
+    confrontos e builds) de um conjunto de partições, em paralelo (um processo
+    por núcleo). Cada processo devolve só os seus agregados, que são
+    depois somados; as linhas nunca chegam ao processo principal.
+
+    :return: (cubo, indice_itens, histograma_kda, confrontos, indice_builds,
+             nº de partições lidas)
+    """
+    base = caminho if os.path.isdir(caminho) else ''
+    particoes = podar_particoes(listar_particoes(caminho), filtros_particao, base)
+    if not particoes:
+        return None, None, None, None, None, 0
+
+    resultados = _executar(_agregar_particao, particoes, max_processos)
+    cubo = combinar_cubos([r[0] for r in resultados])
+    indice_itens = combinar_indices_itens([r[1] for r in resultados])
+    histograma_kda = combinar_histogramas_kda([r[2] for r in resultados])
+    confrontos = combinar_confrontos([r[3] for r in resultados])
+    indice_builds = combinar_indices_builds([r[4] for r in resultados])
+    return cubo, indice_itens, histograma_kda, confrontos, indice_builds, len(particoes)
+
+
+def carregar_particoes(caminho, filtros_particao=None, max_processos=None, filtros=None,
+                       colunas=COLUNAS_ANALISE):
+    """
+    Carrega e junta as linhas de todas as partições (lidas em paralelo).
+    Só para quando as linhas são mesmo precisas; para estatísticas
+    usar agregar_particoes.
+
+    :param filtros: {coluna: valor} das linhas a carregar, aplicado em
+                    cada processo antes de juntar (ex: {'game_mode': 'CLASSIC'}).
+    :param colunas: Colunas a carregar (None = todas).
+    """
+    base = caminho if os.path.isdir(caminho) else ''
+    particoes = podar_particoes(listar_particoes(caminho), filtros_particao, base)
+    if not particoes:
+        return None
+
+    partes = _executar(partial(_carregar_particao, filtros=filtros, colunas=colunas), particoes, max_processos)
+    # As categorias de cada partição são diferentes; o esquema é reaplicado ao todo
+    juntas = pd.concat(partes, ignore_index=True)
+    return aplicar_esquema(juntas, mostrar_relatorio=False)
+
+
+def valores_atributos(caminho):
+    """
+    Valores distintos de cada atributo das partições (ex: {'region': ['BR1', 'EUW1']}),
+    lidos só dos nomes dos ficheiros.
+    """
+    base = caminho if os.path.isdir(caminho) else ''
+    valores = {}
+    for particao in listar_particoes(caminho):
+        for chave, valor in atributos_particao(particao, base).items():
+            valores.setdefault(chave, set()).add(valor)
+    return {chave: sorted(v) for chave, v in valores.items()}
+
+
+def assinatura_dados(caminho):
+    """
+    (ficheiro, tamanho, data de modificação) de cada ficheiro de dados.
+    Muda sempre que são acrescentadas partidas ou partições, por isso
+    serve de chave para caches em memória (ex: st.cache_data).
+    """
+    assinatura = []
+    for particao in listar_particoes(caminho):
+        try:
+            estado = os.stat(particao)
+        except OSError:
+            continue
+        assinatura.append((particao, estado.st_size, estado.st_mtime_ns))
+    return tuple(assinatura)
@@ -0,0 +1,265 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .builds import fatia_indice_builds, minerar_builds
+from .catalogo import construir_tabela_nomes, resolver_nomes_itens
+from .cubo import fatia_cubo, fatia_histograma_kda
+from .estatistica import bootstrap_kda
+from .incremental import obter_agregados
+from .instrumentacao import medir
+from .metricas import metricas_da_tabela
+from .particoes import agregar_particoes, e_particionado
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # Sem pyarrow não há saída em Parquet
+    pyarrow = None
+
+# -------------------------------------------------------------------
+# RELATÓRIOS EM LOTE (todos os modos x posições x campeões)
+# -------------------------------------------------------------------
+
+# Os dados são lidos uma só vez (agregados: cubo, índice de itens, ...).
+# Cada (modo, posição) é uma tarefa que recebe só as suas linhas dos
+# agregados e corre num processo separado; as builds, bem mais caras e
+# muito desiguais entre campeões, são tarefas à parte (uma por campeão).
+# As tarefas maiores começam primeiro, para os processos acabarem todos
+# mais ou menos ao mesmo tempo.
+CHAVES_FATIA = ['game_mode', 'individual_position']
+
+FORMATOS = ('parquet', 'csv', 'json')
+
+TOP_ITENS = 10
+
+# Linhas de cada tipo de build (pares, trios, completas) por campeão
+TOP_BUILDS = 20
+
+
+def _por_fatia(agregado):
+    """
+    {(modo, posição): linhas do agregado}, com um só groupby.
+    """
+    if agregado is None or agregado.empty:
+        return {}
+    return {chave: grupo for chave, grupo in agregado.groupby(level=CHAVES_FATIA, observed=True)}
+
+
+def _com_fatia(tabela, modo, posicao):
+    """
+    Acrescenta as colunas do modo e da posição à frente de uma tabela.
+    """
+    tabela = tabela.reset_index()
+    tabela.insert(0, 'individual_position', posicao)
+    tabela.insert(0, 'game_mode', modo)
+    return tabela
+
+
+def _itens_da_fatia(indice_itens, tabela_nomes, campeoes, top):
+    """
+    Os 'top' itens de cada campeão da fatia (contagem e taxa de vitória),
+    com os nomes traduzidos de uma só vez para todos os campeões.
+    """
+    linhas = indice_itens.reset_index()
+    linhas = linhas[linhas['champion_name'].isin(campeoes)]
+    if linhas.empty:
+        return None
+    if tabela_nomes is not None:
+        linhas['item'] = resolver_nomes_itens(tabela_nomes, linhas['patch'].astype(str), linhas['item'])
+    linhas['champion_name'] = linhas['champion_name'].astype(str)
+    por_item = linhas.groupby(['champion_name', 'item'])[['contagem', 'vitorias']].sum().reset_index()
+    # Mesma ordem que itens.top_itens: contagem decrescente, empates pelo nome
+    por_item = por_item.sort_values(['champion_name', 'contagem', 'item'], ascending=[True, False, True])
+    por_item = por_item.groupby('champion_name', sort=False).head(top)
+    por_item['taxa_vitoria'] = (por_item['vitorias'] / por_item['contagem'] * 100).round(2)
+    return por_item.drop(columns='vitorias').set_index(['champion_name', 'item'])
+
+
+def _relatorio_fatia(tarefa):
+    """
+    Corre num processo filho: calcula as tabelas de um (modo, posição).
+
+    :return: {nome da tabela: DataFrame com as colunas do modo e da posição}
+    """
+    (modo, posicao), cubo, histograma_kda, indice_itens, opcoes = tarefa
+
+    # As métricas são sempre de toda a fatia; os campeões pedidos só
+    # filtram as tabelas por campeão. O impacto do ouro não tem mínimo
+    # de jogos, por isso sai mesmo sem nenhum campeão com 'min_jogos'.
+    metricas = metricas_da_tabela(fatia_cubo(cubo), opcoes['min_jogos'])
+    impacto = metricas['impacto_ouro']
+    impacto_ouro = pd.DataFrame({
+        'game_mode': [modo],
+        'individual_position': [posicao],
+        'jogos': [int(cubo['jogos'].sum())],
+        'ouro_derrota': [impacto.get('Derrota')],
+        'ouro_vitoria': [impacto.get('Vitória')],
+    })
+    if metricas['significancia'] is None:
+        return {'impacto_ouro': impacto_ouro}
+    campeoes = (metricas['significancia']
+                .join(metricas['kda'])
+                .join(metricas['ouro_medio'].rename('ouro_medio'))
+                .join(bootstrap_kda(fatia_histograma_kda(histograma_kda))))
+    if opcoes['campeoes'] is not None:
+        campeoes = campeoes[campeoes.index.isin(opcoes['campeoes'])]
+    tabelas = {}
+    if not campeoes.empty:
+        tabelas['campeoes'] = _com_fatia(campeoes.rename_axis('champion_name'), modo, posicao)
+    tabelas['impacto_ouro'] = impacto_ouro
+
+    if indice_itens is not None and not campeoes.empty:
+        itens = _itens_da_fatia(indice_itens, opcoes['tabela_nomes'], campeoes.index, opcoes['top_itens'])
+        if itens is not None:
+            tabelas['itens'] = _com_fatia(itens, modo, posicao)
+    return tabelas
+
+
+def _builds_campeao(tarefa):
+    """
+    Corre num processo filho: builds de um campeão num (modo, posição).
+    """
+    (modo, posicao, campeao), indice_builds, opcoes = tarefa
+    builds = minerar_builds(fatia_indice_builds(indice_builds, campeao), opcoes['tabela_nomes'],
+                            opcoes['suporte_minimo'], min_jogos=opcoes['min_jogos'], top=opcoes['top_builds'])
+    if builds is None:
+        return {}
+    return {'builds': _com_fatia(builds.assign(champion_name=campeao).set_index('champion_name'), modo, posicao)}
+
+
+# -------------------------------------------------------------------
+# FUNÇÕES PRINCIPAIS
+# -------------------------------------------------------------------
+def carregar_agregados(caminho, filtros_particao=None, max_processos=None):
+    """
+    Lê (ou constrói uma vez) os agregados de um ficheiro ou de uma pasta /
+    padrão glob de partições: (cubo, indice_itens, histograma_kda,
+    confrontos, indice_builds).
+    """
+    if e_particionado(caminho):
+        *agregados, _ = agregar_particoes(caminho, filtros_particao, max_processos)
+        return tuple(agregados)
+    return obter_agregados(caminho)
+
+
+def gerar_relatorios(agregados, modos=None, posicoes=None, campeoes=None, min_jogos=1,
+                     top_itens=TOP_ITENS, builds=False, suporte_minimo=0.01, top_builds=TOP_BUILDS,
+                     tabela_nomes=None, max_processos=None):
+    """
+    Calcula, para cada modo x posição (x campeão), as tabelas:
+      - 'campeoes':     jogos, taxa de vitória (+ IC 95% e ajustada), KDA
+                        (+ IC 95% por bootstrap) e ouro médio;
+      - 'impacto_ouro': ouro médio em derrotas e vitórias de cada fatia;
+      - 'itens':        os 'top_itens' itens de cada campeão;
+      - 'builds':       os 'top_builds' pares, trios e builds completas de
+                        cada campeão, cada um em pelo menos 'min_jogos'
+                        partidas (só com builds=True).
+
+    As fatias são repartidas por 'max_processos' processos (None = um por
+    núcleo; 1 = sem processos filhos).
+
+    :param agregados: Resultado de carregar_agregados.
+    :param modos, posicoes, campeoes: Listas para limitar o relatório (None = todos).
+                                      Com 'campeoes' só entram as fatias em que
+                                      algum deles joga, mas 'impacto_ouro' e as
+                                      taxas ajustadas continuam a ser de toda a fatia.
+    :return: {nome da tabela: DataFrame com todas as fatias}
+    """
+    cubo, indice_itens, histograma_kda, _, indice_builds = agregados
+    if campeoes is not None:
+        campeoes = set(campeoes)
+    cubos = _por_fatia(cubo)
+    histogramas = _por_fatia(histograma_kda)
+    indices_itens = _por_fatia(indice_itens)
+    indices_builds = _por_fatia(indice_builds) if builds else {}
+
+    opcoes = {'min_jogos': min_jogos, 'top_itens': top_itens, 'suporte_minimo': suporte_minimo,
+              'top_builds': top_builds, 'tabela_nomes': tabela_nomes, 'campeoes': campeoes}
+    chaves = [chave for chave in cubos
+              if (modos is None or chave[0] in modos) and (posicoes is None or chave[1] in posicoes)
+              and (campeoes is None or cubos[chave].index.get_level_values('champion_name').isin(campeoes).any())]
+    # O custo de uma fatia é quase todo o bootstrap, proporcional aos pares do histograma
+    tarefas = sorted(
+        ((chave, cubos[chave], histogramas.get(chave), indices_itens.get(chave), opcoes) for chave in chaves),
+        key=lambda tarefa: -(0 if tarefa[2] is None else len(tarefa[2])),
+    )
+
+    tarefas_builds = []
+    for chave in chaves:
+        if chave not in indices_builds:
+            continue
+        jogos = fatia_cubo(cubos[chave])['jogos']
+        relevantes = set(jogos.index[jogos >= min_jogos])
+        if campeoes is not None:
+            relevantes &= campeoes
+        for campeao, grupo in indices_builds[chave].groupby(level='champion_name', observed=True):
+            if campeao in relevantes:
+                tarefas_builds.append(((*chave, campeao), grupo, opcoes))
+    tarefas_builds.sort(key=lambda tarefa: -len(tarefa[1]))
+
+    with medir('gerar_relatorios', linhas_entrada=len(tarefas) + len(tarefas_builds)) as registo:
+        if len(tarefas) + len(tarefas_builds) <= 1 or max_processos == 1:
+            resultados = [_relatorio_fatia(t) for t in tarefas] + [_builds_campeao(t) for t in tarefas_builds]
+        else:
+            with ProcessPoolExecutor(max_workers=max_processos) as executor:
+                # As duas listas são submetidas logo e partilham os processos
+                fatias = executor.map(_relatorio_fatia, tarefas)
+                builds = executor.map(_builds_campeao, tarefas_builds, chunksize=4)
+                resultados = [*fatias, *builds]
+        registo['processos'] = max_processos or os.cpu_count()
+
+    tabelas = {}
+    for resultado in resultados:
+        for nome, tabela in resultado.items():
+            tabelas.setdefault(nome, []).append(tabela)
+    # Ordenadas por fatia; 'campeoes' mantém a classificação (limite inferior
+    # da taxa de vitória) e as outras ficam agrupadas por campeão
+    ordem = {nome: CHAVES_FATIA if nome in ('campeoes', 'impacto_ouro') else [*CHAVES_FATIA, 'champion_name']
+             for nome in tabelas}
+    return {nome: pd.concat(partes, ignore_index=True).sort_values(ordem[nome], kind='stable', ignore_index=True)
+            for nome, partes in tabelas.items()}
+
+
+def gravar_relatorios(tabelas, pasta, formatos=FORMATOS):
+    """
+    Grava cada tabela em '<pasta>/<nome>.<formato>'. Cada ficheiro é escrito
+    num temporário e trocado com os.replace (nunca fica um relatório a meio).
+
+    :return: Lista dos ficheiros gravados
+    """
+    os.makedirs(pasta, exist_ok=True)
+    gravados = []
+    for nome, tabela in tabelas.items():
+        # As categorias (modo, posição, ...) passam a texto em todos os formatos
+        tabela = tabela.astype({c: str for c in tabela.columns if isinstance(tabela[c].dtype, pd.CategoricalDtype)})
+        for formato in formatos:
+            if formato == 'parquet' and pyarrow is None:
+                print("Aviso: pyarrow não está instalado, os relatórios não são gravados em Parquet.")
+                continue
+            caminho = os.path.join(pasta, f"{nome}.{formato}")
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            if formato == 'parquet':
+                tabela.to_parquet(temporario, index=False)
+            elif formato == 'csv':
+                tabela.to_csv(temporario, index=False)
+            else:
+                tabela.to_json(temporario, orient='records', force_ascii=False)
+            os.replace(temporario, caminho)
+            gravados.append(caminho)
+    return gravados
+
+
+def tabela_nomes_dos_agregados(indice_itens):
+    """
+    Catálogo dos nomes dos itens para os patches presentes no índice de
+    itens, ou None (os relatórios ficam com os IDs) se não houver rede nem cópia.
+    """
+    if indice_itens is None or indice_itens.empty:
+        return None
+    patches = sorted(indice_itens.index.get_level_values('patch').unique().astype(str))
+    try:
+        return construir_tabela_nomes(patches)
+    except Exception as e:
+        print(f"Aviso: não foi possível obter os nomes dos itens ({e}). Os relatórios mostram os IDs.")
+        return None
@@ -0,0 +1,172 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+from .instrumentacao import contar
+
+# -------------------------------------------------------------------
+# CACHE DE RESULTADOS EM DISCO (partilhada entre processos e reinícios)
+# -------------------------------------------------------------------
+
+# Cada resultado fica num ficheiro '<chave>.pkl', em que a chave é o
+# SHA-256 do nome do resultado, dos parâmetros, da impressão dos dados e
+# da versão do código (nucleo_lol). Resultados iguais têm sempre a mesma
+# chave, por isso vários processos (workers do Streamlit, o script) podem
+# partilhar a pasta e nunca é preciso invalidar nada: dados ou código
+# novos dão chaves novas e as antigas acabam por ser apagadas pelo LRU.
+PASTA_RESULTADOS = os.environ.get(
+    'LOL_RESULTADOS_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'analise_lol', 'resultados'),
+)
+
+# Tamanho máximo da pasta; passando este limite são apagados os
+# resultados usados há mais tempo. 0 desativa a cache.
+TAMANHO_MAXIMO_MB = float(os.environ.get('LOL_RESULTADOS_MB', 512))
+
+EXTENSAO = '.pkl'
+
+_versao_codigo = None
+
+
+def versao_codigo():
+    """
+    Hash do código-fonte de nucleo_lol: muda sempre que um ficheiro do
+    núcleo muda, e com ele todas as chaves.
+    """
+    global _versao_codigo
+    if _versao_codigo is None:
+        sha = hashlib.sha256()
+        for caminho in sorted(glob.glob(os.path.join(os.path.dirname(__file__), '*.py'))):
+            with open(caminho, 'rb') as f:
+                sha.update(os.path.basename(caminho).encode())
+                sha.update(f.read())
+        _versao_codigo = sha.hexdigest()
+    return _versao_codigo
+
+
+def impressao_dados(assinatura):
+    """
+    Resume a assinatura dos dados (particoes.assinatura_dados: ficheiro,
+    tamanho e data de cada partição) num hash curto.
+    """
+    return hashlib.sha256(json.dumps(list(assinatura), default=str).encode()).hexdigest()
+
+
+def chave_resultado(nome, *partes):
+    """
+    Chave de um resultado: SHA-256 do nome, das 'partes' (impressão dos
+    dados, filtros, parâmetros) e da versão do código.
+    """
+    conteudo = json.dumps([nome, versao_codigo(), *partes], default=str, sort_keys=True)
+    return hashlib.sha256(conteudo.encode()).hexdigest()
+
+
+def _caminho(chave, pasta):
+    return os.path.join(pasta, chave + EXTENSAO)
+
+
+# -------------------------------------------------------------------
+# LEITURA, ESCRITA E LIMPEZA (LRU)
+# -------------------------------------------------------------------
+def ler_resultado(chave, pasta=PASTA_RESULTADOS, contador='cache_resultados'):
+    """
+    Devolve (True, resultado) se a chave estiver em cache ou (False, None).
+    Cada leitura renova a data do ficheiro, que é a ordem usada pelo LRU.
+    Os acertos e falhas são somados a 'contador' (nucleo_lol.instrumentacao).
+    """
+    if TAMANHO_MAXIMO_MB <= 0:
+        return False, None
+    caminho = _caminho(chave, pasta)
+    try:
+        with open(caminho, 'rb') as f:
+            resultado = pickle.load(f)
+    except FileNotFoundError:
+        contar(contador, 'falha')
+        return False, None
+    except Exception as e:  # Ficheiro estragado ou de outra versão do pandas
+        contar(contador, 'falha')
+        print(f"Aviso: resultado em cache ilegível ({e}). A recalcular.")
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+        return False, None
+    contar(contador, 'acerto')
+    try:
+        os.utime(caminho)
+    except OSError:
+        pass
+    return True, resultado
+
+
+def gravar_resultado(chave, resultado, pasta=PASTA_RESULTADOS):
+    """
+    Grava um resultado num ficheiro temporário e publica-o com os.replace,
+    por isso quem lê nunca vê um ficheiro a meio. Se dois processos gravarem
+    a mesma chave ao mesmo tempo, o conteúdo é igual e fica um deles.
+    """
+    if TAMANHO_MAXIMO_MB <= 0:
+        return
+    caminho = _caminho(chave, pasta)
+    temporario = f"{caminho}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(pasta, exist_ok=True)
+        with open(temporario, 'wb') as f:
+            pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, caminho)
+    except Exception as e:
+        print(f"Aviso: não foi possível gravar o resultado em cache ({e}).")
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+        return
+    limpar_resultados(pasta)
+
+
+def limpar_resultados(pasta=PASTA_RESULTADOS, tamanho_maximo_mb=None):
+    """
+    Apaga os resultados usados há mais tempo até a pasta caber no limite.
+    Ficheiros que outro processo apague (ou tenha abertos) são ignorados.
+    """
+    limite = (TAMANHO_MAXIMO_MB if tamanho_maximo_mb is None else tamanho_maximo_mb) * 1024 * 1024
+    try:
+        entradas = [e for e in os.scandir(pasta) if e.name.endswith(EXTENSAO)]
+    except OSError:
+        return
+    ficheiros = []
+    for entrada in entradas:
+        try:
+            estado = entrada.stat()
+        except OSError:
+            continue
+        ficheiros.append((estado.st_mtime_ns, estado.st_size, entrada.path))
+    total = sum(tamanho for _, tamanho, _ in ficheiros)
+    for _, tamanho, caminho in sorted(ficheiros):
+        if total <= limite:
+            break
+        try:
+            os.remove(caminho)
+        except OSError:
+            continue
+        total -= tamanho
+
+
+# -------------------------------------------------------------------
+# FUNÇÃO PRINCIPAL
+# -------------------------------------------------------------------
+def resultado_em_cache(chave, calcular, pasta=PASTA_RESULTADOS, contador='cache_resultados'):
+    """
+    Devolve o resultado guardado com esta chave ou, se não existir,
+    chama calcular(), grava o resultado e devolve-o.
+    Resultados None (ex: fatia sem dados) também ficam em cache.
+    """
+    encontrado, resultado = ler_resultado(chave, pasta, contador)
+    if encontrado:
+        return resultado
+    resultado = calcular()
+    gravar_resultado(chave, resultado, pasta)
+    return resultado
@@ -0,0 +1,128 @@
+import pandas as pd
+
+try:
+    import pyarrow.dataset as ds
+except ImportError:  # Sem pyarrow só o CSV pode ser lido em blocos
+    ds = None
+
+from .builds import combinar_indices_builds, construir_indice_builds
+from .cache import COLUNAS_ANALISE, caminho_parquet, carregar_dados_com_cache
+from .cubo import (
+    combinar_cubos,
+    combinar_histogramas_kda,
+    construir_cubo,
+    construir_histograma_kda,
+)
+from .esquema import aplicar_esquema
+from .itens import combinar_indices_itens, construir_indice_itens
+
+# -------------------------------------------------------------------
+# ANÁLISE EM BLOCOS (ficheiros maiores do que a memória)
+# -------------------------------------------------------------------
+
+# Nº de linhas lidas de cada vez; a memória usada é proporcional a isto
+TAMANHO_BLOCO = 250_000
+
+# Os resultados de cada bloco ficam numa lista e só são combinados no
+# fim; com mais do que isto na lista, são combinados num só (a memória
+# não cresce com o nº de blocos e cada combinação é feita poucas vezes)
+MAX_PARCIAIS = 64
+
+
+def _filtro_pandas(bloco, filtros):
+    mascara = pd.Series(True, index=bloco.index)
+    for coluna, valor in filtros.items():
+        mascara &= bloco[coluna] == valor
+    return bloco[mascara.to_numpy()]
+
+
+def _blocos_csv(caminho, colunas, filtros, tamanho_bloco):
+    """
+    O CSV não tem estatísticas, por isso o filtro é aplicado a cada
+    bloco logo depois de ser lido (antes de qualquer outro cálculo).
+    """
+    conjunto = set(colunas)
+    leitor = pd.read_csv(caminho, usecols=lambda coluna: coluna in conjunto, chunksize=tamanho_bloco)
+    for bloco in leitor:
+        yield _filtro_pandas(bloco, filtros)
+
+
+def _blocos_parquet(caminho, colunas, filtros, tamanho_bloco):
+    """
+    No Parquet o filtro é passado ao leitor (predicate pushdown): os
+    row groups cujas estatísticas excluem o modo/posição nem são lidos,
+    e só as colunas pedidas são descodificadas.
+    """
+    dataset = ds.dataset(caminho, format='parquet')
+    existentes = set(dataset.schema.names)
+    expressao = None
+    for coluna, valor in filtros.items():
+        condicao = ds.field(coluna) == valor
+        expressao = condicao if expressao is None else expressao & condicao
+
+    for lote in dataset.to_batches(columns=[c for c in colunas if c in existentes],
+                                   filter=expressao, batch_size=tamanho_bloco):
+        yield lote.to_pandas()
+
+
+def ler_em_blocos(caminho_do_ficheiro, filtros, colunas=COLUNAS_ANALISE, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Lê o ficheiro de dados em blocos de 'tamanho_bloco' linhas, já
+    filtrados por 'filtros' ({coluna: valor}, ex: {'game_mode': 'CLASSIC'}).
+
+    Um .xlsx (no máximo ~1 milhão de linhas) é primeiro convertido
+    para a cache Parquet e depois lido em blocos a partir dela.
+    """
+    if caminho_do_ficheiro.endswith('.csv'):
+        yield from _blocos_csv(caminho_do_ficheiro, colunas, filtros, tamanho_bloco)
+        return
+
+    if ds is None:
+        print("Aviso: pyarrow não está instalado, o ficheiro vai ser lido de uma só vez.")
+        yield _filtro_pandas(carregar_dados_com_cache(caminho_do_ficheiro, colunas), filtros)
+        return
+
+    parquet = caminho_parquet(caminho_do_ficheiro)
+    if parquet is None:
+        # Sem cache (dados que o Parquet não aceita) o .xlsx é lido de uma só vez
+        yield _filtro_pandas(carregar_dados_com_cache(caminho_do_ficheiro, colunas), filtros)
+        return
+    yield from _blocos_parquet(parquet, colunas, filtros, tamanho_bloco)
+
+
+def _acumular(parciais, parcial, combinar):
+    parciais.append(parcial)
+    if len(parciais) >= MAX_PARCIAIS:
+        parciais[:] = [combinar(parciais)]
+
+
+def agregar_em_blocos(caminho_do_ficheiro, filtros, tamanho_bloco=TAMANHO_BLOCO, campeoes_builds=None):
+    """
+    Percorre o ficheiro em blocos e junta cada bloco aos acumuladores:
+    o cubo (taxa de vitória, KDA, ouro), o índice de itens, o
+    histograma de KDA e o índice de builds.
+
+    Os acumuladores só guardam somas e contagens, por isso o resultado
+    é exatamente igual ao da análise com o ficheiro todo em memória, e
+    a memória usada depende do tamanho do bloco e não do ficheiro.
+    O índice de builds tem quase uma linha por partida, por isso só é
+    guardado para os campeões de 'campeoes_builds' (None = nenhum).
+
+    :return: (cubo, indice_itens, histograma_kda, indice_builds,
+             nº de linhas que passaram o filtro)
+    """
+    cubos, indices_itens, histogramas_kda, indices_builds = [], [], [], []
+    linhas = 0
+    for bloco in ler_em_blocos(caminho_do_ficheiro, filtros, tamanho_bloco=tamanho_bloco):
+        if bloco.empty:
+            continue
+        bloco = aplicar_esquema(bloco, mostrar_relatorio=False)
+        linhas += len(bloco)
+        _acumular(cubos, construir_cubo(bloco), combinar_cubos)
+        _acumular(indices_itens, construir_indice_itens(bloco), combinar_indices_itens)
+        _acumular(histogramas_kda, construir_histograma_kda(bloco), combinar_histogramas_kda)
+        if campeoes_builds:
+            do_campeao = bloco[bloco['champion_name'].isin(campeoes_builds).to_numpy()]
+            _acumular(indices_builds, construir_indice_builds(do_campeao), combinar_indices_builds)
+    return (combinar_cubos(cubos), combinar_indices_itens(indices_itens),
+            combinar_histogramas_kda(histogramas_kda), combinar_indices_builds(indices_builds), linhas)
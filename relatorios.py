@@ -0,0 +1,121 @@
+"""
+Relatórios em lote: todas as combinações de modo x posição x campeão
+numa só execução (em vez de correr o analise_lol.py uma vez por
+MODO_ESCOLHIDO / POSICAO_ESCOLHIDA / CAMPEAO_PARA_ANALISAR).
+
+Os dados são lidos uma só vez (agregados em cache, nucleo_lol.incremental)
+e as fatias são calculadas em paralelo, um processo por núcleo. Gera, na
+pasta de saída, um ficheiro por tabela e formato:
+  - campeoes:     jogos, taxa de vitória (+ IC 95% e ajustada), KDA
+                  (+ IC 95%) e ouro médio de cada campeão em cada fatia;
+  - impacto_ouro: ouro médio em derrotas e vitórias de cada fatia;
+  - itens:        os itens mais usados de cada campeão em cada fatia;
+  - builds:       pares, trios e builds completas (só com --builds).
+
+Exemplos:
+    py relatorios.py partidas.csv
+    py relatorios.py dados/ --saida tier_lists --formatos parquet csv --min-jogos 50
+    py relatorios.py partidas.parquet --modos CLASSIC --posicoes BOTTOM UTILITY --builds
+    py relatorios.py 'dados/*.csv' --filtros-particao region=EUW --processos 4
+"""
+import argparse
+import time
+
+from nucleo_lol.instrumentacao import ativar_logs_json, medir, perfil, resumo_json
+from nucleo_lol.relatorios import (
+    FORMATOS,
+    TOP_BUILDS,
+    TOP_ITENS,
+    carregar_agregados,
+    gerar_relatorios,
+    gravar_relatorios,
+    tabela_nomes_dos_agregados,
+)
+
+PASTA_SAIDA = 'relatorios'
+MIN_JOGOS = 20
+
+
+def _filtro_particao(par):
+    """
+    'region=EUW' -> ('region', 'EUW')
+    """
+    chave, separador, valor = par.partition('=')
+    if not separador or not chave:
+        raise argparse.ArgumentTypeError(f"filtro inválido '{par}' (esperado chave=valor)")
+    return chave, valor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera os relatórios de todos os modos, posições e campeões.")
+    parser.add_argument('caminho', help="Ficheiro de dados (.csv, .xlsx, .parquet), pasta ou padrão glob.")
+    parser.add_argument('--saida', default=PASTA_SAIDA, help="Pasta onde gravar os relatórios.")
+    parser.add_argument('--formatos', nargs='+', choices=FORMATOS, default=list(FORMATOS))
+    parser.add_argument('--min-jogos', type=int, default=MIN_JOGOS,
+                        help="Jogos mínimos de um campeão numa fatia para entrar nos relatórios.")
+    parser.add_argument('--top-itens', type=int, default=TOP_ITENS, help="Nº de itens por campeão.")
+    parser.add_argument('--processos', type=int,
+                        help="Nº de processos (por omissão, um por núcleo; 1 = sem paralelismo).")
+    parser.add_argument('--modos', nargs='+', help="Só estes modos (ex: CLASSIC ARAM).")
+    parser.add_argument('--posicoes', nargs='+', help="Só estas posições (ex: BOTTOM UTILITY).")
+    parser.add_argument('--campeoes', nargs='+', help="Só estes campeões.")
+    parser.add_argument('--builds', action='store_true',
+                        help="Inclui os pares, trios e builds completas (mais lento).")
+    parser.add_argument('--suporte-minimo', type=float, default=0.01,
+                        help="Suporte mínimo das builds (fração das partidas ou nº de partidas; "
+                             "nunca menos do que --min-jogos).")
+    parser.add_argument('--top-builds', type=int, default=TOP_BUILDS,
+                        help="Nº de pares, trios e builds completas por campeão.")
+    parser.add_argument('--filtros-particao', nargs='+', type=_filtro_particao, metavar='CHAVE=VALOR',
+                        help="Só lê as partições com estes atributos no nome (ex: region=EUW).")
+    parser.add_argument('--sem-nomes', action='store_true',
+                        help="Não vai buscar os nomes dos itens (os relatórios ficam com os IDs).")
+    parser.add_argument('--logs-json', metavar='FICHEIRO',
+                        help="Escreve os tempos de cada etapa em JSON neste ficheiro ('1' = stderr; "
+                             "por omissão usa LOL_LOGS_JSON e, sem ela, não escreve).")
+    args = parser.parse_args()
+    ativar_logs_json(args.logs_json)
+
+    filtros_particao = {}
+    for chave, valor in args.filtros_particao or []:
+        filtros_particao.setdefault(chave, []).append(valor)
+
+    inicio = time.perf_counter()
+    with medir('carregar_agregados'):
+        agregados = carregar_agregados(args.caminho, filtros_particao, args.processos)
+    if agregados[0] is None:
+        print("Erro: Nenhum ficheiro de dados encontrado (ou todos excluídos pelos filtros).")
+        return
+
+    tabela_nomes = None if args.sem_nomes else tabela_nomes_dos_agregados(agregados[1])
+
+    tabelas = gerar_relatorios(
+        agregados,
+        modos=args.modos,
+        posicoes=args.posicoes,
+        campeoes=args.campeoes,
+        min_jogos=args.min_jogos,
+        top_itens=args.top_itens,
+        builds=args.builds,
+        suporte_minimo=args.suporte_minimo,
+        top_builds=args.top_builds,
+        tabela_nomes=tabela_nomes,
+        max_processos=args.processos,
+    )
+    if not tabelas:
+        print("Nenhuma fatia com campeões suficientes para gerar relatórios.")
+        return
+
+    with medir('gravar_relatorios'):
+        gravados = gravar_relatorios(tabelas, args.saida, args.formatos)
+    for nome, tabela in tabelas.items():
+        print(f"{nome}: {len(tabela)} linhas")
+    print(f"{len(gravados)} ficheiros gravados em '{args.saida}' ({time.perf_counter() - inicio:.1f} s).")
+
+
+# Os processos filhos voltam a importar este ficheiro no Windows;
+# os relatórios só correm no processo principal
+if __name__ == '__main__':
+    with perfil():
+        main()
+    resumo_json()
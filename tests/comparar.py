@@ -0,0 +1,19 @@
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+
+def normalizar(tabela):
+    """
+    Agregado -> DataFrame sem índice, chaves em texto e linhas por ordem,
+    para comparar resultados calculados por caminhos diferentes (as
+    categorias e a ordem das linhas podem variar).
+    """
+    tabela = tabela.reset_index()
+    for coluna in tabela.columns:
+        if isinstance(tabela[coluna].dtype, pd.CategoricalDtype) or tabela[coluna].dtype == object:
+            tabela[coluna] = tabela[coluna].astype(str)
+    return tabela.sort_values(list(tabela.columns)).reset_index(drop=True)
+
+
+def assert_agregados_iguais(obtido, esperado):
+    assert_frame_equal(normalizar(obtido), normalizar(esperado), check_dtype=False)
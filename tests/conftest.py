@@ -0,0 +1,23 @@
+import pytest
+
+from benchmarks.dados_sinteticos import gerar_partidas
+
+# -------------------------------------------------------------------
+# DADOS SINTÉTICOS PARTILHADOS PELOS TESTES
+# -------------------------------------------------------------------
+
+# Poucas linhas (2 000 partidas), mas com todos os modos e posições
+LINHAS_SINTETICAS = 20_000
+
+
+@pytest.fixture(scope='session')
+def partidas_base():
+    return gerar_partidas(LINHAS_SINTETICAS, semente=42)
+
+
+@pytest.fixture
+def partidas(partidas_base):
+    """
+    Cópia das partidas sintéticas (cada teste pode alterá-la).
+    """
+    return partidas_base.copy()
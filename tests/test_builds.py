@@ -0,0 +1,82 @@
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nucleo_lol import builds
+from nucleo_lol.builds import (COLUNAS_CHAVE_BUILD, NOME_BUILD_COMPLETA, construir_indice_builds,
+                               fatia_indice_builds, minerar_builds)
+from nucleo_lol.esquema import aplicar_esquema
+
+SUPORTE = 3
+
+
+# -------------------------------------------------------------------
+# CONTAGEM INGÉNUA (um Counter por tipo de conjunto)
+# -------------------------------------------------------------------
+def _minerar_ingenuo(fatia, suporte):
+    contagens = {'Pares': Counter(), 'Trios': Counter(), NOME_BUILD_COMPLETA: Counter()}
+    ids = fatia.index.to_frame(index=False)[COLUNAS_CHAVE_BUILD].to_numpy()
+    for linha, jogos, vitorias in zip(ids, fatia['jogos'], fatia['vitorias']):
+        itens = sorted(str(i) for i in linha if i > 0)
+        conjuntos = [(NOME_BUILD_COMPLETA, tuple(itens))] if len(itens) == 6 else []
+        distintos = sorted(set(itens))
+        for tipo, tamanho in (('Pares', 2), ('Trios', 3)):
+            conjuntos += [(tipo, c) for c in combinations(distintos, tamanho)]
+        for tipo, conjunto in conjuntos:
+            contagens[tipo][conjunto] += np.array([jogos, vitorias])
+    linhas = [(tipo, ' + '.join(conjunto), int(c[0]), int(c[1]))
+              for tipo, contagem in contagens.items() for conjunto, c in contagem.items() if c[0] >= suporte]
+    return pd.DataFrame(linhas, columns=['tipo', 'itens', 'jogos', 'vitorias'])
+
+
+def _comparavel(tabela):
+    tabela = tabela.assign(tipo=tabela['tipo'].astype(str))
+    tabela = tabela.assign(itens=tabela['itens'].astype(str))
+    return tabela[['tipo', 'itens', 'jogos']].sort_values(['tipo', 'itens'], ignore_index=True)
+
+
+@pytest.fixture
+def fatia_vocabulario_grande():
+    """
+    1 500 itens distintos: 1 501**6 já não cabe em int64, por isso as
+    builds completas não podem ser empacotadas numa chave inteira.
+    """
+    rng = np.random.default_rng(7)
+    comuns = np.arange(9000, 9020)
+    raros = np.arange(5000, 6480)
+    linhas = [np.sort(np.concatenate([rng.choice(comuns, 4, replace=False), raros[[i, i + 1]]]))
+              for i in range(0, len(raros) - 1)]
+    # Algumas builds repetidas, com itens raros, para haver builds completas frequentes
+    linhas += [linhas[-1]] * 3 + [linhas[-2]] * 4
+    ids = np.array(linhas)
+    indice = pd.MultiIndex.from_arrays([['14.1'] * len(ids), *ids.T], names=['patch', *COLUNAS_CHAVE_BUILD])
+    return pd.DataFrame({'jogos': 1, 'vitorias': rng.integers(0, 2, len(ids))}, index=indice)
+
+
+# -------------------------------------------------------------------
+# TESTES
+# -------------------------------------------------------------------
+def test_vocabulario_grande_nao_transborda(fatia_vocabulario_grande):
+    nomes = set(np.unique(fatia_vocabulario_grande.index.to_frame()[COLUNAS_CHAVE_BUILD]))
+    assert not builds._cabe_em_int64(len(nomes) + 1, 6)
+
+    obtido = minerar_builds(fatia_vocabulario_grande, suporte_minimo=SUPORTE)
+    esperado = _minerar_ingenuo(fatia_vocabulario_grande, SUPORTE)
+
+    assert (obtido['tipo'] == NOME_BUILD_COMPLETA).sum() == 2
+    assert_frame_equal(_comparavel(obtido), _comparavel(esperado))
+
+
+def test_chaves_por_empacotar_dao_o_mesmo_resultado(partidas, monkeypatch):
+    indice = construir_indice_builds(aplicar_esquema(partidas))
+    campeao = indice.index.get_level_values('champion_name')[0]
+    fatia = fatia_indice_builds(indice, campeao)
+    empacotado = minerar_builds(fatia, suporte_minimo=SUPORTE)
+
+    monkeypatch.setattr(builds, '_cabe_em_int64', lambda base, tamanho: False)
+    assert_frame_equal(minerar_builds(fatia, suporte_minimo=SUPORTE), empacotado)
+    assert_frame_equal(_comparavel(empacotado), _comparavel(_minerar_ingenuo(fatia, SUPORTE)))
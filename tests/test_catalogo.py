@@ -0,0 +1,206 @@
+import importlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# -------------------------------------------------------------------
+# SERVIDOR LOCAL QUE FAZ DE DATA DRAGON
+# -------------------------------------------------------------------
+ETAG = '"v1"'
+LAST_MODIFIED = 'Mon, 06 Jan 2025 10:00:00 GMT'
+
+
+class DataDragonFalso(BaseHTTPRequestHandler):
+    """
+    Serve /api/versions.json (com ETag / 304) e /cdn/<versão>/data/en_US/item.json
+    a partir de 'estado' e regista os pedidos recebidos.
+    """
+    estado = None
+
+    def do_GET(self):
+        estado = self.estado
+        estado['pedidos'].append((self.path, dict(self.headers)))
+        if self.path == '/api/versions.json':
+            if estado.get('erro'):
+                self.send_response(estado['erro'])
+                self.end_headers()
+                return
+            if self.headers.get('If-None-Match') == estado['etag']:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self._responder(estado['versoes'], {'ETag': estado['etag'], 'Last-Modified': LAST_MODIFIED})
+            return
+        partes = self.path.strip('/').split('/')
+        if len(partes) == 5 and partes[0] == 'cdn' and partes[1] in estado['versoes']:
+            versao = partes[1]
+            self._responder({'data': {'1001': {'name': f'Botas {versao}'}, '3006': {'name': 'Grevas'}}})
+            return
+        self.send_response(404)
+        self.end_headers()
+
+    def _responder(self, dados, cabecalhos=None):
+        corpo = json.dumps(dados).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(corpo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    estado = {'versoes': ['14.2.1', '14.1.1'], 'etag': ETAG, 'pedidos': []}
+    manipulador = type('Manipulador', (DataDragonFalso,), {'estado': estado})
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), manipulador)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    estado['url'] = f"http://127.0.0.1:{httpd.server_address[1]}"
+    estado['parar'] = lambda: (httpd.shutdown(), httpd.server_close())
+    yield estado
+    if thread.is_alive():
+        estado['parar']()
+
+
+@pytest.fixture
+def catalogo(servidor, tmp_path, monkeypatch):
+    """
+    nucleo_lol.catalogo recarregado com LOL_DDRAGON_URL a apontar para o
+    servidor local e as pastas de cache dentro de tmp_path.
+    """
+    monkeypatch.setenv('LOL_DDRAGON_URL', servidor['url'])
+    monkeypatch.setenv('LOL_CATALOGO_DIR', str(tmp_path / 'ddragon'))
+    monkeypatch.setenv('LOL_RESULTADOS_DIR', str(tmp_path / 'resultados'))
+    from nucleo_lol import catalogo, resultados
+    importlib.reload(resultados)
+    modulo = importlib.reload(catalogo)
+    monkeypatch.setattr(modulo, 'PASTA_CATALOGO_INCLUIDO', str(tmp_path / 'incluido'))
+    yield modulo
+    monkeypatch.undo()
+    importlib.reload(resultados)
+    importlib.reload(catalogo)
+
+
+def _pedidos(servidor, caminho):
+    return [cabecalhos for pedido, cabecalhos in servidor['pedidos'] if pedido == caminho]
+
+
+def _eventos_versoes():
+    from nucleo_lol.instrumentacao import contadores
+    return dict(contadores().get('catalogo_versoes', {}))
+
+
+def _expirar_versoes(catalogo):
+    caminho = os.path.join(catalogo.PASTA_CATALOGO, 'versions.json')
+    with open(caminho, encoding='utf-8') as f:
+        guardado = json.load(f)
+    guardado['obtido_em'] -= catalogo.TTL_VERSOES_SEGUNDOS + 1
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(guardado, f)
+    return caminho
+
+
+# -------------------------------------------------------------------
+# TESTES
+# -------------------------------------------------------------------
+def test_usa_o_servidor_de_lol_ddragon_url(catalogo, servidor):
+    assert catalogo.URL_BASE_DDRAGON == servidor['url']
+    assert catalogo.obter_versoes() == ['14.2.1', '14.1.1']
+    assert len(_pedidos(servidor, '/api/versions.json')) == 1
+
+
+def test_dentro_do_ttl_nao_vai_a_rede(catalogo, servidor):
+    catalogo.obter_versoes()
+    assert catalogo.obter_versoes() == ['14.2.1', '14.1.1']
+    assert len(_pedidos(servidor, '/api/versions.json')) == 1
+
+
+def test_depois_do_ttl_revalida_com_etag_e_304(catalogo, servidor):
+    catalogo.obter_versoes()
+    caminho = _expirar_versoes(catalogo)
+    antes = _eventos_versoes()
+
+    assert catalogo.obter_versoes() == ['14.2.1', '14.1.1']
+    depois = _eventos_versoes()
+    # O 304 conta só como revalidação, não como falha
+    assert depois.get('revalidado', 0) == antes.get('revalidado', 0) + 1
+    assert depois.get('falha', 0) == antes.get('falha', 0)
+    cabecalhos = _pedidos(servidor, '/api/versions.json')[-1]
+    assert cabecalhos['If-None-Match'] == ETAG
+    assert cabecalhos['If-Modified-Since'] == LAST_MODIFIED
+    with open(caminho, encoding='utf-8') as f:
+        guardado = json.load(f)
+    # O 304 só renova a data: volta a valer durante o TTL
+    assert guardado['etag'] == ETAG
+    catalogo.obter_versoes()
+    assert len(_pedidos(servidor, '/api/versions.json')) == 2
+
+
+def test_depois_do_ttl_descarrega_a_lista_nova(catalogo, servidor):
+    catalogo.obter_versoes()
+    _expirar_versoes(catalogo)
+    servidor['versoes'] = ['14.3.1', *servidor['versoes']]
+    servidor['etag'] = '"v2"'
+
+    assert catalogo.obter_versoes()[0] == '14.3.1'
+
+
+def test_erro_do_servidor_nao_conta_como_descarga(catalogo, servidor):
+    catalogo.obter_versoes()
+    _expirar_versoes(catalogo)
+    servidor['erro'] = 500
+    antes = _eventos_versoes()
+
+    # Usa a lista em disco e só as descargas bem-sucedidas contam como 'falha' da cache
+    assert catalogo.obter_versoes() == ['14.2.1', '14.1.1']
+    assert _eventos_versoes().get('falha', 0) == antes.get('falha', 0)
+
+
+def test_catalogo_de_uma_versao_so_e_descarregado_uma_vez(catalogo, servidor):
+    itens, versao = catalogo.carregar_catalogo_itens('14.1.1')
+    assert versao == '14.1.1'
+    assert itens == {1001: 'Botas 14.1.1', 3006: 'Grevas'}
+
+    assert catalogo.carregar_catalogo_itens('14.1.1') == (itens, versao)
+    assert len(_pedidos(servidor, '/cdn/14.1.1/data/en_US/item.json')) == 1
+
+
+def test_sem_rede_usa_o_que_esta_em_disco(catalogo, servidor):
+    tabela = catalogo.construir_tabela_nomes(['14.1'])
+    nomes = catalogo.resolver_nomes_itens(tabela, ['14.1'], [1001])
+    assert list(nomes) == ['Botas 14.1.1']
+
+    servidor['parar']()
+    _expirar_versoes(catalogo)
+
+    # Lista de versões antiga, mas ainda usável
+    assert catalogo.obter_versoes() == ['14.2.1', '14.1.1']
+    # A tabela do patch já visto sai da cache, sem rede
+    tabela = catalogo.construir_tabela_nomes(['14.1'])
+    assert list(catalogo.resolver_nomes_itens(tabela, ['14.1'], [1001])) == ['Botas 14.1.1']
+    # Um patch nunca descarregado usa a versão mais recente em disco
+    itens, versao = catalogo.carregar_catalogo_itens('14.2.1')
+    assert versao == '14.1.1'
+    assert itens[1001] == 'Botas 14.1.1'
+
+
+def test_sem_rede_e_sem_lista_usa_as_versoes_em_disco(catalogo, servidor):
+    catalogo.carregar_catalogo_itens('14.1.1')
+    servidor['parar']()
+    assert not os.path.exists(os.path.join(catalogo.PASTA_CATALOGO, 'versions.json'))
+
+    assert catalogo.obter_versoes() == ['14.1.1']
+
+
+def test_primeira_execucao_sem_rede_falha(catalogo, servidor):
+    servidor['parar']()
+    with pytest.raises(catalogo.requests.RequestException):
+        catalogo.obter_versoes()
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from nucleo_lol.confrontos import (
+    CHAVES_CONFRONTOS,
+    DUPLA,
+    POSICOES_SEM_ROTA,
+    _pares,
+    combinar_confrontos,
+    construir_confrontos,
+    separar_ultima_partida,
+)
+from nucleo_lol.esquema import aplicar_esquema
+
+from .comparar import assert_agregados_iguais
+
+
+# -------------------------------------------------------------------
+# CONFRONTOS POR MERGE (a forma direta, com self-join por partida)
+# -------------------------------------------------------------------
+def _confrontos_por_merge(df):
+    df = df[~df['individual_position'].isin(POSICOES_SEM_ROTA)]
+    colunas = ['match_id', 'game_mode', 'individual_position', 'champion_name', 'win']
+    df = df[colunas].astype({'match_id': str, 'game_mode': str, 'individual_position': str, 'champion_name': str})
+
+    contra = df.merge(df, on=['match_id', 'individual_position'], suffixes=('', '_outro'))
+    contra = contra[contra['win'] != contra['win_outro']].assign(relacao='contra')
+
+    dupla = df[df['individual_position'].isin(DUPLA)]
+    com = dupla.merge(dupla, on=['match_id', 'win'], suffixes=('', '_outro'))
+    com = com[com['individual_position'] != com['individual_position_outro']].assign(relacao='com')
+
+    pares = pd.concat([contra, com], ignore_index=True).rename(columns={'champion_name_outro': 'outro_campeao'})
+    agrupado = pares.assign(win=pares['win'].astype('int64')).groupby(CHAVES_CONFRONTOS)['win']
+    return pd.DataFrame({'jogos': agrupado.size(), 'vitorias': agrupado.sum()})
+
+
+# -------------------------------------------------------------------
+# TESTES
+# -------------------------------------------------------------------
+def test_pares_igual_a_procurar_os_grupos_de_dois():
+    rng = np.random.default_rng(42)
+    grupo = rng.integers(0, 300, size=1_000)
+    ordem_no_grupo = rng.permutation(len(grupo))
+
+    a, b = _pares(grupo, ordem_no_grupo)
+
+    esperado = set()
+    for valor in np.unique(grupo):
+        linhas = np.flatnonzero(grupo == valor)
+        if len(linhas) == 2:
+            primeira, segunda = sorted(linhas, key=lambda linha: ordem_no_grupo[linha])
+            esperado.add((primeira, segunda))
+    assert set(zip(a.tolist(), b.tolist())) == esperado
+
+
+def test_confrontos_igual_ao_merge(partidas):
+    df = aplicar_esquema(partidas, mostrar_relatorio=False)
+
+    assert_agregados_iguais(construir_confrontos(df), _confrontos_por_merge(partidas))
+
+
+def test_partida_cortada_entre_blocos_e_emparelhada_no_fim(partidas):
+    df = aplicar_esquema(partidas, mostrar_relatorio=False)
+    parciais, pendentes = [], None
+    for inicio in range(0, len(df), 3_333):
+        bloco = df.iloc[inicio:inicio + 3_333]
+        completas, pendentes = separar_ultima_partida(
+            bloco if pendentes is None else pd.concat([pendentes, bloco], ignore_index=True))
+        parciais.append(construir_confrontos(completas))
+    parciais.append(construir_confrontos(pendentes))
+
+    assert_agregados_iguais(combinar_confrontos(parciais), construir_confrontos(df))
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from nucleo_lol.esquema import aplicar_esquema, relatorio_memoria
+
+
+# -------------------------------------------------------------------
+# TESTES
+# -------------------------------------------------------------------
+def test_win_em_falta_nao_conta_como_vitoria(capsys):
+    df = pd.DataFrame({'champion_name': ['Ahri', 'Ahri', 'Zed'], 'win': [1.0, np.nan, 0.0]})
+
+    compacto = aplicar_esquema(df, mostrar_relatorio=False)
+
+    assert compacto['win'].dtype == bool
+    assert compacto['win'].tolist() == [True, False]
+    assert compacto['champion_name'].tolist() == ['Ahri', 'Zed']
+    assert '1 linhas sem valor' in capsys.readouterr().out
+    assert relatorio_memoria(compacto).loc['win', 'linhas_descartadas'] == 1
+
+
+def test_win_completo_nao_descarta_linhas():
+    compacto = aplicar_esquema(pd.DataFrame({'win': [1, 0, 1]}), mostrar_relatorio=False)
+
+    assert compacto['win'].tolist() == [True, False, True]
+    assert relatorio_memoria(compacto).loc['win', 'linhas_descartadas'] == 0
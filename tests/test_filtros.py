@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nucleo_lol.esquema import aplicar_esquema
+from nucleo_lol.filtros import construir_indice_filtros, filtrar_linhas, valores_filtro
+
+FILTROS = [
+    {},
+    {'game_mode': 'CLASSIC'},
+    {'game_mode': 'CLASSIC', 'individual_position': 'BOTTOM'},
+    {'game_mode': 'CLASSIC', 'individual_position': 'BOTTOM', 'champion_name': 'Jinx'},
+    {'game_mode': ['ARAM', 'URF'], 'champion_name': ['Ahri', 'Zed', 'NaoExiste']},
+    {'champion_name': 'NaoExiste'},
+    {'game_mode': 'ARAM', 'individual_position': 'TOP'},
+]
+
+
+def _mascara(df, filtros):
+    mascara = np.ones(len(df), dtype=bool)
+    for coluna, condicao in filtros.items():
+        valores = condicao if isinstance(condicao, list) else [condicao]
+        mascara &= df[coluna].isin(valores).to_numpy()
+    return df[mascara]
+
+
+@pytest.fixture(params=['pela_ordem_do_ficheiro', 'ordenado'])
+def dados(request, partidas):
+    df = aplicar_esquema(partidas, mostrar_relatorio=False)
+    if request.param == 'ordenado':
+        # Blocos contínuos por modo / posição: filtrar_linhas devolve fatias
+        df = df.sort_values(['game_mode', 'individual_position'], kind='stable').reset_index(drop=True)
+    return df
+
+
+# -------------------------------------------------------------------
+# TESTES
+# -------------------------------------------------------------------
+@pytest.mark.parametrize('filtros', FILTROS)
+def test_filtrar_linhas_igual_a_mascara(dados, filtros):
+    indice = construir_indice_filtros(dados)
+
+    assert_frame_equal(filtrar_linhas(dados, indice, filtros), _mascara(dados, filtros))
+
+
+def test_valores_em_falta_nunca_passam_o_filtro(dados):
+    dados = dados.copy()
+    dados.loc[:99, 'champion_name'] = None
+    indice = construir_indice_filtros(dados)
+
+    filtros = {'champion_name': dados['champion_name'].iloc[100]}
+    assert_frame_equal(filtrar_linhas(dados, indice, filtros), _mascara(dados, filtros))
+
+
+def test_valores_do_mais_para_o_menos_frequente(dados):
+    indice = construir_indice_filtros(dados)
+
+    assert valores_filtro(indice, 'game_mode') == list(dados['game_mode'].value_counts().index)
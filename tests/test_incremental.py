@@ -0,0 +1,118 @@
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from nucleo_lol.builds import construir_indice_builds
+from nucleo_lol.confrontos import construir_confrontos
+from nucleo_lol.cubo import construir_cubo, construir_histograma_kda
+from nucleo_lol.esquema import aplicar_esquema
+from nucleo_lol.incremental import obter_agregados
+from nucleo_lol.instrumentacao import contadores
+from nucleo_lol.itens import construir_indice_itens
+
+from .comparar import assert_agregados_iguais
+
+LINHAS_POR_GRUPO = 2_000
+
+
+def _gravar(caminho, df, acrescentar=False):
+    """
+    CSV: acrescenta as linhas no fim. Parquet: reescreve o ficheiro
+    (os row groups antigos ficam iguais, o último pode crescer).
+    """
+    if caminho.endswith('.csv'):
+        df.to_csv(caminho, index=False, mode='a' if acrescentar else 'w', header=not acrescentar)
+    else:
+        df.to_parquet(caminho, index=False, row_group_size=LINHAS_POR_GRUPO)
+
+
+def _linhas_lidas():
+    return contadores().get('linhas_lidas', {}).get('agregados', 0)
+
+
+def _assert_igual_a_reconstruir(agregados, df):
+    df = aplicar_esquema(df, mostrar_relatorio=False)
+    esperados = (construir_cubo(df), construir_indice_itens(df), construir_histograma_kda(df),
+                 construir_confrontos(df), construir_indice_builds(df))
+    for obtido, esperado in zip(agregados, esperados):
+        assert_agregados_iguais(obtido, esperado)
+
+
+@pytest.fixture(params=['csv', 'parquet'])
+def ficheiro(request, tmp_path):
+    return str(tmp_path / f'partidas.{request.param}')
+
+
+# -------------------------------------------------------------------
+# TESTES
+# -------------------------------------------------------------------
+def test_acrescentar_partidas_igual_a_reconstruir(ficheiro, partidas):
+    cortes = [0, 7_000, 15_000, len(partidas)]
+    for inicio, fim in zip(cortes, cortes[1:]):
+        if ficheiro.endswith('.csv'):
+            _gravar(ficheiro, partidas.iloc[inicio:fim], acrescentar=inicio > 0)
+        else:
+            _gravar(ficheiro, partidas.iloc[:fim])
+        agregados = obter_agregados(ficheiro)
+        _assert_igual_a_reconstruir(agregados, partidas.iloc[:fim])
+
+
+def _meio_de_partida_classica(partidas, depois_de, linha_na_partida):
+    """
+    Posição da 'linha_na_partida'-ésima linha da primeira partida CLASSIC
+    depois de 'depois_de' (as partidas têm 10 linhas seguidas).
+    """
+    classicas = partidas.index[(partidas['game_mode'] == 'CLASSIC') & (partidas.index % 10 == 0)]
+    return int(classicas[classicas >= depois_de][0]) + linha_na_partida
+
+
+@pytest.mark.parametrize('cortes', [[(7_000, 4), (15_000, 1)], [(7_000, 3), (7_000, 4), (7_000, 8)]])
+def test_partida_cortada_entre_atualizacoes(ficheiro, partidas, cortes):
+    # As linhas acrescentadas começam a meio de uma partida: pares de rota
+    # e duplas ficam com uma linha antes e outra depois do corte
+    cortes = [0, *(_meio_de_partida_classica(partidas, *corte) for corte in cortes), len(partidas)]
+    for inicio, fim in zip(cortes, cortes[1:]):
+        if ficheiro.endswith('.csv'):
+            _gravar(ficheiro, partidas.iloc[inicio:fim], acrescentar=inicio > 0)
+        else:
+            _gravar(ficheiro, partidas.iloc[:fim])
+        _assert_igual_a_reconstruir(obter_agregados(ficheiro), partidas.iloc[:fim])
+
+
+def test_atualizacao_so_le_as_linhas_novas(ficheiro, partidas):
+    _gravar(ficheiro, partidas.iloc[:19_990])
+    obter_agregados(ficheiro)
+
+    antes = _linhas_lidas()
+    if ficheiro.endswith('.csv'):
+        _gravar(ficheiro, partidas.iloc[19_990:], acrescentar=True)
+    else:
+        _gravar(ficheiro, partidas)
+    agregados = obter_agregados(ficheiro)
+
+    lidas = _linhas_lidas() - antes
+    if ficheiro.endswith('.csv'):
+        assert lidas == 10
+    else:
+        # Só o último row group agregado é relido, além das linhas novas
+        assert lidas <= LINHAS_POR_GRUPO + 10
+    _assert_igual_a_reconstruir(agregados, partidas)
+
+
+def test_linhas_antigas_alteradas_reconstroem(ficheiro, partidas):
+    _gravar(ficheiro, partidas.iloc[:10_000])
+    obter_agregados(ficheiro)
+
+    alteradas = partidas.copy()
+    alteradas.loc[:9, 'champion_name'] = 'Teemo'
+    _gravar(ficheiro, alteradas)
+    _assert_igual_a_reconstruir(obter_agregados(ficheiro), alteradas)
+
+
+def test_sem_alteracoes_usa_os_agregados_gravados(ficheiro, partidas):
+    _gravar(ficheiro, partidas)
+    obter_agregados(ficheiro)
+
+    antes = _linhas_lidas()
+    _assert_igual_a_reconstruir(obter_agregados(ficheiro), partidas)
+    assert _linhas_lidas() == antes
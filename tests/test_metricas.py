@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from nucleo_lol.cubo import construir_cubo, fatia_cubo
+from nucleo_lol.esquema import aplicar_esquema
+from nucleo_lol.metricas import calcular_metricas, metricas_da_tabela
+
+MIN_JOGOS = 20
+
+
+# -------------------------------------------------------------------
+# FÓRMULAS ORIGINAIS (um groupby por análise, sobre as linhas)
+# -------------------------------------------------------------------
+def _relevantes(df, min_jogos):
+    contagem_jogos = df.groupby('champion_name', observed=True).size()
+    return df[df['champion_name'].isin(contagem_jogos[contagem_jogos >= min_jogos].index)]
+
+
+def _taxa_vitoria_original(df, min_jogos):
+    taxas_vitoria = _relevantes(df, min_jogos).groupby('champion_name', observed=True)['win'].mean()
+    return (taxas_vitoria * 100).sort_values(ascending=False).round(2)
+
+
+def _kda_original(df, min_jogos):
+    media_stats = _relevantes(df, min_jogos).groupby('champion_name', observed=True)[
+        ['kills', 'deaths', 'assists']].mean()
+    media_stats['deaths_para_kda'] = media_stats['deaths'].replace(0, 1)
+    media_stats['kda'] = (media_stats['kills'] + media_stats['assists']) / media_stats['deaths_para_kda']
+    return media_stats.round(2).sort_values(by='kda', ascending=False)[['kills', 'deaths', 'assists', 'kda']]
+
+
+def _impacto_ouro_original(df):
+    media_ouro = df.groupby('win')['gold_earned'].mean().round(2)
+    return media_ouro.rename(index={False: 'Derrota', True: 'Vitória'})
+
+
+@pytest.fixture
+def fatia(partidas):
+    classico = partidas[partidas['game_mode'] == 'CLASSIC']
+    return aplicar_esquema(classico[classico['individual_position'] == 'BOTTOM'], mostrar_relatorio=False)
+
+
+# -------------------------------------------------------------------
+# TESTES
+# -------------------------------------------------------------------
+def test_metricas_numa_passagem_iguais_as_originais(fatia):
+    metricas = calcular_metricas(fatia, MIN_JOGOS)
+
+    assert_series_equal(metricas['taxa_vitoria'], _taxa_vitoria_original(fatia, MIN_JOGOS), check_names=False)
+    assert_frame_equal(metricas['kda'], _kda_original(fatia, MIN_JOGOS))
+    assert_series_equal(metricas['impacto_ouro'], _impacto_ouro_original(fatia), check_names=False,
+                        check_index_type=False)
+
+
+def test_metricas_do_cubo_iguais_as_das_linhas(partidas, fatia):
+    cubo = construir_cubo(aplicar_esquema(partidas, mostrar_relatorio=False))
+
+    do_cubo = metricas_da_tabela(fatia_cubo(cubo, 'CLASSIC', 'BOTTOM'), MIN_JOGOS)
+    das_linhas = calcular_metricas(fatia, MIN_JOGOS)
+
+    for nome in ('taxa_vitoria', 'kda', 'impacto_ouro', 'significancia'):
+        esperado, obtido = das_linhas[nome], do_cubo[nome]
+        if isinstance(esperado, pd.Series):
+            assert_series_equal(obtido, esperado, check_index_type=False, check_categorical=False)
+        else:
+            assert_frame_equal(obtido, esperado, check_index_type=False, check_categorical=False)
+
+
+def test_sem_campeoes_com_jogos_suficientes(fatia):
+    metricas = calcular_metricas(fatia, min_jogos=len(fatia) + 1)
+
+    assert metricas['taxa_vitoria'] is None
+    assert metricas['kda'] is None
+    # O impacto do ouro usa todos os campeões
+    assert metricas['impacto_ouro'] is not None
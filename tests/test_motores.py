@@ -0,0 +1,76 @@
+import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from nucleo_lol import motores
+from nucleo_lol.cache import carregar_dados_com_cache
+from nucleo_lol.esquema import aplicar_esquema
+from nucleo_lol.metricas import somas_necessarias
+
+from .comparar import assert_agregados_iguais
+
+FILTROS = [
+    {},
+    {'game_mode': 'CLASSIC', 'individual_position': 'TOP'},
+    {'game_mode': ['CLASSIC', 'URF'], 'champion_name': 'Ahri'},
+]
+
+
+@pytest.fixture(scope='module')
+def ficheiro(partidas_base, tmp_path_factory):
+    pytest.importorskip('pyarrow')
+    caminho = tmp_path_factory.mktemp('motores') / 'partidas.csv'
+    partidas_base.to_csv(caminho, index=False)
+    return str(caminho)
+
+
+@pytest.fixture(scope='module')
+def dados_pandas(ficheiro):
+    return aplicar_esquema(carregar_dados_com_cache(ficheiro), mostrar_relatorio=False)
+
+
+@pytest.fixture(scope='module', params=['polars', 'duckdb'])
+def consulta(request, ficheiro):
+    pytest.importorskip(request.param)
+    consulta = motores.abrir_consulta(ficheiro, request.param)
+    assert consulta is not None
+    return consulta
+
+
+# -------------------------------------------------------------------
+# TESTES (cada motor contra o pandas, com os mesmos filtros)
+# -------------------------------------------------------------------
+@pytest.mark.parametrize('filtros', FILTROS)
+def test_somas_e_metricas_iguais_ao_pandas(consulta, dados_pandas, filtros):
+    esperado = motores.filtrar(dados_pandas, filtros)
+    obtido = motores.filtrar(consulta, filtros)
+
+    assert motores.contar_linhas(obtido) == len(esperado)
+    assert_agregados_iguais(motores.agregar(obtido, ['champion_name'], somas_necessarias()),
+                            motores.agregar(esperado, ['champion_name'], somas_necessarias()))
+    metricas = motores.calcular_metricas(obtido, min_jogos=5)
+    for nome, resultado in motores.calcular_metricas(esperado, min_jogos=5).items():
+        if resultado is None:
+            assert metricas[nome] is None
+        elif hasattr(resultado, 'columns'):
+            assert_frame_equal(metricas[nome], resultado, check_dtype=False, check_categorical=False)
+        else:
+            assert_series_equal(metricas[nome], resultado, check_dtype=False, check_categorical=False)
+
+
+@pytest.mark.parametrize('filtros', FILTROS)
+def test_agregados_iguais_ao_pandas(consulta, dados_pandas, filtros):
+    esperado = motores.filtrar(dados_pandas, filtros)
+    obtido = motores.filtrar(consulta, filtros)
+
+    assert_agregados_iguais(motores.histograma_kda(obtido), motores.histograma_kda(esperado))
+    assert_agregados_iguais(motores.indice_itens(obtido), motores.indice_itens(esperado))
+    assert_agregados_iguais(motores.indice_builds(obtido), motores.indice_builds(esperado))
+    assert_agregados_iguais(motores.confrontos(obtido), motores.confrontos(esperado))
+
+
+@pytest.mark.parametrize('coluna', ['champion_name', 'game_mode', 'patch'])
+def test_contagens_por_valor_iguais_ao_pandas(consulta, dados_pandas, coluna):
+    obtido = motores.contar_por_valor(consulta, coluna)
+    esperado = motores.contar_por_valor(dados_pandas, coluna)
+    assert list(obtido.index.astype(str)) == list(esperado.index.astype(str))
+    assert list(obtido) == list(esperado)
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from nucleo_lol.esquema import aplicar_esquema
+from nucleo_lol.particoes import atributos_particao, carregar_particoes, podar_particoes, valores_atributos
+
+from .comparar import assert_agregados_iguais
+
+
+def _criar(caminho, conteudo=''):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(conteudo)
+    return caminho
+
+
+# -------------------------------------------------------------------
+# ATRIBUTOS E PODA PELO NOME
+# -------------------------------------------------------------------
+def test_valor_de_pasta_pode_ter_underscore(tmp_path):
+    caminho = os.path.join(tmp_path, 'queue=ranked_solo', 'region=BR1', 'parte_1.csv')
+    assert atributos_particao(caminho, str(tmp_path)) == {'queue': 'ranked_solo', 'region': 'BR1'}
+
+
+def test_nome_do_ficheiro_separa_atributos_por_underscore():
+    assert atributos_particao('region=BR1_date=2024-05-01.csv') == {'region': 'BR1', 'date': '2024-05-01'}
+    assert atributos_particao('queue=ranked_flex_region=EUW1.csv') == {'queue': 'ranked_flex', 'region': 'EUW1'}
+
+
+def test_poda_por_pastas_com_underscore(tmp_path):
+    base = str(tmp_path)
+    solo = _criar(os.path.join(base, 'queue=ranked_solo', 'date=2024-05-01', 'parte.csv'))
+    flex = _criar(os.path.join(base, 'queue=ranked_flex', 'date=2024-05-01', 'parte.csv'))
+    sem_fila = _criar(os.path.join(base, 'outros', 'parte.csv'))
+    particoes = [flex, sem_fila, solo]
+
+    assert podar_particoes(particoes, {'queue': ['ranked_solo']}, base) == [sem_fila, solo]
+    assert podar_particoes(particoes, {'queue': lambda fila: fila.startswith('ranked_')}, base) == particoes
+    assert valores_atributos(base) == {'queue': ['ranked_flex', 'ranked_solo'], 'date': ['2024-05-01']}
+
+
+# -------------------------------------------------------------------
+# LEITURA FILTRADA EM CADA PROCESSO
+# -------------------------------------------------------------------
+@pytest.mark.parametrize('extensao', ['csv', 'parquet'])
+def test_carregar_particoes_filtra_e_projeta_em_cada_particao(partidas, tmp_path, extensao):
+    if extensao == 'parquet':
+        pytest.importorskip('pyarrow')
+    metade = len(partidas) // 2
+    for i, parte in enumerate([partidas.iloc[:metade], partidas.iloc[metade:]]):
+        caminho = tmp_path / f'region=R{i}' / f'parte.{extensao}'
+        caminho.parent.mkdir()
+        if extensao == 'csv':
+            parte.to_csv(caminho, index=False)
+        else:
+            parte.to_parquet(caminho, index=False)
+
+    df = carregar_particoes(str(tmp_path), max_processos=1, filtros={'game_mode': 'ARAM'},
+                            colunas=['champion_name', 'win', 'game_mode'])
+
+    esperado = aplicar_esquema(partidas.loc[partidas['game_mode'] == 'ARAM', ['champion_name', 'win', 'game_mode']],
+                               mostrar_relatorio=False)
+    assert list(df.columns) == ['champion_name', 'win', 'game_mode']
+    assert_agregados_iguais(df, esperado.reset_index(drop=True))
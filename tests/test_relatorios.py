@@ -0,0 +1,65 @@
+import pytest
+from pandas.testing import assert_frame_equal
+
+from nucleo_lol.builds import construir_indice_builds
+from nucleo_lol.cubo import construir_cubo, construir_histograma_kda
+from nucleo_lol.esquema import aplicar_esquema
+from nucleo_lol.itens import construir_indice_itens
+from nucleo_lol.relatorios import CHAVES_FATIA, gerar_relatorios
+
+
+@pytest.fixture(scope='module')
+def dados(partidas_base):
+    return aplicar_esquema(partidas_base.copy(), mostrar_relatorio=False)
+
+
+@pytest.fixture(scope='module')
+def agregados(dados):
+    return (construir_cubo(dados), construir_indice_itens(dados), construir_histograma_kda(dados),
+            None, construir_indice_builds(dados))
+
+
+def _por_fatia(tabela):
+    return tabela.astype({c: str for c in CHAVES_FATIA}).set_index(CHAVES_FATIA).sort_index()
+
+
+# -------------------------------------------------------------------
+# TESTES
+# -------------------------------------------------------------------
+def test_impacto_ouro_sem_campeoes_com_min_jogos(agregados, dados):
+    tabelas = gerar_relatorios(agregados, min_jogos=10 ** 6, max_processos=1)
+
+    assert 'campeoes' not in tabelas
+    impacto = _por_fatia(tabelas['impacto_ouro'])
+    assert impacto['jogos'].sum() == len(dados)
+    # Mesmo valor que a fórmula original, sobre as linhas da fatia
+    fatia = dados[(dados['game_mode'] == 'CLASSIC') & (dados['individual_position'] == 'TOP')]
+    media_ouro = fatia.groupby('win')['gold_earned'].mean().round(2)
+    assert impacto.loc[('CLASSIC', 'TOP'), 'ouro_derrota'] == media_ouro[False]
+    assert impacto.loc[('CLASSIC', 'TOP'), 'ouro_vitoria'] == media_ouro[True]
+
+
+def test_campeoes_pedidos_so_filtram_as_tabelas_por_campeao(agregados):
+    todos = gerar_relatorios(agregados, min_jogos=5, max_processos=1)
+    so_ahri = gerar_relatorios(agregados, campeoes=['Ahri'], min_jogos=5, max_processos=1)
+
+    fatias = _por_fatia(so_ahri['impacto_ouro']).index
+    assert len(fatias)
+    # O impacto do ouro continua a ser de toda a fatia
+    assert_frame_equal(_por_fatia(so_ahri['impacto_ouro']), _por_fatia(todos['impacto_ouro']).loc[fatias])
+
+    campeoes = so_ahri['campeoes']
+    assert set(campeoes['champion_name'].astype(str)) == {'Ahri'}
+    ahri = todos['campeoes'][todos['campeoes']['champion_name'] == 'Ahri']
+    assert_frame_equal(campeoes.reset_index(drop=True), ahri.reset_index(drop=True))
+    assert set(so_ahri['itens']['champion_name'].astype(str)) == {'Ahri'}
+
+
+def test_fatias_sem_os_campeoes_pedidos_ficam_de_fora(agregados):
+    so_ahri = gerar_relatorios(agregados, campeoes=['Ahri'], max_processos=1)
+    cubo = agregados[0]
+    com_ahri = cubo[cubo.index.get_level_values('champion_name') == 'Ahri'].reset_index()
+    esperadas = set(map(tuple, com_ahri[CHAVES_FATIA].astype(str).to_numpy()))
+
+    assert esperadas
+    assert set(_por_fatia(so_ahri['impacto_ouro']).index) == esperadas
@@ -0,0 +1,120 @@
+import importlib
+import os
+
+import pytest
+
+# Cada resultado de teste ocupa ~4 KB e a pasta só leva 10 KB: cabem dois
+TAMANHO_RESULTADO = 4000
+LIMITE_MB = 10 / 1024
+
+
+@pytest.fixture
+def resultados(tmp_path, monkeypatch):
+    """
+    nucleo_lol.resultados recarregado com a pasta dentro de tmp_path e um
+    limite pequeno (LOL_RESULTADOS_DIR / LOL_RESULTADOS_MB são lidas ao importar).
+    """
+    monkeypatch.setenv('LOL_RESULTADOS_DIR', str(tmp_path / 'resultados'))
+    monkeypatch.setenv('LOL_RESULTADOS_MB', str(LIMITE_MB))
+    from nucleo_lol import resultados
+    modulo = importlib.reload(resultados)
+    yield modulo
+    monkeypatch.undo()
+    importlib.reload(resultados)
+
+
+def _eventos(contador='cache_resultados'):
+    from nucleo_lol.instrumentacao import contadores
+    return dict(contadores().get(contador, {}))
+
+
+def _gravar(resultados, nome, instante):
+    """
+    Grava um resultado de ~4 KB e põe-lhe a data 'instante' (ordem do LRU).
+    """
+    chave = resultados.chave_resultado(nome)
+    resultados.gravar_resultado(chave, b'x' * TAMANHO_RESULTADO)
+    caminho = os.path.join(resultados.PASTA_RESULTADOS, chave + resultados.EXTENSAO)
+    if os.path.exists(caminho):
+        os.utime(caminho, (instante, instante))
+    return chave
+
+
+def _em_cache(resultados):
+    return sorted(n for n in os.listdir(resultados.PASTA_RESULTADOS) if n.endswith(resultados.EXTENSAO))
+
+
+# -------------------------------------------------------------------
+# TESTES
+# -------------------------------------------------------------------
+def test_segunda_chamada_sai_da_cache(resultados):
+    chamadas = []
+
+    def calcular():
+        chamadas.append(1)
+        return {'win': 51.2}
+
+    chave = resultados.chave_resultado('metricas', 'CLASSIC', 20)
+    antes = _eventos()
+    assert resultados.resultado_em_cache(chave, calcular) == {'win': 51.2}
+    assert resultados.resultado_em_cache(chave, calcular) == {'win': 51.2}
+
+    assert len(chamadas) == 1
+    depois = _eventos()
+    assert depois.get('falha', 0) == antes.get('falha', 0) + 1
+    assert depois.get('acerto', 0) == antes.get('acerto', 0) + 1
+
+
+def test_none_tambem_fica_em_cache(resultados):
+    chamadas = []
+    chave = resultados.chave_resultado('fatia_vazia')
+    resultados.resultado_em_cache(chave, lambda: chamadas.append(1))
+    assert resultados.ler_resultado(chave) == (True, None)
+    assert len(chamadas) == 1
+
+
+def test_parametros_diferentes_dao_chaves_diferentes(resultados):
+    assert resultados.chave_resultado('metricas', 'CLASSIC') != resultados.chave_resultado('metricas', 'ARAM')
+    assert resultados.chave_resultado('metricas', 'CLASSIC') == resultados.chave_resultado('metricas', 'CLASSIC')
+
+
+def test_passando_o_limite_apaga_o_menos_usado(resultados):
+    antiga = _gravar(resultados, 'a', 1_000)
+    recente = _gravar(resultados, 'b', 2_000)
+    nova = _gravar(resultados, 'c', 3_000)
+
+    assert _em_cache(resultados) == sorted(c + resultados.EXTENSAO for c in (recente, nova))
+    assert resultados.ler_resultado(antiga) == (False, None)
+
+
+def test_leitura_renova_a_ordem_do_lru(resultados):
+    primeira = _gravar(resultados, 'a', 1_000)
+    segunda = _gravar(resultados, 'b', 2_000)
+    # Ler a primeira torna-a a mais recente: sai a segunda
+    assert resultados.ler_resultado(primeira)[0]
+    terceira = _gravar(resultados, 'c', 3_000)
+
+    assert _em_cache(resultados) == sorted(c + resultados.EXTENSAO for c in (primeira, terceira))
+    assert resultados.ler_resultado(segunda) == (False, None)
+
+
+def test_ficheiro_estragado_e_recalculado(resultados):
+    chave = resultados.chave_resultado('estragado')
+    resultados.gravar_resultado(chave, [1, 2, 3])
+    caminho = os.path.join(resultados.PASTA_RESULTADOS, chave + resultados.EXTENSAO)
+    with open(caminho, 'wb') as f:
+        f.write(b'nao e um pickle')
+
+    assert resultados.resultado_em_cache(chave, lambda: [4, 5]) == [4, 5]
+    assert resultados.ler_resultado(chave) == (True, [4, 5])
+
+
+def test_limite_zero_desativa_a_cache(resultados, monkeypatch):
+    monkeypatch.setattr(resultados, 'TAMANHO_MAXIMO_MB', 0)
+    chamadas = []
+    chave = resultados.chave_resultado('desativada')
+    resultados.resultado_em_cache(chave, lambda: chamadas.append(1))
+    resultados.resultado_em_cache(chave, lambda: chamadas.append(1))
+
+    assert len(chamadas) == 2
+    assert not os.path.exists(resultados.PASTA_RESULTADOS)
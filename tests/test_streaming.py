@@ -0,0 +1,47 @@
+import pytest
+
+from nucleo_lol.cubo import construir_cubo, construir_histograma_kda
+from nucleo_lol.esquema import aplicar_esquema
+from nucleo_lol.itens import construir_indice_itens
+from nucleo_lol.streaming import agregar_em_blocos
+
+from .comparar import assert_agregados_iguais
+
+# Blocos que não coincidem com o fim das partidas (10 linhas cada)
+TAMANHO_BLOCO = 3_333
+
+
+@pytest.fixture(params=['csv', 'parquet'])
+def ficheiro(request, partidas, tmp_path):
+    caminho = tmp_path / f'partidas.{request.param}'
+    if request.param == 'csv':
+        partidas.to_csv(caminho, index=False)
+    else:
+        pytest.importorskip('pyarrow')
+        partidas.to_parquet(caminho, index=False, row_group_size=5_000)
+    return str(caminho)
+
+
+# -------------------------------------------------------------------
+# TESTES
+# -------------------------------------------------------------------
+@pytest.mark.parametrize('filtros', [{}, {'game_mode': 'CLASSIC'}, {'game_mode': 'CLASSIC', 'individual_position': 'TOP'}])
+def test_em_blocos_igual_ao_ficheiro_em_memoria(ficheiro, partidas, filtros):
+    esperado = partidas
+    for coluna, valor in filtros.items():
+        esperado = esperado[esperado[coluna] == valor]
+    esperado = aplicar_esquema(esperado, mostrar_relatorio=False)
+
+    cubo, indice_itens, histograma_kda, _, linhas = agregar_em_blocos(
+        ficheiro, filtros, tamanho_bloco=TAMANHO_BLOCO)
+
+    assert linhas == len(esperado)
+    assert_agregados_iguais(cubo, construir_cubo(esperado))
+    assert_agregados_iguais(indice_itens, construir_indice_itens(esperado))
+    assert_agregados_iguais(histograma_kda, construir_histograma_kda(esperado))
+
+
+def test_indice_de_builds_so_dos_campeoes_pedidos(ficheiro, partidas):
+    *_, indice_builds, _ = agregar_em_blocos(ficheiro, {}, tamanho_bloco=TAMANHO_BLOCO,
+                                              campeoes_builds=['Ahri'])
+    assert set(indice_builds.index.get_level_values('champion_name').astype(str)) == {'Ahri'}